@@ -4,36 +4,79 @@ import asyncio
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN, CONF_PING_IP, CONF_PING_INTERVAL
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    CONF_PING_IP,
+    CONF_PING_INTERVAL,
+    CONF_PING_METHOD,
+    CONF_PING_PORT,
+    CONF_PING_QUORUM,
+    CONF_PING_TARGETS,
+    CONF_PING_TIMEOUT,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["sensor", "binary_sensor"]
+PLATFORMS = ["sensor", "binary_sensor", "calendar"]
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    from .services import async_setup_services
+
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Lazy imports: keep config_flow import safe
-    from .coordinator import TernopilScheduleCoordinator, TernopilPingCoordinator
+    from .coordinator import TernopilPingCoordinator
+    from .history import OutageHistory
+    from .hub import async_get_schedule_hub, entry_group
 
     hass.data.setdefault(DOMAIN, {})
 
-    schedule = TernopilScheduleCoordinator(hass, entry)
+    # One schedule coordinator per (city, group), shared across entries.
+    # Loads the persisted snapshot first, so entities start with last good data.
+    schedule = await async_get_schedule_hub(hass).async_acquire(entry)
+
+    def opt(key: str):
+        return entry.options.get(key, entry.data.get(key))
+
     ping = TernopilPingCoordinator(
         hass,
         entry,
-        ping_ip=entry.options.get(CONF_PING_IP, entry.data.get(CONF_PING_IP)),
-        ping_interval=entry.options.get(CONF_PING_INTERVAL, entry.data.get(CONF_PING_INTERVAL)),
+        ping_ip=opt(CONF_PING_IP),
+        ping_interval=opt(CONF_PING_INTERVAL),
+        ping_method=opt(CONF_PING_METHOD),
+        ping_port=opt(CONF_PING_PORT),
+        ping_timeout=opt(CONF_PING_TIMEOUT),
+        ping_targets=opt(CONF_PING_TARGETS),
+        ping_quorum=opt(CONF_PING_QUORUM),
     )
+    entry.async_on_unload(ping.async_shutdown)
+
+    # Actual on/off transitions from the ping path (planned vs actual stats)
+    history = OutageHistory(hass, entry.entry_id, entry_group(entry), lambda: schedule.data)
+    await history.async_load()
+    history.async_start()
+    entry.async_on_unload(history.async_stop)
+
+    @callback
+    def _record_power() -> None:
+        data = ping.data
+        if ping.last_update_success and isinstance(data, dict):
+            history.async_record(bool(data.get("ok")))
+
+    entry.async_on_unload(ping.async_add_listener(_record_power))
 
     # Store coordinators even if upstream is flaky (don’t fail setup)
-    hass.data[DOMAIN][entry.entry_id] = {"schedule": schedule, "ping": ping}
+    hass.data[DOMAIN][entry.entry_id] = {"schedule": schedule, "ping": ping, "history": history}
+
+    # Options (e.g. countdown tick) are read at entity setup; reload on change
+    entry.async_on_unload(entry.add_update_listener(_async_reload_entry))
 
     # Forward platforms first so UI entities exist even if first refresh fails
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -45,14 +88,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         except Exception as err:  # noqa: BLE001
             _LOGGER.warning("%s first refresh failed (non-fatal): %s", name, err)
 
-    hass.async_create_task(_refresh_safe(schedule, "schedule"))
     hass.async_create_task(_refresh_safe(ping, "ping"))
+    ping.async_start()
 
     return True
 
 
+async def _async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        from .hub import async_get_schedule_hub
+        from .probe import async_close_icmp_prober
+
+        domain_data = hass.data.get(DOMAIN, {})
+        domain_data.pop(entry.entry_id, None)
+        await async_get_schedule_hub(hass).async_release(entry)
+        if not any(e.entry_id in domain_data for e in hass.config_entries.async_entries(DOMAIN)):
+            async_close_icmp_prober(hass)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's stores: its outage history and its group's schedule snapshot."""
+    from .history import async_remove_history
+    from .hub import async_remove_snapshot
+
+    await async_remove_history(hass, entry.entry_id)
+    await async_remove_snapshot(hass, entry)
@@ -3,6 +3,7 @@
 Discovered endpoints:
  - Streets (Hydra JSON-LD):
      /api/pw_streets?pagination=false&city.id=1032[&name=...]
+     (paginated without pagination=false; pages linked via hydra:view)
  - Building group for a street (JSON):
      /api/pw-accounts/building-groups?cityId=1032&streetId=...
  - Actual graph (schedule) (Hydra JSON-LD collection):
@@ -16,17 +17,37 @@ from __future__ import annotations
 
 import asyncio
 import base64
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+import itertools
+import json
 import logging
+import time
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
 
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .const import (
+    DATA_DECODE_STATS,
+    DOMAIN,
+    ERROR_SNIPPET_BYTES,
+    MAX_RESPONSE_BYTES,
+    STREET_PAGE_CONCURRENCY,
+)
+
 try:
     from yarl import URL
 except Exception:  # pragma: no cover
     URL = None  # type: ignore
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 _LOGGER = logging.getLogger(__name__)
 
 BASE = "https://api-toe-poweron.inneti.net"
@@ -35,14 +56,43 @@ ORIGIN = "https://toe-poweron.inneti.net"
 REFERER = "https://toe-poweron.inneti.net/"
 
 
+class UpstreamError(RuntimeError):
+    """Upstream answered with an HTTP error (carries Retry-After when given)."""
+
+    def __init__(self, message: str, *, status: int | None = None, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After as seconds (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# Returned by _get_json when a conditional request got 304 Not Modified.
+NOT_MODIFIED: Any = object()
+
+
 def _debug_key(city_id: int | str, street_id: int | str) -> str:
     raw = f"{city_id}/{street_id}".encode("utf-8")
     return base64.b64encode(raw).decode("ascii")
 
 
-def _build_url(path: str, params: dict[str, str]) -> str:
+def _build_url(path: str, params: dict[str, str] | list[tuple[str, str]]) -> str:
     """Build a URL with proper encoding (handles + in +00:00, Cyrillic, spaces, etc.)."""
-    base = f"{API}/{path.lstrip("/")}"
+    base = f"{API}/{path.lstrip('/')}"
     if URL is not None:
         return str(URL(base).with_query(params))
     # Fallback (should rarely be used in HA container)
@@ -50,21 +100,161 @@ def _build_url(path: str, params: dict[str, str]) -> str:
     return base + "?" + urlencode(params)
 
 
-async def _get_json(hass, url: str, *, accept: str) -> Any:
+class DecodeStats:
+    """Counters for response bodies read and decoded (shown in diagnostics)."""
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.bytes = 0
+        self.max_bytes = 0
+        self.decode_seconds = 0.0
+        self.errors = 0
+        self.too_large = 0
+
+    def record(self, size: int, seconds: float) -> None:
+        self.responses += 1
+        self.bytes += size
+        self.max_bytes = max(self.max_bytes, size)
+        self.decode_seconds += seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "decoder": "orjson" if orjson is not None else "json",
+            "responses": self.responses,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "decode_ms_total": round(self.decode_seconds * 1000, 3),
+            "decode_ms_avg": round(self.decode_seconds * 1000 / self.responses, 3) if self.responses else None,
+            "errors": self.errors,
+            "too_large": self.too_large,
+        }
+
+
+@callback
+def async_get_decode_stats(hass) -> DecodeStats:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    stats = domain_data.get(DATA_DECODE_STATS)
+    if stats is None:
+        stats = domain_data[DATA_DECODE_STATS] = DecodeStats()
+    return stats
+
+
+def _snippet(body: bytes | bytearray) -> str:
+    return bytes(body[:ERROR_SNIPPET_BYTES]).decode("utf-8", "replace")
+
+
+def _loads(body: bytes | bytearray) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+async def _read_body(resp, limit: int) -> bytearray:
+    """Read the whole body once, refusing anything larger than limit bytes."""
+    if resp.content_length is not None and resp.content_length > limit:
+        raise UpstreamError(
+            f"Upstream response too large: {resp.content_length} bytes", status=resp.status
+        )
+    body = bytearray()
+    async for chunk in resp.content.iter_chunked(64 * 1024):
+        body += chunk
+        if len(body) > limit:
+            raise UpstreamError(f"Upstream response exceeds {limit} bytes", status=resp.status)
+    return body
+
+
+async def _get_json(
+    hass,
+    url: str,
+    *,
+    accept: str,
+    extra_headers: dict[str, str] | None = None,
+    validators: dict[str, str] | None = None,
+    max_bytes: int = MAX_RESPONSE_BYTES,
+) -> Any:
+    """GET and decode JSON, reading the body exactly once.
+
+    If a validators dict is given, it is used for conditional requests
+    (If-None-Match / If-Modified-Since) and updated in place from the
+    response. NOT_MODIFIED is returned on 304.
+    """
     session = async_get_clientsession(hass)
+    stats = async_get_decode_stats(hass)
     headers = {
         "Accept": accept,
         "Origin": ORIGIN,
         "Referer": REFERER,
     }
+    if extra_headers:
+        headers.update(extra_headers)
+    # Validators only apply to the exact URL they were issued for.
+    if validators is not None and validators.get("url") == url:
+        if etag := validators.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := validators.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
     async with session.get(url, headers=headers, allow_redirects=False) as resp:
-        text = await resp.text()
+        if resp.status == 304 and validators is not None:
+            return NOT_MODIFIED
+        try:
+            body = await _read_body(resp, max_bytes)
+        except UpstreamError:
+            stats.too_large += 1
+            raise
         if resp.status >= 400:
-            raise RuntimeError(f"Upstream HTTP {resp.status}: {text[:200]}")
+            stats.errors += 1
+            raise UpstreamError(
+                f"Upstream HTTP {resp.status}: {_snippet(body)}",
+                status=resp.status,
+                retry_after=_parse_retry_after(resp.headers.get("Retry-After")),
+            )
+        started = time.perf_counter()
         try:
-            return await resp.json(content_type=None)
-        except Exception as err:
-            raise RuntimeError(f"Upstream non-JSON response: {text[:200]}") from err
+            data = _loads(body)
+        except ValueError as err:  # orjson.JSONDecodeError subclasses ValueError too
+            stats.errors += 1
+            raise RuntimeError(f"Upstream non-JSON response: {_snippet(body)}") from err
+        stats.record(len(body), time.perf_counter() - started)
+        del body
+        if validators is not None:
+            validators.clear()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                validators["url"] = url
+                if etag:
+                    validators["etag"] = etag
+                if last_modified:
+                    validators["last_modified"] = last_modified
+        return data
+
+
+def _parse_streets(data: Any) -> list[dict[str, Any]]:
+    members = data.get("hydra:member") if isinstance(data, dict) else None
+    streets: list[dict[str, Any]] = []
+    for s in members or []:
+        if not isinstance(s, dict):
+            continue
+        sid = s.get("id")
+        name = s.get("name")
+        if isinstance(sid, int) and isinstance(name, str):
+            streets.append({"id": sid, "name": name})
+    return streets
+
+
+def _absolute(link: str) -> str:
+    """Resolve a Hydra link (usually "/api/...") against the API origin."""
+    if URL is not None:
+        return str(URL(API).join(URL(link)))
+    from urllib.parse import urljoin
+    return urljoin(API, link)
+
+
+def _page_number(link: Any) -> int | None:
+    if not isinstance(link, str) or URL is None:
+        return None
+    page = URL(link).query.get("page")
+    return int(page) if page and page.isdigit() else None
 
 
 async def fetch_streets(hass, city_id: int, name_query: str | None = None) -> list[dict[str, Any]]:
@@ -75,17 +265,65 @@ async def fetch_streets(hass, city_id: int, name_query: str | None = None) -> li
 
     url = _build_url("pw_streets", params)
     data = await _get_json(hass, url, accept="application/ld+json")
+    return _parse_streets(data)
 
-    members = data.get("hydra:member") or []
-    streets: list[dict[str, Any]] = []
-    for s in members:
-        if not isinstance(s, dict):
-            continue
-        sid = s.get("id")
-        name = s.get("name")
-        if isinstance(sid, int) and isinstance(name, str):
-            streets.append({"id": sid, "name": name})
-    return streets
+
+async def iter_streets(
+    hass,
+    city_id: int,
+    name_query: str | None = None,
+    *,
+    concurrency: int = STREET_PAGE_CONCURRENCY,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Yield the street list page by page ({id, name} dicts), in page order.
+
+    Only the current page's Hydra document is held in memory. When hydra:last
+    gives the page count, up to `concurrency` pages are fetched ahead;
+    otherwise hydra:next links are followed one at a time.
+    """
+    params: dict[str, str] = {"city.id": str(city_id)}
+    if name_query:
+        params["name"] = name_query
+
+    data = await _get_json(hass, _build_url("pw_streets", params), accept="application/ld+json")
+    view = data.get("hydra:view") if isinstance(data, dict) else None
+    yield _parse_streets(data)
+    if not isinstance(view, dict):
+        return
+
+    last = view.get("hydra:last")
+    last_page = _page_number(last)
+    if last_page is None:
+        seen: set[str] = set()
+        link = view.get("hydra:next")
+        while isinstance(link, str) and link not in seen:
+            seen.add(link)
+            data = await _get_json(hass, _absolute(link), accept="application/ld+json")
+            view = data.get("hydra:view") if isinstance(data, dict) else None
+            link = view.get("hydra:next") if isinstance(view, dict) else None
+            yield _parse_streets(data)
+        return
+
+    # Page URLs keep whatever query the server put into hydra:last
+    last_url = URL(_absolute(last))
+
+    async def fetch_page(page: int) -> list[dict[str, Any]]:
+        url = str(last_url.update_query(page=str(page)))
+        return _parse_streets(await _get_json(hass, url, accept="application/ld+json"))
+
+    pages = iter(range(2, last_page + 1))
+    pending: deque[asyncio.Task[list[dict[str, Any]]]] = deque(
+        asyncio.create_task(fetch_page(p)) for p in itertools.islice(pages, max(1, concurrency))
+    )
+    try:
+        while pending:
+            streets = await pending.popleft()
+            if (page := next(pages, None)) is not None:
+                pending.append(asyncio.create_task(fetch_page(page)))
+            yield streets
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 async def fetch_building_group(hass, city_id: int, street_id: int) -> str:
@@ -108,3 +346,129 @@ async def fetch_building_groups(hass, city_id: int, street_id: int) -> list[str]
     """Return list of building groups (strings). Config flow expects a list."""
     grp = await fetch_building_group(hass, city_id, street_id)
     return [grp] if grp else []
+
+
+def _parse_date_graph(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _parse_graph_days(data: Any, group: str) -> list[dict[str, Any]]:
+    """All days of one group in an a_gpv_g collection, oldest first.
+
+    Returns [{"date_graph": datetime, "times": {...}}]; members without a
+    dateGraph or without times for the group are skipped. When upstream sends
+    several revisions of one day, the one with the latest dateCreate wins.
+    """
+    members = data.get("hydra:member") if isinstance(data, dict) else None
+    days: dict[datetime, tuple[str, dict[str, Any]]] = {}
+    for member in members if isinstance(members, list) else []:
+        if not isinstance(member, dict):
+            continue
+        date_graph = _parse_date_graph(member.get("dateGraph"))
+        data_json = member.get("dataJson")
+        entry = data_json.get(group) if isinstance(data_json, dict) else None
+        times = entry.get("times") if isinstance(entry, dict) else None
+        if date_graph is None or not isinstance(times, dict) or not times:
+            continue
+        created = str(member.get("dateCreate") or "")
+        previous = days.get(date_graph)
+        if previous is not None and previous[0] > created:
+            continue
+        days[date_graph] = (
+            created,
+            {"date_graph": date_graph, "times": {str(k): str(v) for k, v in times.items()}},
+        )
+    return [days[d][1] for d in sorted(days)]
+
+
+async def _fetch_graphs(
+    hass,
+    *,
+    city_id: int,
+    street_id: int,
+    groups: list[str],
+    days_ahead: int,
+    validators: dict[str, str] | None,
+) -> Any:
+    """GET a_gpv_g for several groups from 12h before today (UTC) to the end of today + days_ahead."""
+    now = datetime.now(timezone.utc)
+    day0 = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    params: list[tuple[str, str]] = [
+        ("after", (day0 - timedelta(hours=12)).isoformat()),
+        ("before", (day0 + timedelta(days=1 + days_ahead)).isoformat()),
+    ]
+    params.extend(("group[]", group) for group in groups)
+    params.append(("time", f"{city_id}{street_id}"))
+
+    url = _build_url("a_gpv_g", params)
+    data = await _get_json(
+        hass,
+        url,
+        accept="application/ld+json",
+        extra_headers={"x-debug-key": _debug_key(city_id, street_id)},
+        validators=validators,
+    )
+    if data is not NOT_MODIFIED and not isinstance(data, dict):
+        raise RuntimeError("Invalid a_gpv_g payload")
+    return data
+
+
+async def fetch_group_schedules(
+    hass,
+    *,
+    city_id: int,
+    street_id: int,
+    groups: Iterable[str],
+    days_ahead: int,
+    validators: dict[str, str] | None = None,
+) -> dict[str, list[dict[str, Any]]] | None:
+    """Fetch every published day for several groups in one request.
+
+    Returns {group: days} (see _parse_graph_days; a group upstream has no
+    graph for maps to []); None means "unchanged since last fetch".
+    """
+    wanted = sorted({str(g) for g in groups})
+    data = await _fetch_graphs(
+        hass,
+        city_id=city_id,
+        street_id=street_id,
+        groups=wanted,
+        days_ahead=days_ahead,
+        validators=validators,
+    )
+    if data is NOT_MODIFIED:
+        return None
+    return {group: _parse_graph_days(data, group) for group in wanted}
+
+
+async def fetch_schedule_days(
+    hass,
+    *,
+    city_id: int,
+    street_id: int,
+    group: str,
+    days_ahead: int,
+    validators: dict[str, str] | None = None,
+) -> list[dict[str, Any]] | None:
+    """Fetch every published day for one group up to today + days_ahead.
+
+    Returns [{"date_graph": datetime, "times": {...}}] oldest first (see
+    _parse_graph_days); None means "unchanged since last fetch".
+    """
+    schedules = await fetch_group_schedules(
+        hass,
+        city_id=city_id,
+        street_id=street_id,
+        groups=[group],
+        days_ahead=days_ahead,
+        validators=validators,
+    )
+    return None if schedules is None else schedules[str(group)]
@@ -14,6 +14,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .timeline import Segment, SegmentTimeline
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,54 +88,31 @@ class TernopilPlannedOutageBinarySensor(_BaseTernopilBinarySensor):
     def __init__(self, coordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator, entry, _BsDesc("planned_outage", "Planned outage"))
 
+    def _current(self) -> Segment | None:
+        coordinator = self.coordinator
+        if hasattr(coordinator, "current_view"):
+            return coordinator.current_view(_utc_ts_now()).current
+        timeline = coordinator.data
+        if not isinstance(timeline, SegmentTimeline):
+            return None
+        return timeline.segment_at(_utc_ts_now())
+
     @property
     def is_on(self) -> bool:
-        now = _utc_ts_now()
-        segments = self.coordinator.data
-        if not isinstance(segments, list):
-            return False
-
-        for seg in segments:
-            if not isinstance(seg, dict):
-                continue
-            start = seg.get("start")
-            end = seg.get("end")
-            if start is None or end is None:
-                continue
-            try:
-                if float(start) <= now < float(end):
-                    color = str(seg.get("color", "")).lower()
-                    # In this integration: red = outage, yellow = limited/uncertain.
-                    return color == "red"
-            except Exception:
-                continue
-        return False
+        current = self._current()
+        # In this integration: red = outage, yellow = limited/uncertain.
+        return current is not None and current.color == "red"
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        now = _utc_ts_now()
-        segments = self.coordinator.data
-        if not isinstance(segments, list):
-            return {}
-
-        current = None
-        for seg in segments:
-            if not isinstance(seg, dict):
-                continue
-            try:
-                if float(seg.get("start", -1)) <= now < float(seg.get("end", -1)):
-                    current = seg
-                    break
-            except Exception:
-                continue
-
+        current = self._current()
         if not current:
             return {}
 
         return {
-            "color": current.get("color"),
-            "segment_start": current.get("start"),
-            "segment_end": current.get("end"),
+            "color": current.color,
+            "segment_start": current.start_ts,
+            "segment_end": current.end_ts,
         }
 
 
@@ -156,8 +134,12 @@ class TernopilPowerPingBinarySensor(_BaseTernopilBinarySensor):
         data = self.coordinator.data
         if not isinstance(data, dict):
             return {}
-        return {
+        attrs = {
             "ip": data.get("ip"),
             "port": data.get("port"),
             "method": data.get("method"),
         }
+        if "targets" in data:
+            attrs["quorum"] = data.get("quorum")
+            attrs["targets"] = data.get("targets")
+        return attrs
@@ -0,0 +1,74 @@
+"""Adaptive polling cadence for the schedule coordinator.
+
+ - fast only shortly after the graph actually changed
+ - normal otherwise; slow once the graph has been stable for hours, except
+   inside publication windows, which never poll slower than normal
+ - exponential backoff with jitter on failures, starting from the interval
+   that applied anyway and honouring Retry-After
+ - every interval is jittered so HA instances do not poll in lockstep
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+import random
+
+from .const import (
+    DEFAULT_UPDATE_INTERVAL,
+    SCHEDULE_BACKOFF_MAX,
+    SCHEDULE_CHANGE_FAST_PERIOD,
+    SCHEDULE_INTERVAL_FAST,
+    SCHEDULE_INTERVAL_JITTER,
+    SCHEDULE_INTERVAL_SLOW,
+    SCHEDULE_PUBLICATION_WINDOWS,
+    SCHEDULE_STABLE_AFTER,
+    SCHEDULE_STARTUP_JITTER,
+)
+
+
+def in_publication_window(now_local: datetime) -> bool:
+    hour = now_local.hour
+    return any(start <= hour < end for start, end in SCHEDULE_PUBLICATION_WINDOWS)
+
+
+class PollCadence:
+    """Decides the next poll interval (seconds) after each refresh."""
+
+    def __init__(self, now_ts: float, *, uniform: Callable[[float, float], float] = random.uniform) -> None:
+        self.failures = 0
+        # Stability is measured from startup until the first observed change
+        self.last_change_ts = now_ts
+        self.seen_change = False
+        self._uniform = uniform
+
+    def base_interval(self, now_local: datetime) -> float:
+        since_change = now_local.timestamp() - self.last_change_ts
+        if self.seen_change and since_change < SCHEDULE_CHANGE_FAST_PERIOD:
+            return SCHEDULE_INTERVAL_FAST
+        if since_change >= SCHEDULE_STABLE_AFTER and not in_publication_window(now_local):
+            return SCHEDULE_INTERVAL_SLOW
+        return DEFAULT_UPDATE_INTERVAL
+
+    def on_success(self, now_local: datetime, *, changed: bool) -> float:
+        self.failures = 0
+        if changed:
+            self.last_change_ts = now_local.timestamp()
+            self.seen_change = True
+        base = self.base_interval(now_local)
+        return base * self._uniform(1 - SCHEDULE_INTERVAL_JITTER, 1 + SCHEDULE_INTERVAL_JITTER)
+
+    def on_failure(self, now_local: datetime, retry_after: float | None = None) -> float:
+        self.failures += 1
+        # Back off from the interval that applied anyway: a failure never polls sooner
+        base = self.base_interval(now_local)
+        cap = min(SCHEDULE_BACKOFF_MAX, base * 2**self.failures)
+        # "Equal jitter": keep at least half of the backoff, randomize the rest
+        delay = max(base, self._uniform(cap / 2, cap))
+        if retry_after:
+            delay = max(delay, min(float(retry_after), SCHEDULE_BACKOFF_MAX))
+        return delay
+
+    def startup_delay(self, *, has_data: bool) -> float:
+        """Random phase for the first refresh; short when there is nothing to show yet."""
+        return self._uniform(0, SCHEDULE_STARTUP_JITTER if has_data else 2)
@@ -0,0 +1,78 @@
+"""Calendar of planned outages, answered straight from the schedule timeline."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .timeline import RED, SegmentTimeline
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    bucket = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    schedule = bucket.get("schedule") if isinstance(bucket, dict) else None
+    if schedule is None:
+        _LOGGER.warning("No schedule coordinator found for entry %s", entry.entry_id)
+        return
+    async_add_entities([TernopilOutageCalendar(schedule, entry)])
+
+
+class TernopilOutageCalendar(CoordinatorEntity, CalendarEntity):
+    """One event per planned outage block (adjacent red segments merged)."""
+
+    _attr_name = "Outage schedule"
+
+    def __init__(self, coordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator)
+        self._entry_id = entry.entry_id
+        self._attr_unique_id = f"{entry.entry_id}_calendar"
+
+    def _timeline(self) -> SegmentTimeline | None:
+        data = self.coordinator.data
+        return data if isinstance(data, SegmentTimeline) else None
+
+    def _event(self, start_ts: float, end_ts: float, uid_ts: float | None = None) -> CalendarEvent:
+        return CalendarEvent(
+            start=dt_util.as_local(dt_util.utc_from_timestamp(start_ts)),
+            end=dt_util.as_local(dt_util.utc_from_timestamp(end_ts)),
+            summary="Planned outage",
+            # uid follows the whole block, so a clipped event keeps its identity
+            uid=f"{self._entry_id}_{int(start_ts if uid_ts is None else uid_ts)}",
+        )
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Current outage, or the next upcoming one."""
+        timeline = self._timeline()
+        if not timeline:
+            return None
+        now = datetime.now(timezone.utc).timestamp()
+        blocks = timeline.blocks(RED, now, float("inf"), limit=1)
+        return self._event(*blocks[0]) if blocks else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Outage blocks overlapping [start_date, end_date), clipped to that window."""
+        timeline = self._timeline()
+        if not timeline:
+            return []
+        start_ts, end_ts = start_date.timestamp(), end_date.timestamp()
+        return [
+            self._event(max(a, start_ts), min(b, end_ts), a)
+            for a, b in timeline.blocks(RED, start_ts, end_ts)
+        ]
@@ -3,9 +3,10 @@
 UX goal (per user request):
  - No city selection (only Ternopil).
  - No group selection.
- - User searches a street by name (dropdown supports typing/search).
- - User enters house number (stored for display).
- - Integration resolves the group automatically via API.
+ - User types part of a street name; matches come from the local street
+   catalog (streets.py), or from an upstream name search while it is cold.
+ - User picks the street (dropdown supports typing/search) and enters house number (stored for display).
+ - Integration resolves the group automatically (cached resolver, API on miss).
 """
 
 from __future__ import annotations
@@ -17,9 +18,10 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
-from .api import fetch_building_groups, fetch_streets
+from .api import fetch_streets
 from .const import (
     DEFAULT_POWER_SENSOR_NAME,
     DEFAULT_TERNOPIL_CITY_ID,
@@ -30,7 +32,31 @@ from .const import (
     CONF_STREET_ID,
     CONF_STREET_NAME,
     CONF_POWER_SENSOR_NAME,
+    CONF_STREET_QUERY,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_LOOKAHEAD_HOURS,
+    CONF_MIN_OUTAGE_MINUTES,
+    CONF_PING_INTERVAL,
+    CONF_PING_IP,
+    CONF_PING_METHOD,
+    CONF_PING_PORT,
+    CONF_PING_QUORUM,
+    CONF_PING_TARGETS,
+    CONF_PING_TIMEOUT,
+    DEFAULT_COUNTDOWN_INTERVAL,
+    DEFAULT_LOOKAHEAD_HOURS,
+    DEFAULT_MIN_OUTAGE_MINUTES,
+    DEFAULT_PING_INTERVAL,
+    DEFAULT_PING_IP,
+    DEFAULT_PING_METHOD,
+    DEFAULT_PING_PORT,
+    DEFAULT_PING_QUORUM,
+    DEFAULT_PING_TIMEOUT,
+    PING_METHODS,
+    STREET_CATALOG_WAIT,
 )
+from .resolver import async_get_group_resolver
+from .streets import async_get_street_catalog
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,26 +64,65 @@ _LOGGER = logging.getLogger(__name__)
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry):
+        return OptionsFlowHandler()
+
+    def __init__(self) -> None:
+        self._streets: list[dict[str, Any]] = []
+        self._power_sensor_name: str = DEFAULT_POWER_SENSOR_NAME
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
+        """Ask for a street name fragment; opens instantly (no network)."""
         errors: dict[str, str] = {}
+        catalog = async_get_street_catalog(self.hass, DEFAULT_TERNOPIL_CITY_ID)
+        await catalog.async_load()
+        # Warm the catalog in the background while the user types
+        catalog.async_schedule_refresh()
+
+        if user_input is not None:
+            query = str(user_input.get(CONF_STREET_QUERY) or "").strip()
+            self._power_sensor_name = user_input.get(CONF_POWER_SENSOR_NAME, DEFAULT_POWER_SENSOR_NAME)
+
+            if not len(catalog):
+                await catalog.async_wait_refresh(STREET_CATALOG_WAIT)
+
+            if len(catalog):
+                streets = catalog.search(query)
+            else:
+                # Catalog still cold: ask upstream for matching streets only
+                try:
+                    streets = await fetch_streets(
+                        self.hass, DEFAULT_TERNOPIL_CITY_ID, name_query=query or None
+                    )
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.exception("Street lookup failed: %s", err)
+                    streets = None
+                    errors["base"] = "cannot_connect"
 
-        # Load all streets once (Ternopil only). HA dropdown supports typing to filter.
-        try:
-            streets = await fetch_streets(self.hass, DEFAULT_TERNOPIL_CITY_ID)
-        except Exception as err:  # noqa: BLE001
-            _LOGGER.exception("Street lookup failed: %s", err)
-            return self.async_show_form(
-                step_id="user",
-                data_schema=vol.Schema({
-                    vol.Required(CONF_POWER_SENSOR_NAME, default=DEFAULT_POWER_SENSOR_NAME): str,
-                }),
-                errors={"base": "cannot_connect"},
-            )
-
-        # Build options as label/value pairs.
+            if streets is not None and not streets:
+                errors["base"] = "no_streets"
+            if not errors:
+                self._streets = streets
+                return await self.async_step_street()
+
+        schema = vol.Schema(
+            {
+                vol.Optional(CONF_STREET_QUERY): str,
+                vol.Optional(CONF_POWER_SENSOR_NAME, default=self._power_sensor_name): str,
+            }
+        )
+        return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+
+    async def async_step_street(self, user_input: dict[str, Any] | None = None):
+        """Pick a street from the matches and enter the house number."""
+        errors: dict[str, str] = {}
+
+        # Build options as label/value pairs from the cached matches (no re-download on error).
         options = [
             selector.SelectOptionDict(label=s["name"], value=str(s["id"]))
-            for s in streets
+            for s in self._streets
         ]
 
         schema = vol.Schema(
@@ -70,28 +135,28 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     )
                 ),
                 vol.Required(CONF_HOUSE_NUMBER): str,
-                vol.Optional(CONF_POWER_SENSOR_NAME, default=DEFAULT_POWER_SENSOR_NAME): str,
             }
         )
 
         if user_input is None:
-            return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+            return self.async_show_form(step_id="street", data_schema=schema, errors=errors)
 
         # Resolve street
         street_id = int(user_input[CONF_STREET_ID])
-        street_name = next((s["name"] for s in streets if s["id"] == street_id), str(street_id))
+        catalog = async_get_street_catalog(self.hass, DEFAULT_TERNOPIL_CITY_ID)
+        street_name = catalog.get(street_id) or next(
+            (s["name"] for s in self._streets if s["id"] == street_id), str(street_id)
+        )
         house_number = str(user_input[CONF_HOUSE_NUMBER]).strip()
 
-        # Resolve group automatically
+        # Resolve group automatically (local cache first, upstream on miss)
         try:
-            groups = await fetch_building_groups(
-                self.hass, city_id=DEFAULT_TERNOPIL_CITY_ID, street_id=street_id
-            )
-            group = groups[0]
+            resolver = async_get_group_resolver(self.hass, DEFAULT_TERNOPIL_CITY_ID)
+            group = await resolver.async_resolve(street_id)
         except Exception as err:  # noqa: BLE001
             _LOGGER.exception("Group lookup failed: %s", err)
             errors["base"] = "cannot_connect"
-            return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
+            return self.async_show_form(step_id="street", data_schema=schema, errors=errors)
 
         title = f"{street_name}, {house_number} (гр. {group})"
 
@@ -101,18 +166,55 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_STREET_NAME: street_name,
             CONF_HOUSE_NUMBER: house_number,
             CONF_GROUP: group,
-            CONF_POWER_SENSOR_NAME: user_input.get(CONF_POWER_SENSOR_NAME, DEFAULT_POWER_SENSOR_NAME),
+            CONF_POWER_SENSOR_NAME: self._power_sensor_name,
         }
 
         return self.async_create_entry(title=title, data=data)
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    """No options currently. Placeholder to keep HA happy."""
+    """Entity refresh and power-ping options."""
 
     async def async_step_init(self, user_input=None):  # noqa: D401
-        return self.async_create_entry(title="", data={})
+        if user_input is not None:
+            # Merge: other options (e.g. group from the select entity) must survive
+            return self.async_create_entry(title="", data={**self.config_entry.options, **user_input})
 
+        def get(key: str, default: Any) -> Any:
+            return self.config_entry.options.get(key, self.config_entry.data.get(key, default))
 
-async def async_get_options_flow(config_entry):
-    return OptionsFlowHandler()
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_COUNTDOWN_INTERVAL, default=get(CONF_COUNTDOWN_INTERVAL, DEFAULT_COUNTDOWN_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Required(
+                    CONF_LOOKAHEAD_HOURS, default=get(CONF_LOOKAHEAD_HOURS, DEFAULT_LOOKAHEAD_HOURS)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
+                vol.Required(
+                    CONF_MIN_OUTAGE_MINUTES, default=get(CONF_MIN_OUTAGE_MINUTES, DEFAULT_MIN_OUTAGE_MINUTES)
+                ): vol.All(vol.Coerce(int), vol.Range(min=30, max=1440)),
+                vol.Required(CONF_PING_IP, default=get(CONF_PING_IP, DEFAULT_PING_IP)): str,
+                vol.Required(CONF_PING_METHOD, default=get(CONF_PING_METHOD, DEFAULT_PING_METHOD)): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=PING_METHODS,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                        translation_key=CONF_PING_METHOD,
+                    )
+                ),
+                vol.Required(CONF_PING_PORT, default=get(CONF_PING_PORT, DEFAULT_PING_PORT)): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=65535)
+                ),
+                vol.Required(CONF_PING_TIMEOUT, default=get(CONF_PING_TIMEOUT, DEFAULT_PING_TIMEOUT)): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.1, max=10)
+                ),
+                vol.Required(CONF_PING_INTERVAL, default=get(CONF_PING_INTERVAL, DEFAULT_PING_INTERVAL)): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=3600)
+                ),
+                vol.Optional(CONF_PING_TARGETS, default=get(CONF_PING_TARGETS, "")): str,
+                vol.Required(CONF_PING_QUORUM, default=get(CONF_PING_QUORUM, DEFAULT_PING_QUORUM)): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=16)
+                ),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
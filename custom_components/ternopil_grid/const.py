@@ -21,6 +21,8 @@ CONF_PING_INTERVAL = "ping_interval"
 CONF_PING_METHOD = "ping_method"
 CONF_PING_PORT = "ping_port"
 CONF_PING_TIMEOUT = "ping_timeout"
+CONF_PING_TARGETS = "ping_targets"  # "host[:method[:port]], ..." (overrides ping_ip)
+CONF_PING_QUORUM = "ping_quorum"    # targets that must answer for "power on"
 
 DEFAULT_NAME = "Ternopil Grid"
 DEFAULT_POWER_SENSOR_NAME = "Ternopil Grid Power"
@@ -30,6 +32,8 @@ DEFAULT_PING_INTERVAL = 10  # seconds
 DEFAULT_PING_METHOD = "icmp"
 DEFAULT_PING_PORT = 80
 DEFAULT_PING_TIMEOUT = 1.0  # seconds
+DEFAULT_PING_QUORUM = 1
+PING_STAGGER = 0.05  # seconds between staggered multi-target probe starts
 
 # Outage groups (UI select)
 # NOTE: API returns strings like "4.1". Keep this list conservative; user can still type/select later if needed.
@@ -43,3 +47,84 @@ DEFAULT_GROUP = "1.1"
 
 # Data coordinator
 DEFAULT_UPDATE_INTERVAL = 300  # seconds
+
+# hass.data[DOMAIN] keys shared across config entries
+DATA_SCHEDULE_HUB = "schedule_hub"
+
+# Persistent storage (homeassistant.helpers.storage.Store)
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+
+# Street catalog (config flow)
+DATA_STREET_CATALOG = "street_catalog"
+STREET_CATALOG_TTL = 7 * 24 * 3600  # seconds
+STREET_SEARCH_LIMIT = 50
+STREET_CATALOG_WAIT = 3.0  # seconds the search step waits for a cold catalog
+CONF_STREET_QUERY = "street_query"
+STREET_PAGE_CONCURRENCY = 3  # pw_streets pages fetched in parallel
+
+# Response decoding
+DATA_DECODE_STATS = "decode_stats"
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+ERROR_SNIPPET_BYTES = 200
+
+# Building-group resolver (street_id -> chergGpv)
+DATA_GROUP_RESOLVER = "group_resolver"
+GROUP_RESOLVER_TTL = 30 * 24 * 3600  # seconds; older entries are re-resolved in the background
+DEFAULT_PREFETCH_CONCURRENCY = 4
+
+# Services
+SERVICE_PREFETCH_GROUPS = "prefetch_building_groups"
+ATTR_CONCURRENCY = "concurrency"
+SERVICE_GET_SCHEDULE = "get_schedule"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_GROUP = "group"
+ATTR_CITY_ID = "city_id"
+ATTR_START = "start"
+ATTR_END = "end"
+
+# Countdown sensor refresh tick (between schedule boundaries)
+CONF_COUNTDOWN_INTERVAL = "countdown_interval"
+DEFAULT_COUNTDOWN_INTERVAL = 60  # seconds
+CONF_LOOKAHEAD_HOURS = "lookahead_hours"        # window of the "off next hours" sensor
+DEFAULT_LOOKAHEAD_HOURS = 6
+CONF_MIN_OUTAGE_MINUTES = "min_outage_minutes"  # threshold of the "next long outage" sensor
+DEFAULT_MIN_OUTAGE_MINUTES = 120
+
+# Adaptive schedule polling (seconds unless noted)
+SCHEDULE_INTERVAL_FAST = 120     # for SCHEDULE_CHANGE_FAST_PERIOD after an actual change
+SCHEDULE_INTERVAL_SLOW = 1800    # graph stable for SCHEDULE_STABLE_AFTER
+SCHEDULE_CHANGE_FAST_PERIOD = 3600
+SCHEDULE_STABLE_AFTER = 6 * 3600
+# Local [start_hour, end_hour) windows when graphs are usually (re)published:
+# morning corrections for the day and the evening release of tomorrow's graph.
+# Inside them a stable graph is polled at DEFAULT_UPDATE_INTERVAL instead of
+# SCHEDULE_INTERVAL_SLOW, i.e. never more often than the old fixed interval.
+SCHEDULE_PUBLICATION_WINDOWS = ((6, 8), (18, 22))
+SCHEDULE_INTERVAL_JITTER = 0.1   # +-10% so instances drift out of lockstep
+SCHEDULE_BACKOFF_MAX = 3600
+SCHEDULE_STARTUP_JITTER = 30     # max startup delay when a snapshot was restored
+SCHEDULE_HORIZON_DAYS = 7        # days after today requested from a_gpv_g
+SCHEDULE_KEEP_PAST = 24 * 3600   # days that ended longer ago than this are evicted
+EVENT_SCHEDULE_CHANGED = f"{DOMAIN}_schedule_changed"
+
+# Ping methods
+PING_METHOD_ICMP = "icmp"
+PING_METHOD_TCP = "tcp"
+PING_METHOD_KEEPALIVE = "keepalive"  # long-lived TCP connection, push on drop
+PING_METHODS = [PING_METHOD_ICMP, PING_METHOD_TCP, PING_METHOD_KEEPALIVE]
+KEEPALIVE_RECONNECT_MIN = 1   # seconds; no reconnect is ever immediate
+KEEPALIVE_RECONNECT_MAX = 30  # seconds between reconnect attempts while down
+KEEPALIVE_STABLE_AFTER = 60   # seconds a connection must last before backoff resets
+
+DATA_PROBE_ENGINE = "probe_engine"
+DATA_ICMP_PROBER = "icmp_prober"
+
+# Probe health metrics
+PROBE_STATS_WINDOW = 120    # probes kept per target (ring buffer)
+PING_STATS_INTERVAL = 60    # seconds between RTT/loss sensor state writes
+
+# Actual outage history (ping transitions)
+HISTORY_MAX_TRANSITIONS = 5000
+HISTORY_MAX_DAYS = 60
+HISTORY_ACCURACY_DAYS = 7
@@ -1,35 +1,63 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+import hashlib
+import json
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import fetch_schedule
+from .api import fetch_schedule_days
+from .cadence import PollCadence
 from .const import (
     DOMAIN,
-    CONF_CITY_ID,
-    CONF_STREET_ID,
-    CONF_GROUP,
     DEFAULT_TERNOPIL_CITY_ID,
     DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_PING_INTERVAL,
+    DEFAULT_PING_IP,
+    DEFAULT_PING_METHOD,
+    DEFAULT_PING_PORT,
+    DEFAULT_PING_QUORUM,
+    DEFAULT_PING_TIMEOUT,
+    EVENT_SCHEDULE_CHANGED,
+    PING_METHOD_ICMP,
+    PING_STAGGER,
+    SCHEDULE_HORIZON_DAYS,
+    SCHEDULE_KEEP_PAST,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
 )
-from .ping import ping
+from .diff import diff_timelines
+from .ping import ProbeTarget, parse_targets, probe_quorum
+from .probe import async_get_icmp_prober, async_get_probe_engine
+from .slots import SlotIndex
+from .stats import ProbeStats
+from .timeline import EMPTY_TIMELINE, GREEN, RED, YELLOW, SegmentTimeline
+from .view import ScheduleView, build_view
+
+if TYPE_CHECKING:
+    from .hub import ScheduleBatch
 
 _LOGGER = logging.getLogger(__name__)
 
+# No days handed over by a batched poll (None already means "not modified")
+_NOT_PUSHED: Any = object()
+
 
-def _val_to_color(v: str) -> str:
+def _val_to_code(v: str) -> int:
     # Observed upstream values: "0", "1", "10"
     # 0 = outage (red), 1 = power (green), 10 = limited/uncertain (yellow)
     if v == "0":
-        return "red"
+        return RED
     if v == "1":
-        return "green"
-    return "yellow"
+        return GREEN
+    return YELLOW
 
 
 def _parse_day0(date_graph: datetime | None) -> datetime:
@@ -39,86 +67,375 @@ def _parse_day0(date_graph: datetime | None) -> datetime:
     return now.replace(hour=0, minute=0, second=0, microsecond=0)
 
 
-def _times_to_segments(day0_utc: datetime, times: dict[str, str]) -> list[dict[str, Any]]:
-    items: list[tuple[datetime, datetime, str]] = []
+def _times_to_segments(day0_utc: datetime, times: dict[str, str]) -> SegmentTimeline:
+    """Normalize {"HH:MM": value} half-hours into merged contiguous segments."""
+    base = day0_utc.replace(hour=0, minute=0).timestamp()
+    items: list[tuple[float, int]] = []
     for hhmm, v in times.items():
         try:
             hh, mm = hhmm.split(":")
-            start = day0_utc.replace(hour=int(hh), minute=int(mm))
+            h, m = int(hh), int(mm)
         except Exception:  # noqa: BLE001
             continue
-        end = start + timedelta(minutes=30)
-        items.append((start, end, _val_to_color(str(v))))
+        if not (0 <= h < 24 and 0 <= m < 60):
+            continue
+        items.append((base + h * 3600 + m * 60, _val_to_code(str(v))))
 
-    items.sort(key=lambda x: x[0])
+    items.sort()
 
-    segs: list[dict[str, Any]] = []
-    for start, end, color in items:
-        if not segs:
-            segs.append({"start_ts": start.timestamp(), "end_ts": end.timestamp(), "color": color})
-            continue
-        last = segs[-1]
-        if last["color"] == color and abs(last["end_ts"] - start.timestamp()) < 1:
-            last["end_ts"] = end.timestamp()
+    starts: list[float] = []
+    ends: list[float] = []
+    codes: list[int] = []
+    for start, code in items:
+        end = start + 1800
+        if codes and codes[-1] == code and abs(ends[-1] - start) < 1:
+            ends[-1] = end
         else:
-            segs.append({"start_ts": start.timestamp(), "end_ts": end.timestamp(), "color": color})
-    return segs
+            starts.append(start)
+            ends.append(end)
+            codes.append(code)
+    return SegmentTimeline(starts, ends, codes)
+
+
+def _times_fingerprint(date_graph: datetime | None, times: dict[str, str]) -> str:
+    """Stable hash of a normalized graph; equal hashes mean identical segments."""
+    payload = json.dumps(
+        [date_graph.isoformat() if isinstance(date_graph, datetime) else None, sorted(times.items())],
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
 
+class _Placeholder(SegmentTimeline):
+    """Short "unknown" segment shown while upstream publishes an empty graph."""
 
-class TernopilScheduleCoordinator(DataUpdateCoordinator[list[dict[str, Any]]]):
-    """Fetch and normalize the outage schedule into contiguous segments."""
+    __slots__ = ()
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+
+def _merge_days(days: list[SegmentTimeline]) -> SegmentTimeline:
+    """Concatenate per-day timelines (oldest first), joining equal colors across midnight."""
+    starts: list[float] = []
+    ends: list[float] = []
+    codes: list[int] = []
+    for day in days:
+        for start, end, code in zip(day.starts, day.ends, day.codes):
+            if ends and start < ends[-1]:
+                start = ends[-1]  # overlapping days: earlier day wins
+                if end <= start:
+                    continue
+            if codes and codes[-1] == code and abs(ends[-1] - start) < 1:
+                ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+                codes.append(code)
+    return SegmentTimeline(starts, ends, codes)
+
+
+def snapshot_store(hass: HomeAssistant, city_id: int, group: str | None) -> Store[dict[str, Any]]:
+    """Store holding the last good schedule of one (city, group)."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.schedule_{int(city_id)}_{group}")
+
+
+class TernopilScheduleCoordinator(DataUpdateCoordinator[SegmentTimeline]):
+    """Fetch and normalize the outage schedule into a SegmentTimeline.
+
+    One instance is shared by every config entry in the same (city, group),
+    see hub.ScheduleHub.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        city_id: int = DEFAULT_TERNOPIL_CITY_ID,
+        street_id: int,
+        group: str | None,
+    ) -> None:
         self.hass = hass
-        self.entry = entry
-        self.city_id: int = int(entry.data.get(CONF_CITY_ID, DEFAULT_TERNOPIL_CITY_ID))
-        self.street_id: int = int(entry.data[CONF_STREET_ID])
-        self.group: str | None = entry.data.get(CONF_GROUP)
+        self.city_id: int = int(city_id)
+        self.street_id: int = int(street_id)  # any street in the group; used for debug-key
+        self.group: str | None = group
+
+        # Conditional-request validators and fingerprint of the last parsed graph
+        self._validators: dict[str, str] = {}
+        self._fingerprint: str | None = None
+        # Per-day cache {day start ts: (fingerprint, segments)}; only changed days are re-normalized
+        self._days: dict[float, tuple[str, SegmentTimeline]] = {}
+        self._view: ScheduleView | None = None
+        self._slots: SlotIndex | None = None
+        self._cadence = PollCadence(dt_util.utcnow().timestamp())
+        # Single timer for the next segment edge, shared by every subscribed entity
+        self._unsub_boundary: CALLBACK_TYPE | None = None
+        # City-wide batched poll (set by hub.ScheduleHub) and days it handed over
+        self.batch: ScheduleBatch | None = None
+        self._pushed: Any = _NOT_PUSHED
+        # Loop time of the last successful fetch (own or pushed)
+        self.last_fetched: float | None = None
+
+        # Last good segments, persisted for warm start across restarts
+        self._store = snapshot_store(hass, self.city_id, group)
 
         super().__init__(
             hass,
             _LOGGER,
-            name=f"{DOMAIN}_schedule",
+            name=f"{DOMAIN}_schedule_{group}",
             update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
+            config_entry=None,
+            # Returning the previous data object means "unchanged": listeners are not notified.
+            always_update=False,
+        )
+
+    def current_view(self, ts: float | None = None) -> ScheduleView:
+        """Derived state for all entities; rebuilt only on new data or after a boundary."""
+        if ts is None:
+            ts = datetime.now(timezone.utc).timestamp()
+        timeline = self.data if isinstance(self.data, SegmentTimeline) else EMPTY_TIMELINE
+        view = self._view
+        if view is None or not view.is_current(timeline, ts):
+            view = self._view = build_view(timeline, ts)
+        return view
+
+    def slot_index(self) -> SlotIndex:
+        """Half-hour slot model of the current timeline, built once per new timeline."""
+        timeline = self.data if isinstance(self.data, SegmentTimeline) else EMPTY_TIMELINE
+        slots = self._slots
+        if slots is None or slots.timeline is not timeline:
+            slots = self._slots = SlotIndex(timeline)
+        return slots
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        remove = super().async_add_listener(update_callback, context)
+        if self._unsub_boundary is None:
+            self._async_arm_boundary()
+
+        @callback
+        def _remove() -> None:
+            remove()
+            if not self._listeners:
+                self._async_cancel_boundary()
+
+        return _remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # New data: build the slot model once, before entities read it
+        self.slot_index()
+        super().async_update_listeners()
+        self._async_arm_boundary()
+
+    @callback
+    def _async_cancel_boundary(self) -> None:
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+    @callback
+    def _async_arm_boundary(self) -> None:
+        """(Re)arm one timer at the moment the current view expires."""
+        self._async_cancel_boundary()
+        if not self._listeners:
+            return
+        view = self.current_view()
+        self._unsub_boundary = async_track_point_in_utc_time(
+            self.hass, self._async_on_boundary, dt_util.utc_from_timestamp(view.valid_until)
         )
 
-    async def _async_update_data(self) -> list[dict[str, Any]]:
+    @callback
+    def _async_on_boundary(self, _now: datetime) -> None:
+        # Entities re-read current_view(), which is rebuilt for the new instant
+        self._unsub_boundary = None
+        self.async_update_listeners()
+
+    @callback
+    def async_push_days(self, days: list[dict[str, Any]] | None) -> None:
+        """Take this group's days from another group's batched poll (None = not modified).
+
+        Runs a refresh without a request, which also restarts the poll timer.
+        """
+        self._pushed = days
+        self.hass.async_create_task(self.async_refresh(), f"{self.name}_pushed_refresh")
+
+    def startup_delay(self) -> float:
+        return self._cadence.startup_delay(has_data=self.data is not None)
+
+    async def async_shutdown(self) -> None:
+        self._async_cancel_boundary()
+        await super().async_shutdown()
+
+    async def async_restore_snapshot(self) -> bool:
+        """Load the last good segments from storage before the first network refresh."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Schedule snapshot for group %s unreadable: %s", self.group, err)
+            return False
+        if not isinstance(stored, dict):
+            return False
+        segs = stored.get("segments")
+        if not isinstance(segs, list) or not segs:
+            return False
+        timeline = SegmentTimeline.from_segments(segs)
+        if not timeline:
+            return False
+        if timeline.ends[-1] <= dt_util.utcnow().timestamp():
+            # Nothing current or ahead; its validators would only earn a 304 for stale data
+            _LOGGER.debug("Schedule snapshot for group %s is stale, ignoring it", self.group)
+            return False
+
+        self.data = timeline
+        self._fingerprint = stored.get("fingerprint")
+        validators = stored.get("validators")
+        if isinstance(validators, dict):
+            self._validators = {str(k): str(v) for k, v in validators.items()}
+        _LOGGER.debug("Restored %d schedule segments for group %s", len(timeline), self.group)
+        return True
+
+    def _snapshot(self) -> dict[str, Any]:
+        return {
+            "segments": self.data.to_list() if self.data else [],
+            "fingerprint": self._fingerprint,
+            "validators": self._validators,
+        }
+
+    async def _async_update_data(self) -> SegmentTimeline:
+        try:
+            timeline = await self._async_fetch_timeline()
+        except UpdateFailed as err:
+            retry_after = getattr(err.__cause__, "retry_after", None)
+            self.update_interval = timedelta(seconds=self._cadence.on_failure(dt_util.now(), retry_after))
+            raise
+        self.last_fetched = self.hass.loop.time()
+        # A renewed placeholder is not new data (keeps events quiet)
+        changed = timeline is not self.data and not (
+            isinstance(timeline, _Placeholder) and isinstance(self.data, _Placeholder)
+        )
+        # Only a real, new graph switches to fast polling; an empty upstream must not
+        self.update_interval = timedelta(
+            seconds=self._cadence.on_success(
+                dt_util.now(), changed=changed and not isinstance(timeline, _Placeholder)
+            )
+        )
+        if changed and isinstance(self.data, SegmentTimeline):
+            self._async_fire_changed(self.data, timeline)
+        return timeline
+
+    @callback
+    def _async_fire_changed(self, old: SegmentTimeline, new: SegmentTimeline) -> None:
+        """Fire one event with only the changed intervals from now on (nothing if none)."""
+        # Placeholders carry no schedule: diff them as empty
+        if isinstance(old, _Placeholder):
+            old = EMPTY_TIMELINE
+        if isinstance(new, _Placeholder):
+            new = EMPTY_TIMELINE
+        days = diff_timelines(old, new, since=dt_util.utcnow().timestamp())
+        if not days:
+            return
+        self.hass.bus.async_fire(
+            EVENT_SCHEDULE_CHANGED,
+            {
+                "city_id": self.city_id,
+                "group": self.group,
+                "changes": sum(len(c) for c in days.values()),
+                "days": days,
+            },
+        )
+
+    async def _async_fetch_days(self) -> list[dict[str, Any]] | None:
+        if self._pushed is not _NOT_PUSHED:
+            days, self._pushed = self._pushed, _NOT_PUSHED
+            return days
+        if self.batch is not None:
+            return await self.batch.async_fetch(self)
+        return await fetch_schedule_days(
+            self.hass,
+            city_id=self.city_id,
+            street_id=self.street_id,
+            group=self.group,
+            days_ahead=SCHEDULE_HORIZON_DAYS,
+            validators=self._validators,
+        )
+
+    async def _async_fetch_timeline(self) -> SegmentTimeline:
         if not self.group:
             raise UpdateFailed("Missing building group")
 
         try:
-            result = await fetch_schedule(
-                self.hass,
-                city_id=self.city_id,
-                street_id=self.street_id,
-                group=self.group,
-            )
+            days = await self._async_fetch_days()
         except Exception as err:  # noqa: BLE001
             raise UpdateFailed(str(err)) from err
 
-        times = result.get("times")
-        raw = result.get("raw")
-        empty = bool(result.get("empty"))
+        if days is None and self.data is not None:
+            # 304 Not Modified
+            return self.data
+        if days is None:
+            # 304 without anything parsed yet (should not happen): refetch unconditionally
+            self._validators.clear()
+            try:
+                days = await self._async_fetch_days()
+            except Exception as err:  # noqa: BLE001
+                raise UpdateFailed(str(err)) from err
 
-        if not isinstance(raw, dict):
-            raise UpdateFailed("Upstream payload missing raw")
+        # Evict days that are over; fingerprint the rest
+        now = datetime.now(timezone.utc).timestamp()
+        fresh: list[tuple[float, str, dict[str, Any]]] = []
+        for day in days or []:
+            day0 = _parse_day0(day["date_graph"])
+            base = day0.replace(hour=0, minute=0).timestamp()
+            if base + 86400 <= now - SCHEDULE_KEEP_PAST:
+                continue
+            fresh.append((base, _times_fingerprint(day["date_graph"], day["times"]), day))
 
         # If upstream returned 200 but empty graph: allow setup by returning a short unknown segment.
         # This prevents config entry from being stuck in "Failed setup" when upstream is temporarily empty.
-        if empty or not isinstance(times, dict) or len(times) == 0:
-            now = datetime.now(timezone.utc).replace(microsecond=0)
-            return [{"start_ts": now.timestamp(), "end_ts": (now + timedelta(minutes=30)).timestamp(), "color": "yellow"}]
+        if not fresh:
+            self._days = {}
+            self._fingerprint = None
+            placeholder = self.data
+            if isinstance(placeholder, _Placeholder) and placeholder.ends[-1] > now:
+                # Still covers now: same object, so listeners are not notified
+                return placeholder
+            now = datetime.now(timezone.utc).replace(microsecond=0).timestamp()
+            return _Placeholder([now], [now + 1800], [YELLOW])
 
-        day0 = _parse_day0(result.get("date_graph"))
-        segs = _times_to_segments(day0, {str(k): str(v) for k, v in times.items()})
+        fingerprint = hashlib.sha1(
+            "|".join(fp for _, fp, _ in fresh).encode("ascii")
+        ).hexdigest()
+        if fingerprint == self._fingerprint and self.data is not None:
+            # Same graphs as last time: skip normalization and listener updates
+            return self.data
+
+        cache: dict[float, tuple[str, SegmentTimeline]] = {}
+        changed = 0
+        for base, fp, day in fresh:
+            cached = self._days.get(base)
+            if cached is None or cached[0] != fp:
+                cached = (fp, _times_to_segments(_parse_day0(day["date_graph"]), day["times"]))
+                changed += 1
+            cache[base] = cached
+        segs = _merge_days([cache[base][1] for base in sorted(cache)])
         if not segs:
-            _LOGGER.warning("Schedule empty, keeping previous state"); return []
+            _LOGGER.warning("Schedule empty, keeping previous state")
+            return self.data if self.data is not None else SegmentTimeline()
 
+        _LOGGER.debug(
+            "Group %s schedule: %d of %d days re-normalized", self.group, changed, len(cache)
+        )
+        self._days = cache
+        self._fingerprint = fingerprint
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
         return segs
 
 
 class TernopilPingCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Ping coordinator for simple connectivity/outage heuristics."""
+    """Ping coordinator for simple connectivity/outage heuristics.
+
+    Targets are probed by the shared probe.ProbeEngine (deduplicated across
+    entries, keepalive targets held open); results are pushed here and
+    "power on" needs ping_quorum positive targets. Only the first refresh
+    probes directly, racing all targets concurrently.
+    """
 
     def __init__(
         self,
@@ -127,22 +444,111 @@ class TernopilPingCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         *,
         ping_ip: str | None,
         ping_interval: int | None,
+        ping_method: str | None = None,
+        ping_port: int | None = None,
+        ping_timeout: float | None = None,
+        ping_targets: str | None = None,
+        ping_quorum: int | None = None,
     ) -> None:
         self.hass = hass
         self.entry = entry
-        self.ping_ip = ping_ip or "1.1.1.1"
-        self._interval = int(ping_interval or 10)
+        self.ping_ip = ping_ip or DEFAULT_PING_IP
+        self.ping_method = (ping_method or DEFAULT_PING_METHOD).lower().strip()
+        self.ping_port = int(ping_port or DEFAULT_PING_PORT)
+        self._timeout = float(ping_timeout or DEFAULT_PING_TIMEOUT)
+        self._interval = int(ping_interval or DEFAULT_PING_INTERVAL)
+        self.targets: list[ProbeTarget] = parse_targets(
+            ping_targets, default_method=self.ping_method, default_port=self.ping_port
+        ) or [
+            ProbeTarget(
+                self.ping_ip,
+                self.ping_method,
+                0 if self.ping_method == PING_METHOD_ICMP else self.ping_port,
+            )
+        ]
+        self.quorum = max(1, min(int(ping_quorum or DEFAULT_PING_QUORUM), len(self.targets)))
+        self._latest: dict[ProbeTarget, bool | None] = {t: None for t in self.targets}
+        self._unsubs: list[CALLBACK_TYPE] = []
 
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_ping",
-            update_interval=timedelta(seconds=self._interval),
+            # push-based: the probe engine owns the timers
+            update_interval=None,
         )
 
+    def _result(
+        self, ok: bool, per_target: dict[ProbeTarget, bool | None] | None = None
+    ) -> dict[str, Any]:
+        primary = self.targets[0]
+        data: dict[str, Any] = {
+            "ok": bool(ok),
+            "ip": primary.host,
+            "port": primary.port or None,
+            "method": primary.method,
+        }
+        if len(self.targets) > 1:
+            data["quorum"] = self.quorum
+            data["targets"] = {str(t): (per_target or {}).get(t) for t in self.targets}
+        return data
+
+    def primary_stats(self) -> ProbeStats | None:
+        """Probe health of the first (primary) target."""
+        return async_get_probe_engine(self.hass).stats(self.targets[0])
+
+    def target_stats(self) -> dict[str, dict[str, Any]]:
+        engine = async_get_probe_engine(self.hass)
+        out: dict[str, dict[str, Any]] = {}
+        for target in self.targets:
+            stats = engine.stats(target)
+            if stats is not None:
+                out[str(target)] = stats.as_dict()
+        return out
+
+    @callback
+    def async_start(self) -> None:
+        """Subscribe all targets to the shared probe engine."""
+        if self._unsubs:
+            return
+        engine = async_get_probe_engine(self.hass)
+        self._unsubs = [
+            engine.async_subscribe(
+                target,
+                self._async_on_probe,
+                interval=self._interval,
+                timeout_s=self._timeout,
+            )
+            for target in self.targets
+        ]
+
+    @callback
+    def _async_on_probe(self, target: ProbeTarget, ok: bool) -> None:
+        self._latest[target] = ok
+        positives = sum(1 for v in self._latest.values() if v)
+        data = self._result(positives >= self.quorum, self._latest)
+        # Only notify entities when something visible changed
+        if data != self.data:
+            self.async_set_updated_data(data)
+
+    async def async_shutdown(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+        await super().async_shutdown()
+
     async def _async_update_data(self) -> dict[str, Any]:
+        # keepalive targets get a plain TCP check here
         try:
-            ok = await ping(self.ping_ip, timeout_s=1.0)
+            ok, per_target = await probe_quorum(
+                self.targets,
+                quorum=self.quorum,
+                timeout_s=self._timeout,
+                stagger_s=PING_STAGGER,
+                prober=async_get_icmp_prober(self.hass),
+            )
         except Exception as err:  # noqa: BLE001
             raise UpdateFailed(str(err)) from err
-        return {"ok": bool(ok)}
+        for target, value in per_target.items():
+            if value is not None:
+                self._latest[target] = value
+        return self._result(ok, per_target)
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 from .const import (
+    DATA_DECODE_STATS,
+    DATA_PROBE_ENGINE,
+    DOMAIN,
     CONF_GROUP,
     CONF_PING_IP,
     CONF_PING_PORT,
@@ -13,10 +16,20 @@ async def async_get_config_entry_diagnostics(hass, entry):
     def get(k):
         return entry.options.get(k, entry.data.get(k))
 
+    bucket = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    ping = bucket.get("ping") if isinstance(bucket, dict) else None
+    history = bucket.get("history") if isinstance(bucket, dict) else None
+    engine = hass.data.get(DOMAIN, {}).get(DATA_PROBE_ENGINE)
+    decode = hass.data.get(DOMAIN, {}).get(DATA_DECODE_STATS)
+
     return {
         "group": get(CONF_GROUP),
         "ping_ip": get(CONF_PING_IP),
         "ping_port": get(CONF_PING_PORT),
         "ping_timeout": get(CONF_PING_TIMEOUT),
         "ping_interval": get(CONF_PING_INTERVAL),
+        "ping_targets": ping.target_stats() if ping is not None else {},
+        "probe_engine": engine.as_diagnostics() if engine is not None else None,
+        "outage_history": history.summary() if history is not None else None,
+        "response_decoding": decode.as_dict() if decode is not None else None,
     }
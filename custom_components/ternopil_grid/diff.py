@@ -0,0 +1,79 @@
+"""Structural diff between two schedule timelines, grouped by local day.
+
+Used by the schedule coordinator to fire one compact change event per
+update instead of making consumers re-read the whole schedule.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .timeline import COLORS, SegmentTimeline
+from .view import local_datetime, local_day_bounds
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_RECOLORED = "recolored"
+
+
+def _code_at(timeline: SegmentTimeline, ts: float) -> int | None:
+    i = timeline.index_at(ts)
+    return timeline.codes[i] if i >= 0 else None
+
+
+def _changed_spans(
+    old: SegmentTimeline, new: SegmentTimeline, since: float | None
+) -> list[tuple[float, float, int | None, int | None]]:
+    """Maximal [start, end) spans where the color differs, with (old, new) codes."""
+    points = sorted({*old.starts, *old.ends, *new.starts, *new.ends})
+    spans: list[tuple[float, float, int | None, int | None]] = []
+    for a, b in zip(points, points[1:]):
+        if since is not None:
+            if b <= since:
+                continue
+            a = max(a, since)
+        before, after = _code_at(old, a), _code_at(new, a)
+        if before == after:
+            continue
+        if spans and spans[-1][1] == a and spans[-1][2:] == (before, after):
+            spans[-1] = (spans[-1][0], b, before, after)
+        else:
+            spans.append((a, b, before, after))
+    return spans
+
+
+def diff_timelines(
+    old: SegmentTimeline, new: SegmentTimeline, since: float | None = None
+) -> dict[str, list[dict[str, Any]]]:
+    """Changed intervals from old to new, keyed by local date (ISO).
+
+    Each change is {"start", "end" (local ISO), "change", "old", "new"} where
+    change is added / removed / recolored. Spans crossing local midnight are
+    split per day. Intervals ending at or before `since` are ignored. An
+    empty dict means no change.
+    """
+    days: dict[str, list[dict[str, Any]]] = {}
+    if old == new:
+        return days
+    for start, end, before, after in _changed_spans(old, new, since):
+        if before is None:
+            kind = CHANGE_ADDED
+        elif after is None:
+            kind = CHANGE_REMOVED
+        else:
+            kind = CHANGE_RECOLORED
+        while start < end:
+            day = local_datetime(start).date()
+            _, day_end = local_day_bounds(day)
+            stop = min(end, day_end)
+            days.setdefault(day.isoformat(), []).append(
+                {
+                    "start": local_datetime(start).isoformat(),
+                    "end": local_datetime(stop).isoformat(),
+                    "change": kind,
+                    "old": COLORS[before] if before is not None else None,
+                    "new": COLORS[after] if after is not None else None,
+                }
+            )
+            start = stop
+    return days
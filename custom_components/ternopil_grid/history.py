@@ -0,0 +1,263 @@
+"""Compact log of actual power on/off transitions with daily rollups.
+
+Transitions from the ping path are appended to two packed arrays
+(timestamps, states) and persisted in a Store. Per local day we maintain
+actual-off, planned-off and overlap seconds incrementally, so "minutes off
+today" and schedule accuracy are read without scanning history.
+
+Rollups are keyed by outage group: after a group change the new group's
+accuracy is not mixed with days planned for the old one. A day's
+planned-off seconds are finalized at local midnight (or on the next load
+when HA was down at midnight); today's are computed on read.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    HISTORY_ACCURACY_DAYS,
+    HISTORY_MAX_DAYS,
+    HISTORY_MAX_TRANSITIONS,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .timeline import RED, SegmentTimeline
+from .view import local_day_bounds
+
+_LOGGER = logging.getLogger(__name__)
+
+# rollup row: [actual_off_s, planned_off_s, overlap_s]
+_ACTUAL, _PLANNED, _OVERLAP = 0, 1, 2
+
+
+def history_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.history_{entry_id}")
+
+
+async def async_remove_history(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored history of a removed config entry."""
+    await history_store(hass, entry_id).async_remove()
+
+
+def _local_date(ts: float) -> date:
+    return dt_util.as_local(dt_util.utc_from_timestamp(ts)).date()
+
+
+def _jaccard(actual: float, planned: float, overlap: float) -> float | None:
+    union = actual + planned - overlap
+    if union <= 0:
+        return None
+    return overlap / union
+
+
+class OutageHistory:
+    """Actual outage log for one config entry (tagged with its group)."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        group: str | None,
+        timeline: Callable[[], SegmentTimeline | None],
+    ) -> None:
+        self.hass = hass
+        self.group = group
+        self._timeline = timeline
+        self._store = history_store(hass, entry_id)
+        self._ts = array("d")
+        self._state = array("b")
+        # {group: {local day iso: [actual_off_s, planned_off_s, overlap_s]}}
+        self._days: dict[str, dict[str, list[float]]] = {}
+        self._off_since: float | None = None
+        # Local day whose planned-off seconds are not final yet
+        self._open_day: date | None = None
+        self._unsub_midnight: CALLBACK_TYPE | None = None
+
+    # --- persistence ---
+
+    async def async_load(self) -> None:
+        stored = await self._store.async_load()
+        if isinstance(stored, dict):
+            self._restore(stored)
+        self._async_roll_day(time.time())
+
+    def _restore(self, stored: dict[str, Any]) -> None:
+        try:
+            ts = array("d", (float(v) for v in stored.get("ts", [])))
+            state = array("b", (1 if v else 0 for v in stored.get("state", [])))
+            days = {
+                str(group): {str(k): [float(x) for x in v][:3] for k, v in rows.items()}
+                for group, rows in (stored.get("days") or {}).items()
+            }
+            open_day = date.fromisoformat(stored["open_day"]) if stored.get("open_day") else None
+        except (AttributeError, TypeError, ValueError) as err:
+            _LOGGER.warning("Outage history unreadable, starting fresh: %s", err)
+            return
+        if len(ts) == len(state):
+            self._ts, self._state = ts, state
+        self._days = days
+        self._open_day = open_day
+        if self._state and not self._state[-1]:
+            self._off_since = self._ts[-1]
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "ts": self._ts.tolist(),
+            "state": self._state.tolist(),
+            "days": self._days,
+            "open_day": self._open_day.isoformat() if self._open_day else None,
+        }
+
+    def _save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    # --- day rollover ---
+
+    @callback
+    def async_start(self) -> None:
+        """Finalize each day at local midnight."""
+        if self._unsub_midnight is None:
+            self._unsub_midnight = async_track_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    @callback
+    def _async_midnight(self, now: datetime) -> None:
+        self._async_roll_day(now.timestamp())
+
+    @callback
+    def _async_roll_day(self, now: float) -> None:
+        """Finalize planned-off seconds of the open day once it is over."""
+        today = _local_date(now)
+        day = self._open_day
+        if day == today:
+            return
+        if day is not None and day < today:
+            day_start, day_end = local_day_bounds(day)
+            self._row(day)[_PLANNED] = self._planned_seconds(day_start, day_end)
+            self._trim()
+        self._open_day = today
+        self._save()
+
+    # --- recording ---
+
+    @property
+    def _group_days(self) -> dict[str, list[float]]:
+        return self._days.get(str(self.group), {})
+
+    def _row(self, day: date) -> list[float]:
+        rows = self._days.setdefault(str(self.group), {})
+        return rows.setdefault(day.isoformat(), [0.0, 0.0, 0.0])
+
+    def _planned_seconds(self, start: float, end: float) -> float:
+        timeline = self._timeline()
+        if not isinstance(timeline, SegmentTimeline) or end <= start:
+            return 0.0
+        return timeline.seconds_in(RED, start, end)
+
+    def _add_off_interval(self, start: float, end: float) -> None:
+        """Add a closed actual-off interval to the per-day rollups."""
+        day = _local_date(start)
+        while start < end:
+            day_start, day_end = local_day_bounds(day)
+            a, b = max(start, day_start), min(end, day_end)
+            if b > a:
+                row = self._row(day)
+                row[_ACTUAL] += b - a
+                row[_OVERLAP] += self._planned_seconds(a, b)
+            start = day_end
+            day += timedelta(days=1)
+
+    def _trim(self) -> None:
+        extra = len(self._ts) - HISTORY_MAX_TRANSITIONS
+        if extra > 0:
+            del self._ts[:extra]
+            del self._state[:extra]
+        for rows in self._days.values():
+            if len(rows) > HISTORY_MAX_DAYS:
+                for key in sorted(rows)[: len(rows) - HISTORY_MAX_DAYS]:
+                    del rows[key]
+
+    @callback
+    def async_record(self, ok: bool, now: float | None = None) -> None:
+        """Append a transition if the power state changed."""
+        if now is None:
+            now = time.time()
+        state = 1 if ok else 0
+        if self._state and self._state[-1] == state:
+            return
+        self._ts.append(now)
+        self._state.append(state)
+        if state:
+            if self._off_since is not None:
+                self._add_off_interval(self._off_since, now)
+            self._off_since = None
+        else:
+            self._off_since = now
+        self._async_roll_day(now)
+        self._trim()
+        self._save()
+
+    # --- reads ---
+
+    def transitions(self) -> list[tuple[float, bool]]:
+        return [(t, bool(s)) for t, s in zip(self._ts, self._state)]
+
+    def _today_row(self, now: float) -> tuple[float, float, float]:
+        """Today's rollup including the still-open outage (if any); reads only."""
+        today = _local_date(now)
+        day_start, _ = local_day_bounds(today)
+        actual, _, overlap = self._group_days.get(today.isoformat(), (0.0, 0.0, 0.0))
+        planned = self._planned_seconds(day_start, now)
+        if self._off_since is not None:
+            a = max(self._off_since, day_start)
+            if now > a:
+                actual += now - a
+                overlap += self._planned_seconds(a, now)
+        return actual, planned, overlap
+
+    def actual_minutes_off_today(self, now: float | None = None) -> int:
+        actual, _, _ = self._today_row(now or time.time())
+        return int(round(actual / 60.0))
+
+    def summary(self, now: float | None = None) -> dict[str, Any]:
+        """Today's and rolling HISTORY_ACCURACY_DAYS accuracy (Jaccard of planned vs actual off)."""
+        now = now or time.time()
+        actual, planned, overlap = self._today_row(now)
+        today = _local_date(now)
+        rows = self._group_days
+        sums = [actual, planned, overlap]
+        for i in range(1, HISTORY_ACCURACY_DAYS):
+            row = rows.get((today - timedelta(days=i)).isoformat())
+            if row:
+                for k in range(3):
+                    sums[k] += row[k]
+        acc_today = _jaccard(actual, planned, overlap)
+        acc_days = _jaccard(*sums)
+        return {
+            "group": self.group,
+            "actual_off_today_min": int(round(actual / 60.0)),
+            "planned_off_so_far_min": int(round(planned / 60.0)),
+            "overlap_today_min": int(round(overlap / 60.0)),
+            "accuracy_today": round(acc_today * 100, 1) if acc_today is not None else None,
+            f"accuracy_{HISTORY_ACCURACY_DAYS}d": round(acc_days * 100, 1) if acc_days is not None else None,
+            "transitions": len(self._ts),
+        }
@@ -0,0 +1,229 @@
+"""Domain-level hub sharing one schedule coordinator per (city, group).
+
+Several config entries (addresses) usually sit in the same outage group.
+Instead of every entry polling the same graph on its own timer, entries
+acquire the coordinator for their (city, group) here and release it on unload.
+The coordinator is shut down when the last entry releases it.
+
+Coordinators of one city also share a ScheduleBatch: whichever group is due
+first polls a_gpv_g for every group of the city in one request, and hands the
+other groups their days, which restarts their poll timers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .api import fetch_group_schedules
+from .const import (
+    CONF_CITY_ID,
+    CONF_GROUP,
+    CONF_STREET_ID,
+    DATA_SCHEDULE_HUB,
+    DEFAULT_TERNOPIL_CITY_ID,
+    DOMAIN,
+    SCHEDULE_HORIZON_DAYS,
+)
+from .coordinator import TernopilScheduleCoordinator, snapshot_store
+
+_LOGGER = logging.getLogger(__name__)
+
+HubKey = tuple[int, str]
+
+
+def entry_group(entry: ConfigEntry) -> str | None:
+    """Return the outage group for an entry (options override data)."""
+    return entry.options.get(CONF_GROUP, entry.data.get(CONF_GROUP))
+
+
+def entry_hub_key(entry: ConfigEntry) -> HubKey:
+    city_id = int(entry.data.get(CONF_CITY_ID, DEFAULT_TERNOPIL_CITY_ID))
+    return city_id, str(entry_group(entry) or "")
+
+
+class ScheduleBatch:
+    """One a_gpv_g request per poll for every shared group of a city.
+
+    Concurrent polls join the request in flight. Conditional-request
+    validators belong to the batch (the URL lists all its groups).
+    """
+
+    def __init__(self, hass: HomeAssistant, city_id: int) -> None:
+        self.hass = hass
+        self.city_id = city_id
+        self.coordinators: dict[str, TernopilScheduleCoordinator] = {}
+        self._validators: dict[str, str] = {}
+        self._inflight: asyncio.Task[dict[str, list] | None] | None = None
+        self._waiting: set[TernopilScheduleCoordinator] = set()
+
+    async def async_fetch(self, requester: TernopilScheduleCoordinator) -> list | None:
+        """Days of requester's group; None (not modified) only if it already has data."""
+        result = await self._async_join(requester)
+        if result is None and requester.data is None:
+            # 304 but nothing parsed for this group yet: refetch unconditionally
+            self._validators.clear()
+            result = await self._async_join(requester)
+        return None if result is None else result.get(str(requester.group), [])
+
+    async def _async_join(self, requester: TernopilScheduleCoordinator) -> dict[str, list] | None:
+        task = self._inflight
+        if task is None or task.done():
+            waiting = self._waiting = {requester}
+            task = self._inflight = self.hass.async_create_task(
+                self._async_poll(waiting), f"{DOMAIN}_schedule_batch_{self.city_id}"
+            )
+        else:
+            self._waiting.add(requester)
+        return await asyncio.shield(task)
+
+    async def _async_poll(self, waiting: set[TernopilScheduleCoordinator]) -> dict[str, list] | None:
+        coordinators = dict(self.coordinators)
+        if not coordinators:
+            return {}
+        # Any street of the city will do for the debug key
+        street_id = next(iter(coordinators.values())).street_id
+        result = await fetch_group_schedules(
+            self.hass,
+            city_id=self.city_id,
+            street_id=street_id,
+            groups=list(coordinators),
+            days_ahead=SCHEDULE_HORIZON_DAYS,
+            validators=self._validators,
+        )
+        for group, coordinator in coordinators.items():
+            if coordinator in waiting or self.coordinators.get(group) is not coordinator:
+                continue
+            if result is not None:
+                coordinator.async_push_days(result.get(group, []))
+            elif coordinator.data is not None:
+                coordinator.async_push_days(None)
+        return result
+
+
+@dataclass
+class _Slot:
+    coordinator: TernopilScheduleCoordinator
+    restored: asyncio.Task[bool] | None = None
+    first_refresh: asyncio.Task[None] | None = None
+    entry_ids: set[str] = field(default_factory=set)
+
+
+class ScheduleHub:
+    """Reference-counted registry of shared schedule coordinators."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._slots: dict[HubKey, _Slot] = {}
+        self._batches: dict[int, ScheduleBatch] = {}
+
+    async def async_acquire(self, entry: ConfigEntry) -> TernopilScheduleCoordinator:
+        """Subscribe an entry to the coordinator for its (city, group).
+
+        Returns once the stored snapshot (if any) is loaded into the coordinator,
+        so entities have data before the first network refresh completes.
+        """
+        key = entry_hub_key(entry)
+        slot = self._slots.get(key)
+        if slot is None:
+            city_id, group = key
+            coordinator = TernopilScheduleCoordinator(
+                self.hass,
+                city_id=city_id,
+                street_id=int(entry.data[CONF_STREET_ID]),
+                group=group or None,
+            )
+            if group:
+                batch = self._batches.get(city_id)
+                if batch is None:
+                    batch = self._batches[city_id] = ScheduleBatch(self.hass, city_id)
+                batch.coordinators[group] = coordinator
+                coordinator.batch = batch
+            # Register the slot before awaiting so concurrent setups share it
+            slot = self._slots[key] = _Slot(coordinator)
+            slot.restored = self.hass.async_create_task(self._async_start(slot))
+            _LOGGER.debug("Created schedule coordinator for city %s group %s", city_id, group)
+
+        slot.entry_ids.add(entry.entry_id)
+        await asyncio.shield(slot.restored)
+        return slot.coordinator
+
+    async def async_release(self, entry: ConfigEntry) -> None:
+        """Drop an entry's subscription; stop the coordinator when unused."""
+        for key, slot in list(self._slots.items()):
+            if entry.entry_id not in slot.entry_ids:
+                continue
+            slot.entry_ids.discard(entry.entry_id)
+            if not slot.entry_ids:
+                del self._slots[key]
+                self._async_leave_batch(slot.coordinator)
+                for task in (slot.restored, slot.first_refresh):
+                    if task is not None and not task.done():
+                        task.cancel()
+                await slot.coordinator.async_shutdown()
+                _LOGGER.debug("Released schedule coordinator for city %s group %s", *key)
+
+    @callback
+    def _async_leave_batch(self, coordinator: TernopilScheduleCoordinator) -> None:
+        batch = coordinator.batch
+        if batch is None:
+            return
+        coordinator.batch = None
+        batch.coordinators.pop(str(coordinator.group), None)
+        if not batch.coordinators:
+            self._batches.pop(batch.city_id, None)
+
+    def coordinators(self) -> dict[HubKey, TernopilScheduleCoordinator]:
+        return {key: slot.coordinator for key, slot in self._slots.items()}
+
+    def subscribers(self, key: HubKey) -> set[str]:
+        slot = self._slots.get(key)
+        return set(slot.entry_ids) if slot else set()
+
+    async def _async_start(self, slot: _Slot) -> bool:
+        coordinator = slot.coordinator
+        restored = await coordinator.async_restore_snapshot()
+        # Background task: the random startup delay must not hold up HA startup.
+        # Kept on the slot so a release during the delay cancels it.
+        slot.first_refresh = self.hass.async_create_background_task(
+            self._async_first_refresh(coordinator), f"{coordinator.name}_first_refresh"
+        )
+        return restored
+
+    async def _async_first_refresh(self, coordinator: TernopilScheduleCoordinator) -> None:
+        started = self.hass.loop.time()
+        # Random startup phase so restarted instances do not poll in lockstep
+        await asyncio.sleep(coordinator.startup_delay())
+        if coordinator.last_fetched is not None and coordinator.last_fetched >= started:
+            # Another group's batched poll already covered this one
+            return
+        # Shared coordinators are not bound to one config entry, so use async_refresh
+        # (non-fatal) instead of async_config_entry_first_refresh.
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            _LOGGER.warning(
+                "schedule first refresh failed (non-fatal): %s", coordinator.last_exception
+            )
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored schedule of entry's (city, group) unless another entry still uses it."""
+    key = entry_hub_key(entry)
+    for other in hass.config_entries.async_entries(DOMAIN):
+        if other.entry_id != entry.entry_id and entry_hub_key(other) == key:
+            return
+    city_id, group = key
+    await snapshot_store(hass, city_id, group or None).async_remove()
+
+
+@callback
+def async_get_schedule_hub(hass: HomeAssistant) -> ScheduleHub:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hub = domain_data.get(DATA_SCHEDULE_HUB)
+    if hub is None:
+        hub = domain_data[DATA_SCHEDULE_HUB] = ScheduleHub(hass)
+    return hub
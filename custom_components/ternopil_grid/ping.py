@@ -1,9 +1,137 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import socket
+import struct
+import sys
+import time
 
+_LOGGER = logging.getLogger(__name__)
 
-async def icmp_ping(host: str, timeout_s: float = 1.0) -> bool:
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+
+
+def _icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_echo_packet(ident: int, seq: int) -> bytes:
+    payload = struct.pack("!d", time.monotonic())
+    header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = _icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+
+def _parse_echo_reply(data: bytes) -> tuple[int, int] | None:
+    """(id, sequence) of an ICMP echo reply, or None for anything else."""
+    # Some platforms (macOS) deliver the IPv4 header too
+    if data and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4 :]
+    if len(data) < 8 or data[0] != _ICMP_ECHO_REPLY:
+        return None
+    ident, seq = struct.unpack("!HH", data[4:8])
+    return ident, seq
+
+
+class IcmpProber:
+    """In-process ICMP echo over one unprivileged datagram ICMP socket.
+
+    Requires net.ipv4.ping_group_range to include HA's group (true for most
+    HA OS / container setups). Replies are matched by (address, id, sequence);
+    on Linux the kernel rewrites the id to the socket's port.
+
+    One instance is shared by the whole domain, see probe.async_get_icmp_prober.
+    """
+
+    def __init__(self, sock: socket.socket | None = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        if sock is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            sock.bind(("", 0))
+        self._sock = sock
+        self._sock.setblocking(False)
+        self._ident = self._sock.getsockname()[1] & 0xFFFF
+        self._check_ident = sys.platform != "linux"
+        self._seq = 0
+        self._pending: dict[tuple[str, int], tuple[float, asyncio.Future[float]]] = {}
+        self._loop.add_reader(self._sock.fileno(), self._on_readable)
+
+    def close(self) -> None:
+        self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        for _, fut in self._pending.values():
+            if not fut.done():
+                fut.cancel()
+        self._pending.clear()
+
+    async def _resolve(self, host: str) -> str:
+        try:
+            socket.inet_aton(host)
+            return host
+        except OSError:
+            pass
+        infos = await self._loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        return infos[0][4][0]
+
+    async def probe(self, host: str, timeout_s: float = 1.0) -> float | None:
+        """Round-trip time in seconds, or None on timeout/error. Sub-second timeouts are honoured."""
+        try:
+            addr = await self._resolve(host)
+        except OSError:
+            return None
+        self._seq = (self._seq + 1) & 0xFFFF
+        key = (addr, self._seq)
+        fut: asyncio.Future[float] = self._loop.create_future()
+        sent = time.monotonic()
+        self._pending[key] = (sent, fut)
+        try:
+            self._sock.sendto(_icmp_echo_packet(self._ident, self._seq), (addr, 0))
+            return await asyncio.wait_for(fut, timeout_s)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        finally:
+            self._pending.pop(key, None)
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                data, (addr, _) = self._sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            self._on_datagram(data, addr, time.monotonic())
+
+    def _on_datagram(self, data: bytes, addr: str, received: float) -> None:
+        reply = _parse_echo_reply(data)
+        if reply is None:
+            return
+        ident, seq = reply
+        if self._check_ident and ident != self._ident:
+            return
+        hit = self._pending.get((addr, seq))
+        if hit and not hit[1].done():
+            hit[1].set_result(received - hit[0])
+
+
+async def icmp_ping(host: str, timeout_s: float = 1.0, *, prober: IcmpProber | None = None) -> bool:
+    """ICMP ping: in-process echo when a prober is given, system ping otherwise."""
+    if prober is not None:
+        return await prober.probe(host, timeout_s) is not None
+    return await icmp_ping_subprocess(host, timeout_s)
+
+
+async def icmp_ping_subprocess(host: str, timeout_s: float = 1.0) -> bool:
     """ICMP ping via system ping"""
     timeout = max(1, int(round(timeout_s)))
 
@@ -42,8 +170,256 @@ async def tcp_ping(host: str, port: int, timeout_s: float = 1.0) -> bool:
         return False
 
 
-async def ping(host: str, timeout_s: float, method: str = "icmp", port: int = 0) -> bool:
+async def ping(
+    host: str, timeout_s: float, method: str = "icmp", port: int = 0, *, prober: IcmpProber | None = None
+) -> bool:
     method = (method or "icmp").lower().strip()
-    if method == "tcp":
+    if method in ("tcp", "keepalive"):
         return await tcp_ping(host, port, timeout_s)
-    return await icmp_ping(host, timeout_s)
+    return await icmp_ping(host, timeout_s, prober=prober)
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    ok: bool
+    rtt: float | None = None  # seconds
+    timed_out: bool = False
+
+
+async def tcp_probe(host: str, port: int, timeout_s: float = 1.0) -> ProbeResult:
+    """TCP connect check with connect time as RTT."""
+    start = time.monotonic()
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, int(port)),
+            timeout=timeout_s,
+        )
+    except asyncio.TimeoutError:
+        return ProbeResult(False, timed_out=True)
+    except Exception:  # noqa: BLE001
+        return ProbeResult(False)
+    rtt = time.monotonic() - start
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:  # noqa: BLE001
+        pass
+    return ProbeResult(True, rtt)
+
+
+async def icmp_probe(host: str, timeout_s: float = 1.0, *, prober: IcmpProber | None = None) -> ProbeResult:
+    """ICMP echo with RTT (in-process when a prober is given, system ping otherwise)."""
+    if prober is not None:
+        rtt = await prober.probe(host, timeout_s)
+        return ProbeResult(True, rtt) if rtt is not None else ProbeResult(False, timed_out=True)
+    start = time.monotonic()
+    ok = await icmp_ping_subprocess(host, timeout_s)
+    if ok:
+        return ProbeResult(True, time.monotonic() - start)
+    return ProbeResult(False, timed_out=time.monotonic() - start >= timeout_s)
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeTarget:
+    host: str
+    method: str = "icmp"
+    port: int = 0
+
+    def __str__(self) -> str:
+        if self.method == "icmp":
+            return f"{self.host}:icmp"
+        return f"{self.host}:{self.method}:{self.port}"
+
+
+async def probe_target(
+    target: ProbeTarget, timeout_s: float, *, prober: IcmpProber | None = None
+) -> ProbeResult:
+    if target.method in ("tcp", "keepalive"):
+        return await tcp_probe(target.host, target.port, timeout_s)
+    return await icmp_probe(target.host, timeout_s, prober=prober)
+
+
+def parse_targets(spec: str | None, *, default_method: str = "icmp", default_port: int = 80) -> list[ProbeTarget]:
+    """Parse "host[:method[:port]], ..." (e.g. "192.168.1.50:tcp:80, 1.1.1.1:icmp")."""
+    targets: list[ProbeTarget] = []
+    for item in (spec or "").replace(";", ",").split(","):
+        parts = [p.strip() for p in item.strip().split(":")]
+        if not parts or not parts[0]:
+            continue
+        host = parts[0]
+        method = (parts[1] if len(parts) > 1 and parts[1] else default_method).lower()
+        try:
+            port = int(parts[2]) if len(parts) > 2 and parts[2] else int(default_port)
+        except ValueError:
+            port = int(default_port)
+        target = ProbeTarget(host, method, 0 if method == "icmp" else port)
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+async def probe_quorum(
+    targets: list[ProbeTarget],
+    *,
+    quorum: int = 1,
+    timeout_s: float = 1.0,
+    stagger_s: float = 0.05,
+    prober: IcmpProber | None = None,
+) -> tuple[bool, dict[ProbeTarget, bool | None]]:
+    """Probe targets concurrently and decide "up" once quorum targets answered.
+
+    Probes start happy-eyeballs style (staggered by stagger_s) and the race
+    stops as soon as the answer is known: quorum positives -> up, or too few
+    targets left to reach quorum -> down. Unfinished targets report None.
+    """
+    results: dict[ProbeTarget, bool | None] = {t: None for t in targets}
+    if not targets:
+        return False, results
+    quorum = max(1, min(int(quorum), len(targets)))
+
+    async def _one(index: int, target: ProbeTarget) -> tuple[ProbeTarget, bool]:
+        if index and stagger_s:
+            await asyncio.sleep(index * stagger_s)
+        return target, await ping(target.host, timeout_s, target.method, target.port, prober=prober)
+
+    pending = {asyncio.ensure_future(_one(i, t)) for i, t in enumerate(targets)}
+    positives = 0
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    target, ok = task.result()
+                except Exception:  # noqa: BLE001
+                    continue
+                results[target] = ok
+                positives += ok
+            if positives >= quorum:
+                return True, results
+            if positives + len(pending) < quorum:
+                return False, results
+        return False, results
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _tune_keepalive(sock: socket.socket | None, timeout_s: float) -> None:
+    """Aggressive keep-alive so a dead peer is noticed within ~timeout_s."""
+    if sock is None:
+        return
+    idle = max(1, int(timeout_s))
+    opts: list[tuple[int, int, int]] = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle))
+    elif hasattr(socket, "TCP_KEEPALIVE"):  # macOS
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 1))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        opts.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 2))
+    if hasattr(socket, "TCP_USER_TIMEOUT"):
+        # Linux: drop the connection when data/probes stay unacknowledged this long (ms)
+        opts.append((socket.IPPROTO_TCP, socket.TCP_USER_TIMEOUT, int(idle * 2 * 1000)))
+    for level, opt, value in opts:
+        try:
+            sock.setsockopt(level, opt, value)
+        except OSError:
+            pass
+
+
+class TcpKeepAliveMonitor:
+    """Hold one TCP connection to a host and report up/down the moment it changes.
+
+    A graceful close by the peer (many plugs drop idle HTTP connections) is not
+    an outage: the monitor reconnects and only reports down when the reconnect
+    fails. Keep-alive/user-timeout errors report down immediately.
+
+    Reconnects always wait at least reconnect_min_s. The delay doubles up to
+    reconnect_max_s and only resets once a connection stayed up for
+    stable_after_s, so a peer that accepts and drops at once is not hammered.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        on_change: Callable[[bool], None],
+        *,
+        timeout_s: float = 1.0,
+        reconnect_min_s: float = 1.0,
+        reconnect_max_s: float = 30.0,
+        stable_after_s: float = 60.0,
+    ) -> None:
+        self.host = host
+        self.port = int(port)
+        self.timeout_s = timeout_s
+        self.reconnect_min_s = reconnect_min_s
+        self.reconnect_max_s = max(reconnect_min_s, reconnect_max_s)
+        self.stable_after_s = stable_after_s
+        self.state: bool | None = None
+        self.connects = 0
+        self._on_change = on_change
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def _set(self, state: bool) -> None:
+        if state == self.state:
+            return
+        self.state = state
+        try:
+            self._on_change(state)
+        except Exception:  # noqa: BLE001
+            _LOGGER.exception("Keep-alive state callback failed")
+
+    def _backoff(self, delay: float) -> float:
+        return min(self.reconnect_max_s, max(self.reconnect_min_s, delay * 2))
+
+    async def _run(self) -> None:
+        delay = 0.0  # only the very first connect is immediate
+        while True:
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), timeout=self.timeout_s
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:  # noqa: BLE001
+                self._set(False)
+                delay = self._backoff(delay)
+                continue
+
+            self.connects += 1
+            connected_at = time.monotonic()
+            _tune_keepalive(writer.get_extra_info("socket"), self.timeout_s)
+            self._set(True)
+            try:
+                while await reader.read(4096):
+                    pass
+                # EOF: peer closed gracefully -> reconnect, still "on" until that fails
+            except asyncio.CancelledError:
+                raise
+            except OSError:
+                # Keep-alive / user timeout / reset: the link is gone
+                self._set(False)
+            finally:
+                writer.close()
+            if time.monotonic() - connected_at >= self.stable_after_s:
+                delay = self.reconnect_min_s
+            else:
+                delay = self._backoff(delay)
@@ -0,0 +1,258 @@
+"""Domain-level probe engine shared by every config entry's ping coordinator.
+
+Identical (host, method, port) targets are probed once, however many entries
+watch them, and each result is fanned out to every subscriber. Each distinct
+target has its own timer, and timer phases are spread evenly over the
+interval so probes do not burst. keepalive targets get one shared
+TcpKeepAliveMonitor instead of a timer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    DATA_ICMP_PROBER,
+    DATA_PROBE_ENGINE,
+    DOMAIN,
+    KEEPALIVE_RECONNECT_MAX,
+    KEEPALIVE_RECONNECT_MIN,
+    KEEPALIVE_STABLE_AFTER,
+    PING_METHOD_KEEPALIVE,
+)
+from .ping import IcmpProber, ProbeTarget, TcpKeepAliveMonitor, probe_target
+from .stats import ProbeStats
+
+_LOGGER = logging.getLogger(__name__)
+
+ProbeCallback = Callable[[ProbeTarget, bool], None]
+
+
+@dataclass
+class _Sub:
+    callback: ProbeCallback
+    interval: float
+    timeout_s: float
+
+
+@dataclass
+class _TargetState:
+    target: ProbeTarget
+    subs: dict[int, _Sub] = field(default_factory=dict)
+    phase: float = 0.0
+    period: float = 0.0  # interval the current timer was armed with
+    handle: asyncio.TimerHandle | None = None
+    task: asyncio.Task[None] | None = None
+    monitor: TcpKeepAliveMonitor | None = None
+    last: bool | None = None
+    stats: ProbeStats = field(default_factory=ProbeStats)
+
+    @property
+    def interval(self) -> float:
+        return min(s.interval for s in self.subs.values())
+
+    @property
+    def timeout_s(self) -> float:
+        return min(s.timeout_s for s in self.subs.values())
+
+
+class ProbeEngine:
+    """Deduplicating, phase-spread probe scheduler."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._loop = hass.loop
+        self._anchor = self._loop.time()
+        self._states: dict[ProbeTarget, _TargetState] = {}
+        self._next_token = 0
+        self.probes_sent = 0
+
+    @callback
+    def async_subscribe(
+        self,
+        target: ProbeTarget,
+        probe_callback: ProbeCallback,
+        *,
+        interval: float,
+        timeout_s: float,
+    ) -> CALLBACK_TYPE:
+        """Receive results for target; returns an unsubscribe callback."""
+        token = self._next_token
+        self._next_token += 1
+        state = self._states.get(target)
+        new = state is None
+        if state is None:
+            state = self._states[target] = _TargetState(target)
+        state.subs[token] = _Sub(probe_callback, float(interval), float(timeout_s))
+
+        if target.method == PING_METHOD_KEEPALIVE:
+            if state.monitor is None:
+                state.monitor = TcpKeepAliveMonitor(
+                    target.host,
+                    target.port,
+                    lambda ok, s=state: self._async_on_monitor(s, ok),
+                    timeout_s=state.timeout_s,
+                    reconnect_min_s=KEEPALIVE_RECONNECT_MIN,
+                    reconnect_max_s=KEEPALIVE_RECONNECT_MAX,
+                    stable_after_s=KEEPALIVE_STABLE_AFTER,
+                )
+                state.monitor.start()
+            elif state.last is not None:
+                probe_callback(target, state.last)
+        else:
+            if not new and state.last is not None:
+                probe_callback(target, state.last)
+            self._async_rephase()
+
+        @callback
+        def _unsubscribe() -> None:
+            self._async_unsubscribe(target, token)
+
+        return _unsubscribe
+
+    @callback
+    def _async_unsubscribe(self, target: ProbeTarget, token: int) -> None:
+        state = self._states.get(target)
+        if state is None:
+            return
+        state.subs.pop(token, None)
+        if state.subs:
+            return
+        del self._states[target]
+        if state.handle is not None:
+            state.handle.cancel()
+        if state.task is not None:
+            state.task.cancel()
+        if state.monitor is not None:
+            self.hass.async_create_background_task(
+                state.monitor.stop(), f"{DOMAIN}_keepalive_stop_{target}"
+            )
+        self._async_rephase()
+
+    @callback
+    def _async_rephase(self) -> None:
+        """Spread polled targets evenly: target i of n fires at i/n of its interval.
+
+        Only targets whose phase or interval changed are re-armed; a new
+        subscriber to an already probed target leaves every timer alone.
+        """
+        polled = sorted(
+            (s for s in self._states.values() if s.monitor is None), key=lambda s: str(s.target)
+        )
+        n = len(polled)
+        for i, state in enumerate(polled):
+            phase = state.interval * i / n
+            if state.handle is not None and phase == state.phase and state.period == state.interval:
+                continue
+            state.phase = phase
+            self._async_schedule(state)
+
+    @callback
+    def _async_schedule(self, state: _TargetState) -> None:
+        if state.handle is not None:
+            state.handle.cancel()
+        interval = state.period = state.interval
+        now = self._loop.time()
+        k = math.floor((now - self._anchor - state.phase) / interval) + 1
+        when = self._anchor + state.phase + k * interval
+        state.handle = self._loop.call_at(when, self._async_fire, state)
+
+    @callback
+    def _async_fire(self, state: _TargetState) -> None:
+        state.handle = None
+        if state.target not in self._states:
+            return
+        if state.task is None or state.task.done():
+            state.task = self.hass.async_create_background_task(
+                self._async_probe(state), f"{DOMAIN}_probe_{state.target}"
+            )
+        self._async_schedule(state)
+
+    async def _async_probe(self, state: _TargetState) -> None:
+        target = state.target
+        self.probes_sent += 1
+        try:
+            result = await probe_target(target, state.timeout_s, prober=async_get_icmp_prober(self.hass))
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Probe %s failed: %s", target, err)
+            state.stats.record(False)
+            self._async_publish(state, False)
+            return
+        state.stats.record(result.ok, result.rtt, timed_out=result.timed_out)
+        self._async_publish(state, result.ok)
+
+    @callback
+    def _async_on_monitor(self, state: _TargetState, ok: bool) -> None:
+        # Keep-alive has no RTT; record each transition (a drop counts as a timeout)
+        state.stats.record(ok, timed_out=not ok)
+        self._async_publish(state, ok)
+
+    @callback
+    def _async_publish(self, state: _TargetState, ok: bool) -> None:
+        state.last = ok
+        for sub in list(state.subs.values()):
+            try:
+                sub.callback(state.target, ok)
+            except Exception:  # noqa: BLE001
+                _LOGGER.exception("Probe subscriber for %s failed", state.target)
+
+    def targets(self) -> list[ProbeTarget]:
+        return list(self._states)
+
+    def stats(self, target: ProbeTarget) -> ProbeStats | None:
+        state = self._states.get(target)
+        return state.stats if state else None
+
+    def as_diagnostics(self) -> dict[str, Any]:
+        return {
+            "probes_sent": self.probes_sent,
+            "targets": {
+                str(t): {
+                    "subscribers": len(s.subs),
+                    "interval": s.interval,
+                    "timeout": s.timeout_s,
+                    "keepalive": s.monitor is not None,
+                    "keepalive_connects": s.monitor.connects if s.monitor else None,
+                    "last_ok": s.last,
+                    **s.stats.as_dict(),
+                }
+                for t, s in self._states.items()
+            },
+        }
+
+
+@callback
+def async_get_probe_engine(hass: HomeAssistant) -> ProbeEngine:
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    engine = domain_data.get(DATA_PROBE_ENGINE)
+    if engine is None:
+        engine = domain_data[DATA_PROBE_ENGINE] = ProbeEngine(hass)
+    return engine
+
+
+@callback
+def async_get_icmp_prober(hass: HomeAssistant) -> IcmpProber | None:
+    """Domain-wide ICMP prober, or None when datagram ICMP sockets are not permitted."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_ICMP_PROBER not in domain_data:
+        try:
+            domain_data[DATA_ICMP_PROBER] = IcmpProber()
+        except OSError as err:
+            domain_data[DATA_ICMP_PROBER] = None
+            _LOGGER.info("Unprivileged ICMP socket not available (%s); using system ping", err)
+    return domain_data[DATA_ICMP_PROBER]
+
+
+@callback
+def async_close_icmp_prober(hass: HomeAssistant) -> None:
+    """Close the shared ICMP socket (last entry unloaded); the next probe reopens it."""
+    prober = hass.data.get(DOMAIN, {}).pop(DATA_ICMP_PROBER, None)
+    if prober is not None:
+        prober.close()
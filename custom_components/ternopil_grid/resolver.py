@@ -0,0 +1,162 @@
+"""Persistent street_id -> building group (chergGpv) resolver.
+
+Resolving a group costs one upstream round trip per street and fails while
+the upstream is down. Resolved groups are cached in a Store, so setup and
+reconfiguration become a local lookup. An optional bulk prefetch walks the
+street catalog with bounded concurrency to build the whole city mapping.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import fetch_building_group
+from .const import (
+    DATA_GROUP_RESOLVER,
+    DEFAULT_PREFETCH_CONCURRENCY,
+    DOMAIN,
+    GROUP_RESOLVER_TTL,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BuildingGroupResolver:
+    """Cached street -> group mapping for one city."""
+
+    def __init__(self, hass: HomeAssistant, city_id: int) -> None:
+        self.hass = hass
+        self.city_id = city_id
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.groups_{city_id}"
+        )
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        # street_id -> (group, resolved_at)
+        self._groups: dict[int, tuple[str, float]] = {}
+        self._prefetch_task: asyncio.Task[int] | None = None
+        self._refreshing: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def get(self, street_id: int) -> str | None:
+        hit = self._groups.get(int(street_id))
+        return hit[0] if hit else None
+
+    async def async_load(self) -> None:
+        async with self._load_lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            stored = await self._store.async_load()
+            groups = stored.get("groups") if isinstance(stored, dict) else None
+            if not isinstance(groups, dict):
+                return
+            for sid, value in groups.items():
+                try:
+                    group, ts = value
+                    self._groups[int(sid)] = (str(group), float(ts))
+                except (TypeError, ValueError):
+                    continue
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"groups": {str(sid): [g, ts] for sid, (g, ts) in self._groups.items()}}
+
+    async def _async_fetch(self, street_id: int) -> str:
+        group = await fetch_building_group(self.hass, self.city_id, street_id)
+        self._groups[street_id] = (group, time.time())
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+        return group
+
+    async def async_resolve(self, street_id: int) -> str:
+        """Return the group for a street, from cache when possible.
+
+        Stale cache entries are returned immediately and refreshed in the
+        background. Raises only when the street was never resolved and the
+        upstream lookup fails.
+        """
+        await self.async_load()
+        street_id = int(street_id)
+        hit = self._groups.get(street_id)
+        if hit is None:
+            return await self._async_fetch(street_id)
+        group, resolved_at = hit
+        if time.time() - resolved_at > GROUP_RESOLVER_TTL and street_id not in self._refreshing:
+            self._refreshing.add(street_id)
+            self.hass.async_create_background_task(
+                self._async_fetch_safe(street_id), f"{DOMAIN}_group_{street_id}"
+            )
+        return group
+
+    async def _async_fetch_safe(self, street_id: int) -> None:
+        try:
+            await self._async_fetch(street_id)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Group refresh for street %s failed: %s", street_id, err)
+        finally:
+            self._refreshing.discard(street_id)
+
+    async def async_prefetch(
+        self,
+        street_ids: Iterable[int],
+        *,
+        concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
+    ) -> int:
+        """Resolve every not-yet-known street with bounded concurrency.
+
+        Returns the number of streets resolved. Failures are skipped.
+        """
+        await self.async_load()
+        todo = [int(sid) for sid in street_ids if int(sid) not in self._groups]
+        sem = asyncio.Semaphore(max(1, int(concurrency)))
+        resolved = 0
+
+        async def _one(street_id: int) -> None:
+            nonlocal resolved
+            async with sem:
+                try:
+                    await self._async_fetch(street_id)
+                    resolved += 1
+                except Exception as err:  # noqa: BLE001
+                    _LOGGER.debug("Prefetch of street %s failed: %s", street_id, err)
+
+        await asyncio.gather(*(_one(sid) for sid in todo))
+        await self._store.async_save(self._data_to_save())
+        _LOGGER.info(
+            "Building group prefetch for city %s: %d/%d streets resolved",
+            self.city_id,
+            resolved,
+            len(todo),
+        )
+        return resolved
+
+    @callback
+    def async_start_prefetch(
+        self, street_ids: Iterable[int], *, concurrency: int = DEFAULT_PREFETCH_CONCURRENCY
+    ) -> None:
+        """Run async_prefetch as a background job (at most one at a time)."""
+        if self._prefetch_task and not self._prefetch_task.done():
+            return
+        self._prefetch_task = self.hass.async_create_background_task(
+            self.async_prefetch(list(street_ids), concurrency=concurrency),
+            f"{DOMAIN}_group_prefetch_{self.city_id}",
+        )
+
+
+@callback
+def async_get_group_resolver(hass: HomeAssistant, city_id: int) -> BuildingGroupResolver:
+    resolvers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_GROUP_RESOLVER, {})
+    resolver = resolvers.get(city_id)
+    if resolver is None:
+        resolver = resolvers[city_id] = BuildingGroupResolver(hass, city_id)
+    return resolver
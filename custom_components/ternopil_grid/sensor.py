@@ -13,24 +13,39 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any, Final
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_LOOKAHEAD_HOURS,
+    CONF_MIN_OUTAGE_MINUTES,
+    DEFAULT_COUNTDOWN_INTERVAL,
+    DEFAULT_LOOKAHEAD_HOURS,
+    DEFAULT_MIN_OUTAGE_MINUTES,
+    DOMAIN,
+    HISTORY_ACCURACY_DAYS,
+    PING_STATS_INTERVAL,
+)
+from .slots import SlotIndex
+from .timeline import EMPTY_TIMELINE, SegmentTimeline
+from .view import ScheduleView, build_view
 
 
 # --- helpers ---
 
 
-def _now(hass: HomeAssistant) -> datetime:
-    """Return current time in HA's configured timezone."""
-    return dt_util.now()
-
-
 def _coordinator(hass: HomeAssistant, entry: ConfigEntry):
     """Return the schedule DataUpdateCoordinator for this config entry."""
     entry_bucket = hass.data[DOMAIN][entry.entry_id]
@@ -41,77 +56,28 @@ def _coordinator(hass: HomeAssistant, entry: ConfigEntry):
     return entry_bucket
 
 
-def _segments(coord_data: Any) -> list[dict[str, Any]]:
-    """Coordinator returns list[dict] segments."""
-    if not coord_data:
-        return []
-    if isinstance(coord_data, list):
+def _segments(coord_data: Any) -> SegmentTimeline:
+    """Coordinator returns a SegmentTimeline."""
+    if isinstance(coord_data, SegmentTimeline):
         return coord_data
-    # defensive: some older versions might wrap in dict
-    if isinstance(coord_data, dict) and "segments" in coord_data:
-        return coord_data["segments"] or []
-    return []
-
-
-def _segment_at(segments: list[dict[str, Any]], ts_utc: float) -> dict[str, Any] | None:
-    """Find segment that contains ts_utc."""
-    for s in segments:
-        try:
-            start = float(s.get("start_ts"))
-            end = float(s.get("end_ts"))
-        except (TypeError, ValueError):
-            continue
-        if start <= ts_utc < end:
-            return s
-    return None
-
-
-def _next_change_after(
-    segments: list[dict[str, Any]], ts_utc: float
-) -> tuple[datetime | None, str | None]:
-    """Return (datetime_of_next_change_utc, next_color)."""
-    current = _segment_at(segments, ts_utc)
-    current_color = current.get("color") if current else None
-
-    # iterate in order
-    for s in segments:
-        try:
-            start = float(s.get("start_ts"))
-        except (TypeError, ValueError):
-            continue
-        if start <= ts_utc:
-            continue
-        color = s.get("color")
-        if color != current_color:
-            return dt_util.utc_from_timestamp(start), color
-
-    return None, None
-
-
-def _minutes_off_on_date(hass: HomeAssistant, segments: list[dict[str, Any]], target_date: datetime.date) -> int:
-    """Sum minutes where color == 'red' for the given local date."""
-    tz = dt_util.DEFAULT_TIME_ZONE
-    # local day's UTC bounds
-    start_local = datetime.combine(target_date, datetime.min.time(), tzinfo=tz)
-    end_local = start_local + timedelta(days=1)
-    start_utc = dt_util.as_utc(start_local)
-    end_utc = dt_util.as_utc(end_local)
-
-    total = 0.0
-    for s in segments:
-        if s.get("color") != "red":
-            continue
-        try:
-            s0 = dt_util.utc_from_timestamp(float(s.get("start_ts")))
-            s1 = dt_util.utc_from_timestamp(float(s.get("end_ts")))
-        except (TypeError, ValueError):
-            continue
-        a = max(s0, start_utc)
-        b = min(s1, end_utc)
-        if b > a:
-            total += (b - a).total_seconds() / 60.0
-
-    return int(round(total))
+    # defensive: older versions returned list[dict] segments
+    if isinstance(coord_data, list):
+        return SegmentTimeline.from_segments(coord_data)
+    return EMPTY_TIMELINE
+
+
+def _view(coordinator, ts_utc: float) -> ScheduleView:
+    """Shared per-update view from the coordinator (built locally for foreign coordinators)."""
+    if hasattr(coordinator, "current_view"):
+        return coordinator.current_view(ts_utc)
+    return build_view(_segments(coordinator.data), ts_utc)
+
+
+def _slots(coordinator) -> SlotIndex:
+    """Slot model from the coordinator (built locally for foreign coordinators)."""
+    if hasattr(coordinator, "slot_index"):
+        return coordinator.slot_index()
+    return SlotIndex(_segments(coordinator.data))
 
 
 # --- entities ---
@@ -131,6 +97,73 @@ DESCRIPTIONS: Final[list[TGDescription]] = [
 ]
 
 
+# Window aggregates from the slot model (see slots.SlotIndex)
+SLOT_DESCRIPTIONS: Final[list[TGDescription]] = [
+    TGDescription(
+        key="off_next_hours",
+        name="Off next hours",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+    TGDescription(
+        key="longest_on_today",
+        name="Longest on today",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+    TGDescription(
+        key="next_long_outage",
+        name="Next long outage",
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+]
+
+
+# Probe health of the primary ping target (see stats.ProbeStats)
+PING_DESCRIPTIONS: Final[list[TGDescription]] = [
+    TGDescription(
+        key="ping_rtt_p50",
+        name="Ping RTT p50",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+    TGDescription(
+        key="ping_rtt_p95",
+        name="Ping RTT p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+    TGDescription(
+        key="ping_loss",
+        name="Ping loss",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=1,
+    ),
+]
+
+
+# Actual outages from the ping path vs the schedule (see history.OutageHistory)
+HISTORY_DESCRIPTIONS: Final[list[TGDescription]] = [
+    TGDescription(
+        key="actual_off_today",
+        name="Actual off today",
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    TGDescription(
+        key="schedule_accuracy",
+        name="Schedule accuracy",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+]
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -141,6 +174,17 @@ async def async_setup_entry(
     entities: list[SensorEntity] = [
         TernopilGridSensor(hass, entry, coord, desc) for desc in DESCRIPTIONS
     ]
+    entities.extend(TernopilSlotSensor(hass, entry, coord, desc) for desc in SLOT_DESCRIPTIONS)
+
+    entry_bucket = hass.data[DOMAIN][entry.entry_id]
+    ping = entry_bucket.get("ping") if isinstance(entry_bucket, dict) else None
+    if ping is not None:
+        entities.extend(TernopilPingStatsSensor(entry, ping, desc) for desc in PING_DESCRIPTIONS)
+        history = entry_bucket.get("history")
+        if history is not None:
+            entities.extend(
+                TernopilOutageHistorySensor(entry, ping, history, desc) for desc in HISTORY_DESCRIPTIONS
+            )
 
     async_add_entities(entities)
 
@@ -161,73 +205,198 @@ class TernopilGridSensor(CoordinatorEntity, SensorEntity):
         self.hass = hass
         self.entity_description = description
         self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._countdown_interval = int(
+            entry.options.get(CONF_COUNTDOWN_INTERVAL, DEFAULT_COUNTDOWN_INTERVAL)
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # Boundaries are pushed by the coordinator; only countdown ticks in between
+        if self.entity_description.key == "countdown" and self._countdown_interval > 0:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_countdown_tick,
+                    timedelta(seconds=self._countdown_interval),
+                )
+            )
+
+    @callback
+    def _async_countdown_tick(self, _now: datetime) -> None:
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> Any:
-        segs = _segments(self.coordinator.data)
-        now_local = _now(self.hass)
-        now_utc = dt_util.as_utc(now_local)
-        ts_utc = now_utc.timestamp()
+        now_ts = dt_util.utcnow().timestamp()
+        view = _view(self.coordinator, now_ts)
 
         key = self.entity_description.key
 
         if key == "countdown":
-            next_dt_utc, _ = _next_change_after(segs, ts_utc)
-            if not next_dt_utc:
+            if view.next_change_ts is None:
                 return None
-            delta = next_dt_utc - now_utc
-            if delta.total_seconds() < 0:
-                return 0
             # seconds
-            return int(delta.total_seconds())
+            return max(0, int(view.next_change_ts - now_ts))
 
         if key == "next_change":
-            next_dt_utc, _ = _next_change_after(segs, ts_utc)
-            if not next_dt_utc:
-                return None
-            # show in local tz
-            return dt_util.as_local(next_dt_utc)
+            # shown in local tz
+            return view.next_change
 
         if key == "off_today":
-            return _minutes_off_on_date(self.hass, segs, now_local.date())
+            return view.off_today
 
         if key == "off_tomorrow":
-            return _minutes_off_on_date(self.hass, segs, (now_local + timedelta(days=1)).date())
+            return view.off_tomorrow
 
         if key == "schedule_rolling_24h":
-            # compact string of next 48 half-hours: R/Y/G
-            window_end = now_utc + timedelta(hours=24)
-            chars: list[str] = []
-            # create lookup by start_ts for deterministic order
-            for s in segs:
-                try:
-                    s0 = dt_util.utc_from_timestamp(float(s.get("start_ts")))
-                except (TypeError, ValueError):
-                    continue
-                if not (now_utc <= s0 < window_end):
-                    continue
-                c = s.get("color")
-                chars.append({"red": "R", "yellow": "Y", "green": "G"}.get(c, "?"))
-            return "".join(chars) if chars else None
+            return view.rolling_24h
 
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        segs = _segments(self.coordinator.data)
-        now_local = _now(self.hass)
-        now_utc = dt_util.as_utc(now_local)
-        current = _segment_at(segs, now_utc.timestamp())
-
-        next_dt_utc, next_color = _next_change_after(segs, now_utc.timestamp())
+        view = _view(self.coordinator, dt_util.utcnow().timestamp())
 
         attrs: dict[str, Any] = {
-            "current_color": current.get("color") if current else None,
-            "current_start": dt_util.as_local(dt_util.utc_from_timestamp(current["start_ts"])) if current and current.get("start_ts") else None,
-            "current_end": dt_util.as_local(dt_util.utc_from_timestamp(current["end_ts"])) if current and current.get("end_ts") else None,
-            "next_change": dt_util.as_local(next_dt_utc) if next_dt_utc else None,
-            "next_color": next_color,
+            "current_color": view.current.color if view.current else None,
+            "current_start": view.current_start,
+            "current_end": view.current_end,
+            "next_change": view.next_change,
+            "next_color": view.next_color,
         }
 
         # keep attributes small
         return attrs
+
+
+class TernopilSlotSensor(TernopilGridSensor):
+    """Window aggregates (next N hours, longest on today, next long outage) in O(1)."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator,
+        description: TGDescription,
+    ) -> None:
+        super().__init__(hass, entry, coordinator, description)
+        self._hours = int(entry.options.get(CONF_LOOKAHEAD_HOURS, DEFAULT_LOOKAHEAD_HOURS))
+        self._min_minutes = int(entry.options.get(CONF_MIN_OUTAGE_MINUTES, DEFAULT_MIN_OUTAGE_MINUTES))
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # The lookahead window slides with the clock: tick like the countdown
+        if self.entity_description.key == "off_next_hours" and self._countdown_interval > 0:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_countdown_tick,
+                    timedelta(seconds=self._countdown_interval),
+                )
+            )
+
+    @property
+    def native_value(self) -> Any:
+        slots = _slots(self.coordinator)
+        key = self.entity_description.key
+        now_ts = dt_util.utcnow().timestamp()
+
+        if key == "off_next_hours":
+            if not slots.timeline:
+                return None
+            return slots.minutes_off(now_ts, now_ts + self._hours * 3600)
+
+        if key == "longest_on_today":
+            return slots.longest_on(dt_util.now().date())
+
+        if key == "next_long_outage":
+            outage = slots.next_outage(now_ts, self._min_minutes)
+            return dt_util.utc_from_timestamp(outage[0]) if outage else None
+
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        key = self.entity_description.key
+        if key == "off_next_hours":
+            return {"hours": self._hours}
+        if key == "next_long_outage":
+            outage = _slots(self.coordinator).next_outage(
+                dt_util.utcnow().timestamp(), self._min_minutes
+            )
+            return {
+                "min_minutes": self._min_minutes,
+                "end": dt_util.as_local(dt_util.utc_from_timestamp(outage[1])) if outage else None,
+            }
+        return {}
+
+
+class _PeriodicSensor(CoordinatorEntity, SensorEntity):
+    """Sensor whose value changes on every probe; state is written on a coarse tick."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, entry: ConfigEntry, coordinator, description: TGDescription) -> None:
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_tick, timedelta(seconds=PING_STATS_INTERVAL)
+            )
+        )
+
+    @callback
+    def _async_tick(self, _now: datetime) -> None:
+        self.async_write_ha_state()
+
+
+class TernopilPingStatsSensor(_PeriodicSensor):
+    """RTT / loss of the primary ping target, refreshed on a coarse tick."""
+
+    @property
+    def native_value(self) -> float | None:
+        stats = self.coordinator.primary_stats()
+        if stats is None:
+            return None
+        key = self.entity_description.key
+        if key == "ping_loss":
+            loss = stats.loss_rate
+            return round(loss * 100, 1) if loss is not None else None
+        pct = 50 if key == "ping_rtt_p50" else 95
+        rtt = stats.rtt_percentile(pct)
+        return round(rtt * 1000, 2) if rtt is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self.coordinator.primary_stats()
+        if stats is None or self.entity_description.key != "ping_loss":
+            return {}
+        return {
+            "window": stats.window,
+            "window_timeouts": stats.window_timeouts,
+            "timeouts": stats.timeouts,
+        }
+
+
+class TernopilOutageHistorySensor(_PeriodicSensor):
+    """Actual minutes off today / planned-vs-actual accuracy from the outage history."""
+
+    def __init__(self, entry: ConfigEntry, coordinator, history, description: TGDescription) -> None:
+        super().__init__(entry, coordinator, description)
+        self._history = history
+
+    @property
+    def native_value(self) -> float | int | None:
+        if self.entity_description.key == "actual_off_today":
+            return self._history.actual_minutes_off_today()
+        return self._history.summary().get(f"accuracy_{HISTORY_ACCURACY_DAYS}d")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        if self.entity_description.key != "schedule_accuracy":
+            return {}
+        return self._history.summary()
@@ -0,0 +1,123 @@
+"""Services for the Ternopil Grid integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CITY_ID,
+    ATTR_CONCURRENCY,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END,
+    ATTR_GROUP,
+    ATTR_START,
+    DEFAULT_PREFETCH_CONCURRENCY,
+    DEFAULT_TERNOPIL_CITY_ID,
+    DOMAIN,
+    SERVICE_GET_SCHEDULE,
+    SERVICE_PREFETCH_GROUPS,
+)
+from .hub import async_get_schedule_hub
+from .resolver import async_get_group_resolver
+from .streets import async_get_street_catalog
+
+PREFETCH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_PREFETCH_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=16)
+        ),
+    }
+)
+
+GET_SCHEDULE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Optional(ATTR_GROUP): cv.string,
+            vol.Optional(ATTR_CITY_ID): vol.Coerce(int),
+            vol.Optional(ATTR_START): cv.datetime,
+            vol.Optional(ATTR_END): cv.datetime,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_CONFIG_ENTRY_ID, ATTR_GROUP),
+)
+
+
+def _schedule_coordinator(hass: HomeAssistant, data: dict[str, Any]):
+    """Schedule coordinator for a config entry id or an outage group."""
+    if entry_id := data.get(ATTR_CONFIG_ENTRY_ID):
+        bucket = hass.data.get(DOMAIN, {}).get(entry_id)
+        if not isinstance(bucket, dict) or bucket.get("schedule") is None:
+            raise ServiceValidationError(f"Unknown or not loaded config entry: {entry_id}")
+        return bucket["schedule"]
+    group = str(data[ATTR_GROUP])
+    city_id = data.get(ATTR_CITY_ID)
+    # Without city_id the group must be unambiguous among the configured cities
+    matches = [
+        coordinator
+        for (city, grp), coordinator in async_get_schedule_hub(hass).coordinators().items()
+        if grp == group and (city_id is None or city == city_id)
+    ]
+    if not matches:
+        raise ServiceValidationError(f"No configured address in group {group}")
+    if len(matches) > 1:
+        raise ServiceValidationError(f"Group {group} is configured in several cities; pass {ATTR_CITY_ID}")
+    return matches[0]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration-wide services (once per HA instance)."""
+
+    async def _prefetch_groups(call: ServiceCall) -> None:
+        catalog = async_get_street_catalog(hass, DEFAULT_TERNOPIL_CITY_ID)
+        await catalog.async_load()
+        if not len(catalog):
+            await catalog.async_refresh()
+        resolver = async_get_group_resolver(hass, DEFAULT_TERNOPIL_CITY_ID)
+        resolver.async_start_prefetch(
+            (s["id"] for s in catalog.streets()),
+            concurrency=call.data[ATTR_CONCURRENCY],
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_PREFETCH_GROUPS):
+        hass.services.async_register(
+            DOMAIN, SERVICE_PREFETCH_GROUPS, _prefetch_groups, schema=PREFETCH_SCHEMA
+        )
+
+    async def _get_schedule(call: ServiceCall) -> ServiceResponse:
+        # Served from the in-memory timeline only; never calls upstream
+        coordinator = _schedule_coordinator(hass, call.data)
+        timeline = coordinator.data
+        start = call.data.get(ATTR_START)
+        end = call.data.get(ATTR_END)
+        start_ts = dt_util.as_utc(start).timestamp() if start else dt_util.utcnow().timestamp()
+        end_ts = dt_util.as_utc(end).timestamp() if end else float("inf")
+        segments = timeline.overlapping(start_ts, end_ts) if timeline else []
+        return {
+            "city_id": coordinator.city_id,
+            "group": coordinator.group,
+            "segments": [
+                {
+                    "start": dt_util.as_local(dt_util.utc_from_timestamp(s.start_ts)).isoformat(),
+                    "end": dt_util.as_local(dt_util.utc_from_timestamp(s.end_ts)).isoformat(),
+                    "color": s.color,
+                }
+                for s in segments
+            ],
+        }
+
+    if not hass.services.has_service(DOMAIN, SERVICE_GET_SCHEDULE):
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_SCHEDULE,
+            _get_schedule,
+            schema=GET_SCHEDULE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
@@ -0,0 +1,132 @@
+"""Half-hour slot model of a schedule with prefix sums.
+
+Built once per new timeline. Every half-hour slot (48 per regular local
+day) gets a color code, and a cumulative red-slot count makes "minutes off
+in any window" O(1). Longest green run per local day and the red runs are
+precomputed too, so the window aggregate sensors cost O(1) / O(log n) per read.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+import math
+
+from .timeline import GREEN, RED, SegmentTimeline
+from .view import local_datetime, local_day_bounds
+
+SLOT = 1800  # seconds
+UNKNOWN = -1
+
+
+class SlotIndex:
+    """Slot codes, red prefix sums, red runs and per-day longest green run."""
+
+    __slots__ = ("timeline", "origin", "codes", "_cum_red", "_run_starts", "_run_ends", "_longest_on", "_next_long")
+
+    def __init__(self, timeline: SegmentTimeline) -> None:
+        self.timeline = timeline
+        if not timeline:
+            self.origin = 0.0
+            n = 0
+        else:
+            self.origin = math.floor(timeline.starts[0] / SLOT) * SLOT
+            n = math.ceil((timeline.ends[-1] - self.origin) / SLOT)
+
+        # Slot color = color at the slot's midpoint (segments are normally slot-aligned)
+        codes = array("b", [UNKNOWN]) * n
+        half = SLOT / 2
+        for start, end, code in zip(timeline.starts, timeline.ends, timeline.codes):
+            first = max(0, math.ceil((start - self.origin - half) / SLOT))
+            last = min(n, math.ceil((end - self.origin - half) / SLOT))
+            for i in range(first, last):
+                codes[i] = code
+        self.codes = codes
+
+        cum = array("i", bytes(4 * (n + 1)))
+        run_starts: list[float] = []
+        run_ends: list[float] = []
+        for i, code in enumerate(codes):
+            red = code == RED
+            cum[i + 1] = cum[i] + red
+            if red:
+                ts = self.origin + i * SLOT
+                if run_ends and run_ends[-1] == ts:
+                    run_ends[-1] = ts + SLOT
+                else:
+                    run_starts.append(ts)
+                    run_ends.append(ts + SLOT)
+        self._cum_red = cum
+        self._run_starts = run_starts
+        self._run_ends = run_ends
+        self._longest_on = self._longest_green_by_day()
+        # min_slots -> next_long[j]: first red run >= j lasting at least min_slots
+        self._next_long: dict[int, array] = {}
+
+    def _longest_green_by_day(self) -> dict[date, int]:
+        out: dict[date, int] = {}
+        n = len(self.codes)
+        if not n:
+            return out
+        day = local_datetime(self.origin).date()
+        while True:
+            start, end = local_day_bounds(day)
+            if start >= self.origin + n * SLOT:
+                break
+            i = max(0, math.ceil((start - self.origin) / SLOT))
+            j = min(n, math.ceil((end - self.origin) / SLOT))
+            best = run = 0
+            for k in range(i, j):
+                run = run + 1 if self.codes[k] == GREEN else 0
+                best = max(best, run)
+            out[day] = best * SLOT // 60
+            day = local_datetime(end).date()
+        return out
+
+    def _red_before(self, ts: float) -> float:
+        """Red seconds in [origin, ts)."""
+        offset = ts - self.origin
+        n = len(self.codes)
+        if offset <= 0 or not n:
+            return 0.0
+        k = int(offset // SLOT)
+        if k >= n:
+            return float(self._cum_red[n] * SLOT)
+        partial = offset - k * SLOT if self.codes[k] == RED else 0.0
+        return self._cum_red[k] * SLOT + partial
+
+    def minutes_off(self, start_ts: float, end_ts: float) -> int:
+        """Planned outage minutes in [start_ts, end_ts)."""
+        if end_ts <= start_ts:
+            return 0
+        return int(round((self._red_before(end_ts) - self._red_before(start_ts)) / 60.0))
+
+    def longest_on(self, target_date: date) -> int | None:
+        """Longest continuous green run (minutes) within a local day; None if not published."""
+        return self._longest_on.get(target_date)
+
+    def next_outage(self, ts: float, min_minutes: int = 0) -> tuple[float, float] | None:
+        """(start, end) of the first outage starting after ts that lasts at least min_minutes."""
+        j = bisect_right(self._run_starts, ts)
+        min_slots = math.ceil(min_minutes * 60 / SLOT)
+        if min_slots <= 1:
+            k = j
+        else:
+            nxt = self._next_long.get(min_slots)
+            if nxt is None:
+                nxt = self._next_long[min_slots] = self._build_next_long(min_slots)
+            k = nxt[j] if j < len(nxt) else len(self._run_starts)
+        if k >= len(self._run_starts):
+            return None
+        return self._run_starts[k], self._run_ends[k]
+
+    def _build_next_long(self, min_slots: int) -> array:
+        runs = len(self._run_starts)
+        nxt = array("i", bytes(4 * (runs + 1)))
+        nxt[runs] = runs
+        for i in range(runs - 1, -1, -1):
+            long_enough = self._run_ends[i] - self._run_starts[i] >= min_slots * SLOT
+            nxt[i] = i if long_enough else nxt[i + 1]
+        return nxt
+
@@ -0,0 +1,94 @@
+"""Fixed-size probe health statistics (RTT, loss, timeouts) per target."""
+
+from __future__ import annotations
+
+from array import array
+import math
+from typing import Any
+
+from .const import PROBE_STATS_WINDOW
+
+_NAN = float("nan")
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ProbeStats:
+    """Ring buffer of the last `size` probes plus lifetime counters.
+
+    Loss comes from a per-slot lost flag; the RTT slots (NaN = no RTT) only
+    feed the percentiles, so a success without an RTT (keep-alive) is not lost.
+    """
+
+    __slots__ = ("size", "_rtts", "_lost", "_timeouts", "_pos", "_count", "probes", "losses", "timeouts", "last_ok", "_sorted")
+
+    def __init__(self, size: int = PROBE_STATS_WINDOW) -> None:
+        self.size = size
+        self._rtts = array("d", [_NAN]) * size
+        self._lost = bytearray(size)
+        self._timeouts = bytearray(size)
+        self._pos = 0
+        self._count = 0
+        self.probes = 0
+        self.losses = 0
+        self.timeouts = 0
+        self.last_ok: bool | None = None
+        self._sorted: list[float] | None = None
+
+    def record(self, ok: bool, rtt: float | None = None, *, timed_out: bool = False) -> None:
+        self._rtts[self._pos] = float(rtt) if ok and rtt is not None else _NAN
+        self._lost[self._pos] = 0 if ok else 1
+        self._timeouts[self._pos] = 1 if (not ok and timed_out) else 0
+        self._pos = (self._pos + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+        self.probes += 1
+        self.last_ok = ok
+        if not ok:
+            self.losses += 1
+            if timed_out:
+                self.timeouts += 1
+        self._sorted = None
+
+    def _window(self) -> list[float]:
+        if self._sorted is None:
+            self._sorted = sorted(v for v in self._rtts[: self._count] if not math.isnan(v))
+        return self._sorted
+
+    @property
+    def window(self) -> int:
+        return self._count
+
+    @property
+    def loss_rate(self) -> float | None:
+        """Fraction of lost probes in the window."""
+        if not self._count:
+            return None
+        return sum(self._lost) / self._count
+
+    @property
+    def window_timeouts(self) -> int:
+        return sum(self._timeouts)
+
+    def rtt_percentile(self, pct: float) -> float | None:
+        return _percentile(self._window(), pct)
+
+    def as_dict(self) -> dict[str, Any]:
+        p50 = self.rtt_percentile(50)
+        p95 = self.rtt_percentile(95)
+        loss = self.loss_rate
+        return {
+            "window": self._count,
+            "rtt_p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "rtt_p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            "loss_pct": round(loss * 100, 1) if loss is not None else None,
+            "window_timeouts": self.window_timeouts,
+            "probes": self.probes,
+            "losses": self.losses,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,169 @@
+"""Locally cached street catalog with id and name-prefix indexes.
+
+The full Ternopil street list rarely changes, so it is persisted with a TTL
+and refreshed in the background. Lookups never hit the network:
+ - by id: dict lookup
+ - by name prefix: bisect over a sorted list of normalized word tokens
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+import logging
+import re
+import time
+import unicodedata
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import iter_streets
+from .const import (
+    DATA_STREET_CATALOG,
+    DOMAIN,
+    STORAGE_VERSION,
+    STREET_CATALOG_TTL,
+    STREET_SEARCH_LIMIT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_APOSTROPHES = str.maketrans("", "", "'’ʼ`´")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_name(value: str) -> str:
+    """Case- and diacritic-fold a street name (й->и, ї->і, ё->е; apostrophes dropped)."""
+    folded = unicodedata.normalize("NFKD", value.casefold().translate(_APOSTROPHES))
+    stripped = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD.sub(" ", stripped).split())
+
+
+class StreetCatalog:
+    """Street list for one city, persisted and indexed in memory."""
+
+    def __init__(self, hass: HomeAssistant, city_id: int) -> None:
+        self.hass = hass
+        self.city_id = city_id
+        self.fetched_at: float = 0.0
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.streets_{city_id}"
+        )
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._by_id: dict[int, str] = {}
+        # Sorted (normalized token, street id); one row per word of each name
+        self._tokens: list[tuple[str, int]] = []
+        self._keys: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > STREET_CATALOG_TTL
+
+    def get(self, street_id: int) -> str | None:
+        return self._by_id.get(int(street_id))
+
+    def streets(self) -> list[dict[str, Any]]:
+        return [{"id": sid, "name": name} for sid, name in self._by_id.items()]
+
+    def search(self, query: str | None, limit: int = STREET_SEARCH_LIMIT) -> list[dict[str, Any]]:
+        """Return streets whose words start with every word of the query."""
+        words = normalize_name(query or "").split()
+        if not words:
+            return sorted(self.streets(), key=lambda s: s["name"])[:limit]
+
+        # Candidates from the longest query word (most selective), then filter by the rest
+        head = max(words, key=len)
+        ids: set[int] = set()
+        i = bisect_left(self._keys, head)
+        while i < len(self._keys) and self._keys[i].startswith(head):
+            ids.add(self._tokens[i][1])
+            i += 1
+
+        out: list[dict[str, Any]] = []
+        for sid in ids:
+            name = self._by_id[sid]
+            tokens = normalize_name(name).split()
+            if all(any(t.startswith(w) for t in tokens) for w in words):
+                out.append({"id": sid, "name": name})
+        out.sort(key=lambda s: s["name"])
+        return out[:limit]
+
+    def _index(self, streets: list[dict[str, Any]]) -> None:
+        by_id: dict[int, str] = {}
+        tokens: list[tuple[str, int]] = []
+        for s in streets:
+            sid = s.get("id")
+            name = s.get("name")
+            if not isinstance(sid, int) or not isinstance(name, str):
+                continue
+            by_id[sid] = name
+            tokens.extend((t, sid) for t in set(normalize_name(name).split()))
+        tokens.sort()
+        self._by_id = by_id
+        self._tokens = tokens
+        self._keys = [t for t, _ in tokens]
+
+    async def async_load(self) -> None:
+        """Load the persisted catalog once."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load()
+            # Only a successful read counts; a failed one is retried on the next call
+            self._loaded = True
+            if isinstance(stored, dict) and isinstance(stored.get("streets"), list):
+                self._index(stored["streets"])
+                self.fetched_at = float(stored.get("fetched_at") or 0.0)
+
+    async def async_refresh(self) -> None:
+        """Download the full street list page by page and replace the index."""
+        streets: list[dict[str, Any]] = []
+        async for page in iter_streets(self.hass, self.city_id):
+            streets.extend(page)
+        if not streets:
+            raise RuntimeError("Empty street list")
+        self._index(streets)
+        self.fetched_at = time.time()
+        await self._store.async_save({"fetched_at": self.fetched_at, "streets": streets})
+        _LOGGER.debug("Street catalog for city %s refreshed: %d streets", self.city_id, len(streets))
+
+    @callback
+    def async_schedule_refresh(self) -> None:
+        """Refresh in the background if stale; never blocks the caller."""
+        if not self.is_stale or (self._refresh_task and not self._refresh_task.done()):
+            return
+        self._refresh_task = self.hass.async_create_background_task(
+            self._async_refresh_safe(), f"{DOMAIN}_streets_{self.city_id}"
+        )
+
+    async def _async_refresh_safe(self) -> None:
+        try:
+            await self.async_refresh()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Street catalog refresh failed (non-fatal): %s", err)
+
+    async def async_wait_refresh(self, timeout: float) -> None:
+        """Wait up to timeout for a running background refresh."""
+        task = self._refresh_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+@callback
+def async_get_street_catalog(hass: HomeAssistant, city_id: int) -> StreetCatalog:
+    catalogs = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_STREET_CATALOG, {})
+    catalog = catalogs.get(city_id)
+    if catalog is None:
+        catalog = catalogs[city_id] = StreetCatalog(hass, city_id)
+    return catalog
@@ -0,0 +1,195 @@
+"""Compact, bisect-indexed schedule timeline.
+
+This is the schedule coordinator's data contract. Segments are sorted,
+non-overlapping [start_ts, end_ts) intervals (UTC epoch seconds) stored as
+parallel arrays plus a color code array, so lookups are O(log n) and no
+per-read float() conversions are needed.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, NamedTuple
+
+RED = 0
+GREEN = 1
+YELLOW = 2
+
+COLORS: tuple[str, ...] = ("red", "green", "yellow")
+COLOR_CODES: dict[str, int] = {c: i for i, c in enumerate(COLORS)}
+
+
+class Segment(NamedTuple):
+    start_ts: float
+    end_ts: float
+    color: str
+
+
+class SegmentTimeline:
+    """Immutable sorted segments with O(log n) point queries."""
+
+    __slots__ = ("starts", "ends", "codes", "_next_diff")
+
+    def __init__(
+        self,
+        starts: Iterable[float] = (),
+        ends: Iterable[float] = (),
+        codes: Iterable[int] = (),
+    ) -> None:
+        self.starts = array("d", starts)
+        self.ends = array("d", ends)
+        self.codes = array("b", codes)
+        n = len(self.starts)
+        if len(self.ends) != n or len(self.codes) != n:
+            raise ValueError("starts, ends and codes must have the same length")
+        # _next_diff[i]: first index > i whose color differs from segment i (n if none)
+        nd = array("i", bytes(4 * n))
+        nxt = n
+        for i in range(n - 1, -1, -1):
+            if i + 1 < n and self.codes[i + 1] != self.codes[i]:
+                nxt = i + 1
+            nd[i] = nxt
+        self._next_diff = nd
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment | Mapping[str, Any]]) -> SegmentTimeline:
+        """Build from Segment tuples or {start_ts, end_ts, color} dicts (stored snapshots)."""
+        rows: list[tuple[float, float, int]] = []
+        for s in segments:
+            try:
+                if isinstance(s, Mapping):
+                    start, end, color = float(s["start_ts"]), float(s["end_ts"]), s.get("color")
+                else:
+                    start, end, color = float(s[0]), float(s[1]), s[2]
+            except (KeyError, TypeError, ValueError, IndexError):
+                continue
+            if end <= start:
+                continue
+            rows.append((start, end, COLOR_CODES.get(str(color), YELLOW)))
+        rows.sort()
+        return cls((r[0] for r in rows), (r[1] for r in rows), (r[2] for r in rows))
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """JSON-friendly form (used for persistence)."""
+        return [s._asdict() for s in self]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    def __getitem__(self, i: int) -> Segment:
+        return Segment(self.starts[i], self.ends[i], COLORS[self.codes[i]])
+
+    def __iter__(self) -> Iterator[Segment]:
+        for i in range(len(self.starts)):
+            yield Segment(self.starts[i], self.ends[i], COLORS[self.codes[i]])
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SegmentTimeline):
+            return NotImplemented
+        return (
+            self.starts == other.starts
+            and self.ends == other.ends
+            and self.codes == other.codes
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"SegmentTimeline({len(self)} segments)"
+
+    # --- queries ---
+
+    def index_at(self, ts: float) -> int:
+        """Index of the segment containing ts, or -1."""
+        i = bisect_right(self.starts, ts) - 1
+        if i >= 0 and ts < self.ends[i]:
+            return i
+        return -1
+
+    def segment_at(self, ts: float) -> Segment | None:
+        i = self.index_at(ts)
+        return self[i] if i >= 0 else None
+
+    def color_at(self, ts: float) -> str | None:
+        i = self.index_at(ts)
+        return COLORS[self.codes[i]] if i >= 0 else None
+
+    def next_change_after(self, ts: float) -> tuple[float | None, str | None]:
+        """(start_ts, color) of the first later segment whose color differs from the current one."""
+        cur = self.index_at(ts)
+        j = self._next_diff[cur] if cur >= 0 else bisect_right(self.starts, ts)
+        if j >= len(self.starts):
+            return None, None
+        return self.starts[j], COLORS[self.codes[j]]
+
+    def first_index_from(self, ts: float) -> int:
+        """Index of the first segment starting at or after ts."""
+        return bisect_left(self.starts, ts)
+
+    def overlapping(self, start_ts: float, end_ts: float) -> list[Segment]:
+        """Segments overlapping [start_ts, end_ts), unclipped."""
+        out: list[Segment] = []
+        i = bisect_right(self.ends, start_ts)
+        while i < len(self.starts) and self.starts[i] < end_ts:
+            out.append(self[i])
+            i += 1
+        return out
+
+    def blocks(
+        self, code: int, start_ts: float, end_ts: float, limit: int | None = None
+    ) -> list[tuple[float, float]]:
+        """Contiguous runs of color code overlapping [start_ts, end_ts), oldest first.
+
+        Touching segments of the same color are merged into one run; runs are
+        not clipped to the window.
+        """
+        out: list[tuple[float, float]] = []
+        n = len(self.starts)
+        # Segments are non-overlapping, so ends are sorted too
+        i = bisect_right(self.ends, start_ts)
+        # A run may start before start_ts through touching segments
+        if i < n and self.starts[i] < end_ts:
+            while (
+                i > 0
+                and self.codes[i] == code
+                and self.codes[i - 1] == code
+                and abs(self.ends[i - 1] - self.starts[i]) < 1
+            ):
+                i -= 1
+        while i < n and self.starts[i] < end_ts:
+            if self.codes[i] == code:
+                a, b = self.starts[i], self.ends[i]
+                if out and abs(out[-1][1] - a) < 1:
+                    out[-1] = (out[-1][0], b)
+                else:
+                    if limit is not None and len(out) >= limit:
+                        break
+                    out.append((a, b))
+            i += 1
+        # A run may continue past end_ts through touching segments
+        while i < n and out and self.codes[i] == code and abs(out[-1][1] - self.starts[i]) < 1:
+            out[-1] = (out[-1][0], self.ends[i])
+            i += 1
+        return out
+
+    def seconds_in(self, code: int, start_ts: float, end_ts: float) -> float:
+        """Total seconds of color code overlapping [start_ts, end_ts)."""
+        total = 0.0
+        i = max(0, bisect_right(self.starts, start_ts) - 1)
+        n = len(self.starts)
+        while i < n and self.starts[i] < end_ts:
+            if self.codes[i] == code:
+                a = max(self.starts[i], start_ts)
+                b = min(self.ends[i], end_ts)
+                if b > a:
+                    total += b - a
+            i += 1
+        return total
+
+
+EMPTY_TIMELINE = SegmentTimeline()
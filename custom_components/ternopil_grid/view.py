@@ -0,0 +1,111 @@
+"""Derived schedule state shared by all schedule entities.
+
+A ScheduleView is computed once per coordinator update and again once the
+clock passes its valid_until (the next segment edge, the next local
+midnight or the next time the rolling 24h window changes). Entities only
+read fields from it, so per-entity derivation cost is O(1).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .timeline import COLORS, RED, Segment, SegmentTimeline
+
+_COLOR_CHARS: tuple[str, ...] = tuple(c[0].upper() for c in COLORS)
+
+ROLLING_WINDOW = 24 * 3600  # seconds
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleView:
+    timeline: SegmentTimeline
+    computed_at: float
+    valid_until: float
+    current: Segment | None
+    current_start: datetime | None  # local
+    current_end: datetime | None  # local
+    next_change_ts: float | None
+    next_change: datetime | None  # local
+    next_color: str | None
+    off_today: int
+    off_tomorrow: int
+    rolling_24h: str | None
+
+    def is_current(self, timeline: SegmentTimeline, ts: float) -> bool:
+        return self.timeline is timeline and self.computed_at <= ts < self.valid_until
+
+
+def local_datetime(ts: float) -> datetime:
+    """Epoch seconds as an aware datetime in the HA time zone."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(ts))
+
+
+def local_day_bounds(target_date: date) -> tuple[float, float]:
+    """UTC epoch bounds of a local calendar day."""
+    tz = dt_util.DEFAULT_TIME_ZONE
+    start = datetime.combine(target_date, datetime.min.time(), tzinfo=tz)
+    end = datetime.combine(target_date + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+    return start.timestamp(), end.timestamp()
+
+
+def minutes_off_on_date(timeline: SegmentTimeline, target_date: date) -> int:
+    """Sum minutes where color == 'red' for the given local date."""
+    start, end = local_day_bounds(target_date)
+    return int(round(timeline.seconds_in(RED, start, end) / 60.0))
+
+
+def rolling_string(timeline: SegmentTimeline, ts: float) -> str | None:
+    """Compact R/Y/G string of segments starting in the next 24h."""
+    window_end = ts + ROLLING_WINDOW
+    chars: list[str] = []
+    i = timeline.first_index_from(ts)
+    n = len(timeline)
+    while i < n and timeline.starts[i] < window_end:
+        chars.append(_COLOR_CHARS[timeline.codes[i]])
+        i += 1
+    return "".join(chars) if chars else None
+
+
+def build_view(timeline: SegmentTimeline, ts: float) -> ScheduleView:
+    """Derive everything the entities show for instant ts (UTC epoch)."""
+    today = local_datetime(ts).date()
+    _, midnight = local_day_bounds(today)
+
+    cur = timeline.index_at(ts)
+    current = timeline[cur] if cur >= 0 else None
+    next_ts, next_color = timeline.next_change_after(ts)
+
+    # Earliest instant at which any field above may change
+    valid_until = midnight
+    if current is not None:
+        valid_until = min(valid_until, current.end_ts)
+    j = timeline.first_index_from(ts)
+    if j < len(timeline) and timeline.starts[j] == ts:
+        j += 1
+    if j < len(timeline):
+        valid_until = min(valid_until, timeline.starts[j])
+    # a segment start entering the rolling window
+    k = timeline.first_index_from(ts + ROLLING_WINDOW)
+    if k < len(timeline):
+        valid_until = min(valid_until, timeline.starts[k] - ROLLING_WINDOW)
+    if valid_until <= ts:
+        valid_until = ts + 1
+
+    return ScheduleView(
+        timeline=timeline,
+        computed_at=ts,
+        valid_until=valid_until,
+        current=current,
+        current_start=local_datetime(current.start_ts) if current else None,
+        current_end=local_datetime(current.end_ts) if current else None,
+        next_change_ts=next_ts,
+        next_change=local_datetime(next_ts) if next_ts is not None else None,
+        next_color=next_color,
+        off_today=minutes_off_on_date(timeline, today),
+        off_tomorrow=minutes_off_on_date(timeline, today + timedelta(days=1)),
+        rolling_24h=rolling_string(timeline, ts),
+    )
@@ -0,0 +1,138 @@
+"""Micro-benchmark harness for the schedule hot paths.
+
+Each benchmark reports the best per-call time over several rounds, divided by
+a pure-Python calibration loop measured once per session, so results are
+comparable across machines. The ratio is checked against baselines.json.
+Opt-in, like the load harness:
+
+    BENCH=1 pytest tests/benchmarks                  # fail if ratio > baseline * BENCH_TOLERANCE
+    BENCH=1 BENCH_UPDATE=1 pytest tests/benchmarks   # (re)write baselines.json
+
+Benchmarks without a stored baseline only report. Results of a benchmark
+run are also written to bench_output.txt in the repository root.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable
+
+import pytest
+
+BASELINES = Path(__file__).with_name("baselines.json")
+OUTPUT = Path(__file__).resolve().parents[2] / "bench_output.txt"
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "2.0"))
+UPDATE = os.environ.get("BENCH_UPDATE") == "1"
+ROUNDS = 5
+
+_results: dict[str, dict[str, float]] = {}
+
+
+def _best_per_call(fn: Callable[[], Any], number: int) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _calibration() -> float:
+    def work() -> int:
+        total = 0
+        for i in range(1000):
+            total += i * i
+        return total
+
+    return _best_per_call(work, 200)
+
+
+@pytest.fixture(scope="session")
+def calibration() -> float:
+    return _calibration()
+
+
+@pytest.fixture(scope="session")
+def baselines() -> dict[str, float]:
+    if BASELINES.exists():
+        return json.loads(BASELINES.read_text(encoding="utf-8"))
+    return {}
+
+
+@pytest.fixture
+def benchmark(calibration: float, baselines: dict[str, float]):
+    """benchmark(name, fn, number=...) -> per-call seconds; asserts no regression."""
+
+    def run(name: str, fn: Callable[[], Any], number: int = 1000) -> float:
+        fn()  # warm caches / imports
+        per_call = _best_per_call(fn, number)
+        ratio = per_call / calibration
+        _results[name] = {"per_call_us": per_call * 1e6, "ratio": ratio}
+        baseline = baselines.get(name)
+        if baseline is not None and not UPDATE:
+            assert ratio <= baseline * TOLERANCE, (
+                f"{name}: {per_call * 1e6:.2f} us/call, ratio {ratio:.3f} "
+                f"> baseline {baseline:.3f} x {TOLERANCE}"
+            )
+        return per_call
+
+    return run
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    if not _results:
+        return
+    lines = [
+        f"{name:55s} {r['per_call_us']:12.2f} us  ratio {r['ratio']:10.4f}"
+        for name, r in sorted(_results.items())
+    ]
+    OUTPUT.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    if UPDATE:
+        stored = json.loads(BASELINES.read_text(encoding="utf-8")) if BASELINES.exists() else {}
+        stored.update({name: round(r["ratio"], 4) for name, r in _results.items()})
+        BASELINES.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+# --- synthetic payloads ---
+
+GROUPS = ["1.1", "1.2", "2.1", "2.2", "3.1", "3.2", "4.1", "4.2", "5.1", "5.2", "6.1", "6.2"]
+DAYS = 7
+
+
+def synthetic_times(seed: int) -> dict[str, str]:
+    """One day of half-hour values ("0"/"1"/"10") with realistic run lengths."""
+    values = ("1", "0", "10")
+    out: dict[str, str] = {}
+    v = seed % 3
+    for slot in range(48):
+        if (slot * 7 + seed) % 5 == 0:
+            v = (v + 1 + seed) % 3
+        out[f"{slot // 2:02d}:{(slot % 2) * 30:02d}"] = values[v]
+    return out
+
+
+@pytest.fixture(scope="session")
+def payloads() -> dict[str, list[tuple[datetime, dict[str, str]]]]:
+    """{group: [(date_graph, times), ...]} for DAYS days starting yesterday."""
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    return {
+        group: [(day0 + timedelta(days=d), synthetic_times(g * 31 + d)) for d in range(DAYS)]
+        for g, group in enumerate(GROUPS)
+    }
+
+
+@pytest.fixture(scope="session")
+def timeline(payloads):
+    """Multi-day SegmentTimeline for one group."""
+    from custom_components.ternopil_grid.coordinator import _times_to_segments
+    from custom_components.ternopil_grid.timeline import SegmentTimeline
+
+    segs = []
+    for date_graph, times in payloads["4.1"]:
+        segs.extend(_times_to_segments(date_graph, times))
+    return SegmentTimeline.from_segments(segs)
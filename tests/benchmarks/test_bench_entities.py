@@ -0,0 +1,47 @@
+"""Benchmarks: entity state derivation (native_value / is_on)."""
+
+import os
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.ternopil_grid.binary_sensor import TernopilPlannedOutageBinarySensor
+from custom_components.ternopil_grid.const import DOMAIN
+from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+from custom_components.ternopil_grid.sensor import DESCRIPTIONS, TernopilGridSensor
+from custom_components.ternopil_grid.view import build_view
+
+pytestmark = pytest.mark.skipif(os.environ.get("BENCH") != "1", reason="benchmarks are opt-in (BENCH=1)")
+
+
+def _coordinator(hass, timeline) -> TernopilScheduleCoordinator:
+    coord = TernopilScheduleCoordinator(hass, street_id=1, group="4.1")
+    coord.data = timeline
+    return coord
+
+
+def _entry() -> MockConfigEntry:
+    return MockConfigEntry(domain=DOMAIN, entry_id="bench", data={}, options={})
+
+
+@pytest.mark.parametrize("description", DESCRIPTIONS, ids=[d.key for d in DESCRIPTIONS])
+async def test_bench_sensor_native_value(hass, benchmark, timeline, description):
+    sensor = TernopilGridSensor(hass, _entry(), _coordinator(hass, timeline), description)
+    benchmark(f"sensor_native_value_{description.key}", lambda: sensor.native_value, number=5000)
+
+
+async def test_bench_sensor_attributes(hass, benchmark, timeline):
+    sensor = TernopilGridSensor(hass, _entry(), _coordinator(hass, timeline), DESCRIPTIONS[0])
+    benchmark("sensor_extra_state_attributes", lambda: sensor.extra_state_attributes, number=5000)
+
+
+async def test_bench_planned_outage_is_on(hass, benchmark, timeline):
+    sensor = TernopilPlannedOutageBinarySensor(_coordinator(hass, timeline), _entry())
+    benchmark("planned_outage_is_on", lambda: sensor.is_on, number=5000)
+
+
+def test_bench_build_view(benchmark, timeline):
+    ts = dt_util.utcnow().timestamp()
+    benchmark("build_view_cold", lambda: build_view(timeline, ts), number=2000)
@@ -0,0 +1,43 @@
+"""Benchmarks: schedule normalization and timeline queries."""
+
+from datetime import datetime, timezone
+import os
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.ternopil_grid.coordinator import _parse_day0, _times_to_segments
+from custom_components.ternopil_grid.view import minutes_off_on_date
+
+pytestmark = pytest.mark.skipif(os.environ.get("BENCH") != "1", reason="benchmarks are opt-in (BENCH=1)")
+
+
+def test_bench_times_to_segments(benchmark, payloads):
+    days = [d for group in payloads.values() for d in group]
+
+    def run():
+        for date_graph, times in days:
+            _times_to_segments(date_graph, times)
+
+    benchmark("times_to_segments_all_groups_days", run, number=20)
+
+
+def test_bench_parse_day0(benchmark):
+    dg = datetime(2024, 11, 20, 0, 0, tzinfo=timezone.utc)
+    benchmark("parse_day0", lambda: _parse_day0(dg), number=20000)
+
+
+def test_bench_segment_at(benchmark, timeline):
+    ts = timeline.starts[len(timeline) // 2] + 1
+    benchmark("segment_at", lambda: timeline.segment_at(ts), number=20000)
+
+
+def test_bench_next_change_after(benchmark, timeline):
+    ts = timeline.starts[len(timeline) // 2] + 1
+    benchmark("next_change_after", lambda: timeline.next_change_after(ts), number=20000)
+
+
+def test_bench_minutes_off_on_date(benchmark, timeline):
+    today = dt_util.now().date()
+    benchmark("minutes_off_on_date", lambda: minutes_off_on_date(timeline, today), number=5000)
@@ -0,0 +1,77 @@
+"""Fixtures for the macro load harness (see test_load_harness.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag: how late a fixed-interval sleep wakes up."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> dict[str, float]:
+        if not self.samples:
+            return {"samples": 0}
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 2)
+
+        return {"samples": len(ordered), "p50_ms": pct(0.50), "p99_ms": pct(0.99), "max_ms": pct(1.0)}
+
+
+@pytest.fixture
+def loop_lag() -> LoopLagMonitor:
+    return LoopLagMonitor()
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def resolver_shutdown_thread():
+    """Start pycares' process-wide channel shutdown thread up front.
+
+    pycares >= 4.9 starts it lazily when the first resolver is closed, which
+    the HA cleanup check would report as a thread leaked by the test.
+    """
+    try:
+        import pycares
+    except ImportError:
+        return
+    manager = getattr(pycares, "_shutdown_manager", None)
+    if manager is not None:
+        manager.start()
+
+
+@pytest.fixture(autouse=True)
+def auto_socket_enabled(socket_enabled):
+    """The stand-in upstream listens on a real localhost socket."""
+    yield
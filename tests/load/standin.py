@@ -0,0 +1,268 @@
+"""Local stand-in for api-toe-poweron.inneti.net, served from recorded fixtures.
+
+Serves the three endpoints the integration uses:
+  /api/pw_streets                   (Hydra collection, paginated or pagination=false)
+  /api/pw-accounts/building-groups  (JSON)
+  /api/a_gpv_g                      (Hydra collection, dateGraph rebased to today)
+
+Behaviour knobs live in StandInConfig (latency, error rate, empty graphs,
+slow bodies). Run standalone with:
+
+    python tests/load/standin.py --port 8080 --latency 0.05 --error-rate 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import json
+from pathlib import Path
+import random
+from typing import Any
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).with_name("fixtures")
+GROUPS = [f"{a}.{b}" for a in range(1, 7) for b in (1, 2)]
+
+
+@dataclass
+class StandInConfig:
+    latency: float = 0.0  # base delay before answering, seconds
+    latency_jitter: float = 0.0  # extra uniform(0, jitter) delay
+    error_rate: float = 0.0  # fraction of requests answered with error_status
+    error_status: int = 503
+    retry_after: int | None = None
+    empty_rate: float = 0.0  # fraction of a_gpv_g answers with empty graphs
+    slow_body: float = 0.0  # seconds to dribble each body out over
+    chunk_size: int = 1024
+    street_count: int = 0  # pad the street catalog to this many entries
+    items_per_page: int = 30
+    seed: int | None = None
+
+
+def _load(name: str) -> Any:
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+class StandInUpstream:
+    """aiohttp server replaying the recorded upstream; counts what it serves."""
+
+    def __init__(self, config: StandInConfig | None = None) -> None:
+        self.config = config or StandInConfig()
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self.bytes_sent = 0
+        self._rng = random.Random(self.config.seed)
+        self._runner: web.AppRunner | None = None
+        self.port = 0
+
+        self._streets: list[dict[str, Any]] = _load("pw_streets.json")["hydra:member"]
+        if self.config.street_count > len(self._streets):
+            next_id = max(s["id"] for s in self._streets) + 1
+            self._streets += [
+                {
+                    "@id": f"/api/pw_streets/{next_id + i}",
+                    "@type": "PwStreet",
+                    "id": next_id + i,
+                    "name": f"Вулиця {i + 1}",
+                    "city": "/api/pw_cities/1032",
+                }
+                for i in range(self.config.street_count - len(self._streets))
+            ]
+        self._building = _load("building_groups.json")
+        self._graphs = _load("a_gpv_g.json")
+
+    # --- lifecycle ---
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/pw_streets", self._streets_handler)
+        app.router.add_get("/api/pw-accounts/building-groups", self._building_handler)
+        app.router.add_get("/api/a_gpv_g", self._graphs_handler)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        return self.api_base
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> StandInUpstream:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    @property
+    def api_base(self) -> str:
+        """Drop-in value for api.API."""
+        return f"http://127.0.0.1:{self.port}/api"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": dict(self.requests),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "bytes_sent": self.bytes_sent,
+        }
+
+    # --- behaviour ---
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        cfg = self.config
+        self.requests[request.path.rsplit("/api/", 1)[-1]] += 1
+        delay = cfg.latency + (self._rng.uniform(0, cfg.latency_jitter) if cfg.latency_jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if cfg.error_rate and self._rng.random() < cfg.error_rate:
+            headers = {"Retry-After": str(cfg.retry_after)} if cfg.retry_after is not None else None
+            resp: web.StreamResponse = web.Response(
+                status=cfg.error_status, text='{"hydra:description":"stand-in error"}', headers=headers
+            )
+        else:
+            resp = await handler(request)
+        self.statuses[resp.status] += 1
+        return resp
+
+    async def _json(self, request: web.Request, payload: Any, content_type: str) -> web.StreamResponse:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+
+        headers = {"ETag": etag, "Content-Type": f"{content_type}; charset=utf-8"}
+        if not self.config.slow_body:
+            self.bytes_sent += len(body)
+            return web.Response(body=body, headers=headers)
+
+        resp = web.StreamResponse(headers=headers)
+        resp.content_length = len(body)
+        await resp.prepare(request)
+        step = self.config.chunk_size
+        chunks = max(1, (len(body) + step - 1) // step)
+        for i in range(0, len(body), step):
+            await resp.write(body[i : i + step])
+            await asyncio.sleep(self.config.slow_body / chunks)
+        await resp.write_eof()
+        self.bytes_sent += len(body)
+        return resp
+
+    # --- endpoints ---
+
+    async def _streets_handler(self, request: web.Request) -> web.StreamResponse:
+        query = request.query
+        streets = self._streets
+        if name := query.get("name"):
+            needle = name.casefold()
+            streets = [s for s in streets if needle in s["name"].casefold()]
+
+        payload: dict[str, Any] = {
+            "@context": "/api/contexts/PwStreet",
+            "@id": "/api/pw_streets",
+            "@type": "hydra:Collection",
+            "hydra:totalItems": len(streets),
+        }
+        if query.get("pagination") == "false":
+            payload["hydra:member"] = streets
+            return await self._json(request, payload, "application/ld+json")
+
+        per_page = max(1, int(query.get("itemsPerPage", self.config.items_per_page)))
+        page = max(1, int(query.get("page", "1")))
+        last = max(1, (len(streets) + per_page - 1) // per_page)
+        payload["hydra:member"] = streets[(page - 1) * per_page : page * per_page]
+
+        def page_url(n: int) -> str:
+            return str(request.rel_url.update_query({"page": str(n)}))
+
+        view = {
+            "@id": page_url(page),
+            "@type": "hydra:PartialCollectionView",
+            "hydra:first": page_url(1),
+            "hydra:last": page_url(last),
+        }
+        if page > 1:
+            view["hydra:previous"] = page_url(page - 1)
+        if page < last:
+            view["hydra:next"] = page_url(page + 1)
+        payload["hydra:view"] = view
+        return await self._json(request, payload, "application/ld+json")
+
+    async def _building_handler(self, request: web.Request) -> web.StreamResponse:
+        try:
+            street_id = int(request.query["streetId"])
+        except (KeyError, ValueError):
+            return web.json_response({"detail": "streetId required"}, status=400)
+        payload = json.loads(json.dumps(self._building))
+        # Spread streets over all groups deterministically
+        payload["buildingGroups"][0]["chergGpv"] = GROUPS[street_id % len(GROUPS)]
+        return await self._json(request, payload, "application/json")
+
+    async def _graphs_handler(self, request: web.Request) -> web.StreamResponse:
+        wanted = request.query.getall("group[]", [])
+        members = self._graphs["hydra:member"]
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        first = datetime.fromisoformat(members[0]["dateGraph"]) if members else today
+        empty = bool(self.config.empty_rate) and self._rng.random() < self.config.empty_rate
+
+        out = []
+        for member in members:
+            shift = datetime.fromisoformat(member["dateGraph"]) - first
+            data_json = {
+                g: {"times": {} if empty else v["times"]}
+                for g, v in member["dataJson"].items()
+                if not wanted or g in wanted
+            }
+            out.append(
+                {
+                    **member,
+                    "dateGraph": (today + shift).isoformat(),
+                    "dateCreate": (today + shift - timedelta(hours=6)).isoformat(),
+                    "dataJson": data_json,
+                }
+            )
+        payload = {**self._graphs, "hydra:member": out, "hydra:totalItems": len(out)}
+        return await self._json(request, payload, "application/ld+json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--empty-rate", type=float, default=0.0)
+    parser.add_argument("--slow-body", type=float, default=0.0)
+    parser.add_argument("--street-count", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StandInConfig(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        empty_rate=args.empty_rate,
+        slow_body=args.slow_body,
+        street_count=args.street_count,
+    )
+    web.run_app(StandInUpstream(config).make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Macro load harness: hundreds of config entries against the stand-in upstream.
+
+Opt-in, since it takes a while:
+
+    LOAD_HARNESS=1 pytest tests/load -s
+    LOAD_HARNESS=1 LOAD_ENTRIES=500 LOAD_LATENCY=0.2 LOAD_ERROR_RATE=0.1 pytest tests/load -s
+
+Reports setup time, event-loop lag, upstream request counts and memory; the
+report is printed and, with LOAD_REPORT=<path>, written as JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+import resource
+import time
+import tracemalloc
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.setup import async_setup_component
+
+from custom_components.ternopil_grid import api
+from custom_components.ternopil_grid.const import (
+    CONF_CITY_ID,
+    CONF_GROUP,
+    CONF_HOUSE_NUMBER,
+    CONF_PING_INTERVAL,
+    CONF_PING_IP,
+    CONF_PING_METHOD,
+    CONF_PING_PORT,
+    CONF_POWER_SENSOR_NAME,
+    CONF_STREET_ID,
+    CONF_STREET_NAME,
+    DEFAULT_TERNOPIL_CITY_ID,
+    DOMAIN,
+    PING_METHOD_TCP,
+)
+from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+from custom_components.ternopil_grid.hub import async_get_schedule_hub
+
+from standin import GROUPS, StandInConfig, StandInUpstream
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("LOAD_HARNESS") != "1", reason="load harness is opt-in (LOAD_HARNESS=1)"
+)
+
+ENTRIES = int(os.environ.get("LOAD_ENTRIES", "300"))
+SETTLE = float(os.environ.get("LOAD_SETTLE", "30"))
+RUN = float(os.environ.get("LOAD_RUN", "10"))
+
+
+def _config() -> StandInConfig:
+    env = os.environ.get
+    return StandInConfig(
+        latency=float(env("LOAD_LATENCY", "0.05")),
+        latency_jitter=float(env("LOAD_LATENCY_JITTER", "0.05")),
+        error_rate=float(env("LOAD_ERROR_RATE", "0")),
+        empty_rate=float(env("LOAD_EMPTY_RATE", "0")),
+        slow_body=float(env("LOAD_SLOW_BODY", "0")),
+        seed=1,
+    )
+
+
+def _entry(i: int, upstream: StandInUpstream) -> MockConfigEntry:
+    street_id = 10300 + i
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"Load {i}",
+        unique_id=f"load_{i}",
+        data={
+            CONF_CITY_ID: DEFAULT_TERNOPIL_CITY_ID,
+            CONF_STREET_ID: street_id,
+            CONF_STREET_NAME: f"Вулиця {i}",
+            CONF_HOUSE_NUMBER: "1",
+            CONF_GROUP: GROUPS[street_id % len(GROUPS)],
+            CONF_POWER_SENSOR_NAME: f"Load {i} power",
+        },
+        # Ping the stand-in itself over TCP: no raw sockets needed
+        options={
+            CONF_PING_IP: "127.0.0.1",
+            CONF_PING_METHOD: PING_METHOD_TCP,
+            CONF_PING_PORT: upstream.port,
+            CONF_PING_INTERVAL: 10,
+        },
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expected_lingering_timers", [True])
+async def test_load_many_entries(hass, loop_lag, monkeypatch, expected_lingering_timers) -> None:
+    async with StandInUpstream(_config()) as upstream:
+        monkeypatch.setattr(api, "API", upstream.api_base)
+        # Startup jitter only spreads real restarts; it would just stall the harness
+        monkeypatch.setattr(TernopilScheduleCoordinator, "startup_delay", lambda self: 0.0)
+
+        entries = [_entry(i, upstream) for i in range(ENTRIES)]
+        for entry in entries:
+            entry.add_to_hass(hass)
+
+        tracemalloc.start()
+        loop_lag.start()
+        started = time.perf_counter()
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+        setup_s = time.perf_counter() - started
+
+        coordinators = async_get_schedule_hub(hass).coordinators().values()
+        deadline = time.monotonic() + SETTLE
+        while time.monotonic() < deadline and not all(
+            c.data and c.last_update_success for c in coordinators
+        ):
+            await asyncio.sleep(0.1)
+        settled_s = time.perf_counter() - started
+
+        await asyncio.sleep(RUN)
+        await loop_lag.stop()
+        mem_current, mem_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        report = {
+            "entries": ENTRIES,
+            "loaded": sum(e.state is ConfigEntryState.LOADED for e in entries),
+            "schedule_coordinators": len(coordinators),
+            "schedule_ok": sum(bool(c.data) and c.last_update_success for c in coordinators),
+            "setup_s": round(setup_s, 3),
+            "settled_s": round(settled_s, 3),
+            "loop_lag": loop_lag.summary(),
+            "upstream": upstream.stats(),
+            "memory": {
+                "traced_current_mb": round(mem_current / 2**20, 2),
+                "traced_peak_mb": round(mem_peak / 2**20, 2),
+                "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+            },
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        if path := os.environ.get("LOAD_REPORT"):
+            Path(path).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+        for entry in entries:
+            await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert report["loaded"] == ENTRIES
+    # Shared coordinators, batched per city: graph requests never scale with entries
+    assert report["upstream"]["requests"].get("a_gpv_g", 0) <= 4 * len(GROUPS)
@@ -0,0 +1,229 @@
+def test_iter_streets_follows_pages_in_order(monkeypatch):
+    import asyncio
+
+    from custom_components.ternopil_grid import api
+
+    def page(n):
+        return {
+            "hydra:member": [{"id": n * 10 + i, "name": f"S{n}{i}"} for i in range(2)],
+            "hydra:view": {
+                "hydra:first": "/api/pw_streets?city.id=1032&page=1",
+                "hydra:last": "/api/pw_streets?city.id=1032&page=4",
+            },
+        }
+
+    requested = []
+
+    async def fake_get_json(hass, url, *, accept, **kwargs):
+        requested.append(url)
+        n = int(url.rsplit("page=", 1)[1]) if "page=" in url else 1
+        await asyncio.sleep(0.01 * (5 - n))  # later pages answer first
+        return page(n)
+
+    monkeypatch.setattr(api, "_get_json", fake_get_json)
+
+    async def collect():
+        return [p async for p in api.iter_streets(None, 1032, concurrency=2)]
+
+    pages = asyncio.run(collect())
+
+    assert [s["id"] for p in pages for s in p] == [10, 11, 20, 21, 30, 31, 40, 41]
+    assert "pagination" not in requested[0]
+    assert len(requested) == 4
+
+
+def test_decode_single_pass_helpers():
+    from custom_components.ternopil_grid.api import DecodeStats, _loads, _snippet
+
+    body = bytearray('{"hydra:member": [{"name": "Руська"}]}'.encode("utf-8"))
+    assert _loads(body) == {"hydra:member": [{"name": "Руська"}]}
+    assert len(_snippet(b"x" * 1000)) == 200
+
+    stats = DecodeStats()
+    stats.record(len(body), 0.002)
+    stats.record(10, 0.0)
+    info = stats.as_dict()
+    assert info["responses"] == 2
+    assert info["bytes"] == len(body) + 10
+    assert info["max_bytes"] == len(body)
+
+
+def test_parse_graph_days_orders_days_and_prefers_latest_revision():
+    from custom_components.ternopil_grid.api import _parse_graph_days
+
+    data = {
+        "hydra:member": [
+            {"dateGraph": "2024-01-02T00:00:00+00:00", "dataJson": {"4.1": {"times": {"00:00": "1"}}}},
+            {
+                "dateGraph": "2024-01-01T00:00:00+00:00",
+                "dateCreate": "2023-12-31T18:00:00+00:00",
+                "dataJson": {"4.1": {"times": {"00:00": "0"}}},
+            },
+            {
+                "dateGraph": "2024-01-01T00:00:00+00:00",
+                "dateCreate": "2023-12-31T20:00:00+00:00",
+                "dataJson": {"4.1": {"times": {"00:00": "10"}}},
+            },
+            {"dateGraph": "2024-01-03T00:00:00+00:00", "dataJson": {"1.1": {"times": {"00:00": "0"}}}},
+        ]
+    }
+    days = _parse_graph_days(data, "4.1")
+
+    assert [d["date_graph"].day for d in days] == [1, 2]
+    assert days[0]["times"] == {"00:00": "10"}
+
+
+class _FakeResponse:
+    def __init__(self, status=200, body=b"{}", headers=None, content_length=None, chunk=64 * 1024):
+        self.status = status
+        self.headers = headers or {}
+        self.content_length = content_length
+        self._body = body
+        self._chunk = chunk
+        self.chunks_read = 0
+        self.content = self
+
+    async def iter_chunked(self, size):
+        for i in range(0, len(self._body), self._chunk):
+            self.chunks_read += 1
+            yield self._body[i : i + self._chunk]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def _fake_session(monkeypatch, responses):
+    """Patch the shared aiohttp session; returns the list of sent headers."""
+    from custom_components.ternopil_grid import api
+
+    answers = iter(responses)
+    sent = []
+
+    class _Session:
+        def get(self, url, *, headers, allow_redirects):
+            sent.append(dict(headers))
+            return next(answers)
+
+    monkeypatch.setattr(api, "async_get_clientsession", lambda hass: _Session())
+    return sent
+
+
+async def test_conditional_request_sends_stored_validators(hass, monkeypatch):
+    from custom_components.ternopil_grid.api import NOT_MODIFIED, _get_json
+
+    url = "https://example.invalid/api/a_gpv_g?group%5B%5D=4.1"
+    sent = _fake_session(
+        monkeypatch,
+        [
+            _FakeResponse(body=b'{"a": 1}', headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _FakeResponse(status=304, body=b""),
+        ],
+    )
+    validators: dict[str, str] = {}
+
+    assert await _get_json(hass, url, accept="application/json", validators=validators) == {"a": 1}
+    assert "If-None-Match" not in sent[0]
+    assert validators == {"url": url, "etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    assert await _get_json(hass, url, accept="application/json", validators=validators) is NOT_MODIFIED
+    assert sent[1]["If-None-Match"] == '"v1"'
+    assert sent[1]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+async def test_validators_for_another_url_are_not_sent(hass, monkeypatch):
+    from custom_components.ternopil_grid.api import _get_json
+
+    sent = _fake_session(monkeypatch, [_FakeResponse(body=b"[]")])
+    validators = {"url": "https://example.invalid/other", "etag": '"v1"'}
+
+    assert await _get_json(hass, "https://example.invalid/api", accept="application/json", validators=validators) == []
+    assert "If-None-Match" not in sent[0]
+    # No validators on the response: the stale ones are dropped
+    assert validators == {}
+
+
+async def test_not_modified_keeps_timeline_and_notifies_nobody(hass, monkeypatch):
+    from datetime import datetime, timezone
+    import json
+
+    from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    payload = {
+        "hydra:member": [
+            {
+                "dateGraph": day0.isoformat(),
+                "dataJson": {"4.1": {"times": {"00:00": "1", "12:00": "0"}}},
+            }
+        ]
+    }
+    sent = _fake_session(
+        monkeypatch,
+        [
+            _FakeResponse(body=json.dumps(payload).encode(), headers={"ETag": '"v1"'}),
+            _FakeResponse(status=304, body=b""),
+        ],
+    )
+    coordinator = TernopilScheduleCoordinator(hass, city_id=1032, street_id=1, group="4.1")
+    updates = []
+    unsub = coordinator.async_add_listener(lambda: updates.append(coordinator.data))
+
+    await coordinator.async_refresh()
+    first = coordinator.data
+    assert first is not None and len(updates) == 1
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    unsub()
+
+    assert sent[1]["If-None-Match"] == '"v1"'
+    assert coordinator.last_update_success
+    assert coordinator.data is first
+    assert len(updates) == 1
+
+
+async def test_too_large_content_length_is_refused_unread(hass, monkeypatch):
+    import pytest
+
+    from custom_components.ternopil_grid.api import UpstreamError, _get_json, async_get_decode_stats
+
+    resp = _FakeResponse(body=b"x" * 100, content_length=10_000)
+    _fake_session(monkeypatch, [resp])
+
+    with pytest.raises(UpstreamError, match="too large"):
+        await _get_json(hass, "https://example.invalid/api", accept="application/json", max_bytes=1000)
+    assert resp.chunks_read == 0
+    assert async_get_decode_stats(hass).too_large == 1
+
+
+async def test_streamed_body_past_limit_is_aborted(hass, monkeypatch):
+    import pytest
+
+    from custom_components.ternopil_grid.api import UpstreamError, _get_json, async_get_decode_stats
+
+    # No Content-Length (chunked transfer): the cap applies while streaming
+    resp = _FakeResponse(body=b"x" * 10_000, chunk=400)
+    _fake_session(monkeypatch, [resp])
+
+    with pytest.raises(UpstreamError, match="exceeds 1000 bytes"):
+        await _get_json(hass, "https://example.invalid/api", accept="application/json", max_bytes=1000)
+    assert resp.chunks_read == 3
+    assert async_get_decode_stats(hass).too_large == 1
+
+
+async def test_error_status_reports_truncated_snippet(hass, monkeypatch):
+    import pytest
+
+    from custom_components.ternopil_grid.api import UpstreamError, _get_json
+    from custom_components.ternopil_grid.const import ERROR_SNIPPET_BYTES
+
+    _fake_session(monkeypatch, [_FakeResponse(status=503, body=b"e" * 5000, headers={"Retry-After": "30"})])
+
+    with pytest.raises(UpstreamError) as err:
+        await _get_json(hass, "https://example.invalid/api", accept="application/json")
+    assert str(err.value) == "Upstream HTTP 503: " + "e" * ERROR_SNIPPET_BYTES
+    assert err.value.status == 503
+    assert err.value.retry_after == 30.0
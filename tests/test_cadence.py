@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+
+
+def _mid(a, b):
+    return (a + b) / 2
+
+
+def test_backoff_grows_and_honours_retry_after():
+    from custom_components.ternopil_grid.cadence import PollCadence
+    from custom_components.ternopil_grid.const import DEFAULT_UPDATE_INTERVAL, SCHEDULE_BACKOFF_MAX
+
+    now = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    c = PollCadence(now.timestamp(), uniform=_mid)
+    first = c.on_failure(now)
+    second = c.on_failure(now)
+    assert second == 2 * first
+    assert c.on_failure(now, retry_after=SCHEDULE_BACKOFF_MAX) == SCHEDULE_BACKOFF_MAX
+
+    c.last_change_ts = now.timestamp() - 24 * 3600
+    assert c.on_success(now, changed=False) > DEFAULT_UPDATE_INTERVAL
+    assert c.failures == 0
+    # a change switches to the fast cadence
+    assert c.on_success(now, changed=True) < DEFAULT_UPDATE_INTERVAL
+
+
+def test_fast_cadence_only_after_actual_change():
+    from custom_components.ternopil_grid.cadence import PollCadence
+    from custom_components.ternopil_grid.const import (
+        DEFAULT_UPDATE_INTERVAL,
+        SCHEDULE_INTERVAL_FAST,
+        SCHEDULE_INTERVAL_SLOW,
+    )
+
+    # 19:00 UTC is inside the evening publication window
+    evening = datetime(2024, 1, 1, 19, 0, tzinfo=timezone.utc)
+    c = PollCadence(evening.timestamp(), uniform=_mid)
+
+    # Startup and unchanged polls inside a window: never faster than the baseline
+    assert c.on_success(evening, changed=False) == DEFAULT_UPDATE_INTERVAL
+    assert c.on_success(evening, changed=True) == SCHEDULE_INTERVAL_FAST
+
+    # Long stable: slow outside windows, baseline inside
+    c.last_change_ts = evening.timestamp() - 24 * 3600
+    assert c.on_success(evening, changed=False) == DEFAULT_UPDATE_INTERVAL
+    noon = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert c.on_success(noon, changed=False) == SCHEDULE_INTERVAL_SLOW
+
+
+def test_first_failure_never_polls_sooner_than_the_base_interval():
+    from custom_components.ternopil_grid.cadence import PollCadence
+    from custom_components.ternopil_grid.const import SCHEDULE_BACKOFF_MAX, SCHEDULE_INTERVAL_SLOW
+
+    noon = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    for draw in (min, max, _mid):  # lowest, highest and middle jitter draw
+        # Normal cadence right after startup
+        c = PollCadence(noon.timestamp(), uniform=lambda a, b, draw=draw: draw(a, b))
+        assert c.on_failure(noon) >= c.base_interval(noon)
+
+        # Stable graph on the slow cadence
+        c = PollCadence(noon.timestamp() - 24 * 3600, uniform=lambda a, b, draw=draw: draw(a, b))
+        assert c.base_interval(noon) == SCHEDULE_INTERVAL_SLOW
+        first = c.on_failure(noon)
+        assert SCHEDULE_INTERVAL_SLOW <= first <= SCHEDULE_BACKOFF_MAX
+        assert c.on_failure(noon) >= first
@@ -0,0 +1,39 @@
+async def test_get_events_clips_blocks_to_the_window(hass):
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.ternopil_grid.calendar import TernopilOutageCalendar
+    from custom_components.ternopil_grid.const import DOMAIN
+    from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    t0 = dt_util.start_of_local_day().timestamp()
+    h = 3600
+    coordinator = TernopilScheduleCoordinator(hass, street_id=1, group="4.1")
+    # Red 01:00-03:00 (two touching segments) and 04:00-05:00
+    coordinator.data = SegmentTimeline(
+        [t0, t0 + h, t0 + 2 * h, t0 + 3 * h, t0 + 4 * h],
+        [t0 + h, t0 + 2 * h, t0 + 3 * h, t0 + 4 * h, t0 + 5 * h],
+        [GREEN, RED, RED, GREEN, RED],
+    )
+    calendar = TernopilOutageCalendar(coordinator, MockConfigEntry(domain=DOMAIN, entry_id="e"))
+
+    def window(a, b):
+        return dt_util.utc_from_timestamp(t0 + a), dt_util.utc_from_timestamp(t0 + b)
+
+    events = await calendar.async_get_events(hass, *window(1.5 * h, 4.5 * h))
+    assert [(e.start.timestamp() - t0, e.end.timestamp() - t0) for e in events] == [
+        (1.5 * h, 3 * h),
+        (4 * h, 4.5 * h),
+    ]
+    # uid identifies the whole block, not the clipped part
+    assert events[0].uid == f"e_{int(t0 + h)}"
+
+    whole = await calendar.async_get_events(hass, *window(0, 6 * h))
+    assert [(e.start.timestamp() - t0, e.end.timestamp() - t0) for e in whole] == [(h, 3 * h), (4 * h, 5 * h)]
+    assert whole[0].uid == events[0].uid
+
+    # Windows touching a block only at its edge return nothing
+    assert await calendar.async_get_events(hass, *window(3 * h, 4 * h)) == []
+    assert await calendar.async_get_events(hass, *window(5 * h, 6 * h)) == []
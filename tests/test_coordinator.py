@@ -1,2 +1,208 @@
 def test_import():
     import custom_components.ternopil_grid  # noqa: F401
+
+
+def test_merge_days_joins_colors_across_midnight():
+    from custom_components.ternopil_grid.coordinator import _merge_days
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    day1 = SegmentTimeline([0, 84600], [84600, 86400], [GREEN, RED])
+    day2 = SegmentTimeline([86400, 88200], [88200, 172800], [RED, GREEN])
+    merged = _merge_days([day1, day2])
+
+    assert list(merged.starts) == [0, 84600, 88200]
+    assert list(merged.ends) == [84600, 88200, 172800]
+    assert list(merged.codes) == [GREEN, RED, GREEN]
+
+
+def _day(offset_days=0, value="0"):
+    from datetime import datetime, timedelta, timezone
+
+    day0 = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    times = {f"{h:02d}:{m:02d}": ("1" if h < 12 else value) for h in range(24) for m in (0, 30)}
+    return {"date_graph": day0 + timedelta(days=offset_days), "times": times}
+
+
+def _schedule_coordinator(hass, monkeypatch, answers):
+    from custom_components.ternopil_grid import coordinator as coordinator_mod
+
+    calls = iter(answers)
+
+    async def fake_fetch(hass, **kwargs):
+        return next(calls)
+
+    monkeypatch.setattr(coordinator_mod, "fetch_schedule_days", fake_fetch)
+    return coordinator_mod.TernopilScheduleCoordinator(hass, city_id=1032, street_id=1, group="4.1")
+
+
+async def test_empty_graph_polls_fire_one_event_and_keep_placeholder(hass, monkeypatch):
+    from pytest_homeassistant_custom_component.common import async_capture_events
+
+    from custom_components.ternopil_grid.const import EVENT_SCHEDULE_CHANGED
+
+    events = async_capture_events(hass, EVENT_SCHEDULE_CHANGED)
+    coordinator = _schedule_coordinator(hass, monkeypatch, [[_day(), _day(1)], [], []])
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    placeholder = coordinator.data
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    # Schedule withdrawn once; the second empty poll is not a change
+    assert len(events) == 1
+    assert coordinator.data is placeholder
+
+
+async def test_unchanged_schedule_fires_nothing_and_change_fires_delta(hass, monkeypatch):
+    from pytest_homeassistant_custom_component.common import async_capture_events
+
+    from custom_components.ternopil_grid.const import EVENT_SCHEDULE_CHANGED
+
+    events = async_capture_events(hass, EVENT_SCHEDULE_CHANGED)
+    coordinator = _schedule_coordinator(
+        hass, monkeypatch, [[_day(1)], [_day(1)], [_day(1, value="1")]]
+    )
+
+    await coordinator.async_refresh()
+    first = coordinator.data
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.data is first
+    assert events == []
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    changes = [c for day in events[0].data["days"].values() for c in day]
+    assert {(c["old"], c["new"]) for c in changes} == {("red", "green")}
+
+
+async def test_empty_graph_polls_do_not_keep_fast_cadence(hass, monkeypatch):
+    from custom_components.ternopil_grid.const import SCHEDULE_INTERVAL_FAST
+
+    coordinator = _schedule_coordinator(hass, monkeypatch, [[], [], []])
+
+    for _ in range(3):
+        await coordinator.async_refresh()
+
+    assert coordinator.update_interval.total_seconds() > SCHEDULE_INTERVAL_FAST * 1.1
+
+
+def _stored_snapshot(hass_storage, segments, **extra):
+    key = "ternopil_grid.schedule_1032_4.1"
+    hass_storage[key] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": key,
+        "data": {"segments": segments, "fingerprint": "abc", "validators": {"etag": '"v1"'}, **extra},
+    }
+
+
+async def test_snapshot_is_restored_before_the_first_refresh(hass, hass_storage, monkeypatch):
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.ternopil_grid.const import CONF_GROUP, CONF_STREET_ID, DOMAIN
+    from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+    from custom_components.ternopil_grid.hub import async_get_schedule_hub
+
+    now = dt_util.utcnow().timestamp()
+    _stored_snapshot(hass_storage, [{"start_ts": now - 600, "end_ts": now + 3600, "color": "red"}])
+    # Any network fetch would fail the test; park the first refresh behind its startup delay
+    _schedule_coordinator(hass, monkeypatch, [])
+    monkeypatch.setattr(TernopilScheduleCoordinator, "startup_delay", lambda self: 3600)
+
+    hub = async_get_schedule_hub(hass)
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="a", data={CONF_STREET_ID: 1, CONF_GROUP: "4.1"})
+    coordinator = await hub.async_acquire(entry)
+
+    # acquire returns with the snapshot loaded while the first refresh is still pending
+    assert coordinator.data is not None and coordinator.data.color_at(now) == "red"
+    assert coordinator._validators == {"etag": '"v1"'}
+    first_refresh = hub._slots[(1032, "4.1")].first_refresh
+    assert first_refresh is not None and not first_refresh.done()
+    await hub.async_release(entry)
+
+
+async def test_corrupt_or_stale_snapshot_is_ignored(hass, hass_storage, monkeypatch):
+    from homeassistant.util import dt as dt_util
+
+    now = dt_util.utcnow().timestamp()
+    for segments in (
+        "not a list",
+        [{"start_ts": "x", "end_ts": None}, ["broken"]],
+        [{"start_ts": now - 7200, "end_ts": now - 3600, "color": "red"}],  # already over
+    ):
+        _stored_snapshot(hass_storage, segments)
+        coordinator = _schedule_coordinator(hass, monkeypatch, [])
+        assert not await coordinator.async_restore_snapshot()
+        assert coordinator.data is None
+        assert coordinator._validators == {}
+
+    hass_storage["ternopil_grid.schedule_1032_4.1"]["data"] = ["not", "a", "dict"]
+    coordinator = _schedule_coordinator(hass, monkeypatch, [])
+    assert not await coordinator.async_restore_snapshot()
+
+
+async def test_boundary_timer_armed_once_rearmed_and_cancelled(hass, monkeypatch, freezer):
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.ternopil_grid import coordinator as coordinator_mod
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    freezer.move_to("2024-06-01 10:00:00+00:00")
+    t0 = dt_util.utcnow().timestamp()
+    armed = []
+    active = set()
+    real_track = coordinator_mod.async_track_point_in_utc_time
+
+    def tracking(hass, action, point):
+        unsub = real_track(hass, action, point)
+        token = object()
+        armed.append(point.timestamp())
+        active.add(token)
+
+        def _unsub():
+            active.discard(token)
+            unsub()
+
+        return _unsub
+
+    monkeypatch.setattr(coordinator_mod, "async_track_point_in_utc_time", tracking)
+    coordinator = _schedule_coordinator(hass, monkeypatch, [])
+    coordinator.data = SegmentTimeline(
+        [t0 - 600, t0 + 600, t0 + 3600], [t0 + 600, t0 + 3600, t0 + 7200], [GREEN, RED, GREEN]
+    )
+    updates = []
+    remove_a = coordinator.async_add_listener(lambda: updates.append("a"))
+    remove_b = coordinator.async_add_listener(lambda: updates.append("b"))
+
+    # One timer for all listeners, at the view's valid_until (the next edge)
+    first = coordinator.current_view().valid_until
+    assert first == t0 + 600
+    assert armed == [first]
+    assert len(active) == 1
+
+    # Firing notifies listeners once and re-arms at the next boundary
+    freezer.move_to(dt_util.utc_from_timestamp(first))
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(first))
+    await hass.async_block_till_done()
+    assert updates == ["a", "b"]
+    assert coordinator.current_view().current.color == "red"
+    assert armed == [first, coordinator.current_view().valid_until]
+    assert armed[1] > first
+    assert len(active) == 1
+
+    # Removing listeners keeps the timer until the last one goes; shutdown cancels it
+    remove_a()
+    assert len(active) == 1
+    await coordinator.async_shutdown()
+    assert not active
+    remove_b()
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(armed[1] + 1))
+    await hass.async_block_till_done()
+    assert updates == ["a", "b"]
@@ -0,0 +1,28 @@
+def test_diff_reports_only_changed_spans():
+    from custom_components.ternopil_grid.diff import diff_timelines
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    old = SegmentTimeline([0, 3600], [3600, 7200], [GREEN, GREEN])
+    new = SegmentTimeline([0, 1800, 3600, 7200], [1800, 3600, 7200, 9000], [GREEN, RED, GREEN, RED])
+
+    days = diff_timelines(old, new)
+    changes = [c for day in days.values() for c in day]
+
+    assert [(c["change"], c["old"], c["new"]) for c in changes] == [
+        ("recolored", "green", "red"),
+        ("added", None, "red"),
+    ]
+    assert diff_timelines(new, SegmentTimeline(new.starts, new.ends, new.codes)) == {}
+
+
+def test_diff_ignores_past_and_splits_days():
+    from custom_components.ternopil_grid.diff import diff_timelines
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    old = SegmentTimeline([0], [2 * 86400], [GREEN])
+    new = SegmentTimeline([0], [2 * 86400], [RED])
+
+    days = diff_timelines(old, new, since=43200)
+
+    assert sorted(days) == ["1970-01-01", "1970-01-02"]
+    assert days["1970-01-01"][0]["start"].startswith("1970-01-01T12:00:00")
@@ -0,0 +1,133 @@
+from unittest.mock import MagicMock
+
+
+def test_history_rollups_and_accuracy():
+    from custom_components.ternopil_grid.history import OutageHistory
+    from custom_components.ternopil_grid.timeline import RED, SegmentTimeline
+    from homeassistant.util import dt as dt_util
+
+    day_start = dt_util.start_of_local_day().timestamp()
+    # planned outage 02:00-04:00 local
+    timeline = SegmentTimeline([day_start + 7200], [day_start + 14400], [RED])
+    history = OutageHistory(MagicMock(), "entry", "4.1", lambda: timeline)
+    history._store = MagicMock()
+
+    history.async_record(True, day_start + 3600)
+    history.async_record(False, day_start + 10800)  # actual off 03:00-05:00
+    history.async_record(False, day_start + 12000)  # no state change: ignored
+    history.async_record(True, day_start + 18000)
+
+    assert len(history.transitions()) == 3
+    assert history.actual_minutes_off_today(day_start + 20000) == 120
+    summary = history.summary(day_start + 20000)
+    assert summary["overlap_today_min"] == 60
+    assert summary["planned_off_so_far_min"] == 120
+    # overlap 60 / union 180
+    assert summary["accuracy_today"] == 33.3
+
+
+def test_history_reads_do_not_mutate_and_rollups_follow_the_group():
+    import copy
+
+    from custom_components.ternopil_grid.history import OutageHistory
+    from custom_components.ternopil_grid.timeline import RED, SegmentTimeline
+    from homeassistant.util import dt as dt_util
+
+    day_start = dt_util.start_of_local_day().timestamp()
+    timeline = SegmentTimeline([day_start + 7200], [day_start + 14400], [RED])
+    history = OutageHistory(MagicMock(), "entry", "4.1", lambda: timeline)
+    history._store = MagicMock()
+    history.async_record(False, day_start + 10800)
+    history.async_record(True, day_start + 18000)
+
+    saved = copy.deepcopy(history._data_to_save())
+    history.summary(day_start + 20000)
+    history.actual_minutes_off_today(day_start + 20000)
+    assert history._data_to_save() == saved
+    assert list(saved["days"]) == ["4.1"]
+
+    # Same entry after a group change: old rollups are kept but not mixed in
+    moved = OutageHistory(MagicMock(), "entry", "1.1", lambda: timeline)
+    moved._restore(saved)
+    assert moved.actual_minutes_off_today(day_start + 20000) == 0
+    assert moved.summary(day_start + 20000)["overlap_today_min"] == 0
+    assert moved._days["4.1"] == saved["days"]["4.1"]
+
+
+async def test_history_finalizes_previous_day_on_load_and_at_midnight(hass, hass_storage):
+    from datetime import timedelta
+
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.ternopil_grid.history import OutageHistory
+    from custom_components.ternopil_grid.timeline import RED, SegmentTimeline
+    from homeassistant.util import dt as dt_util
+
+    today = dt_util.start_of_local_day()
+    yesterday = today - timedelta(days=1)
+    y_start = yesterday.timestamp()
+    # Yesterday 02:00-04:00 and today 02:00-03:00 planned off
+    timeline = SegmentTimeline(
+        [y_start + 7200, today.timestamp() + 7200],
+        [y_start + 14400, today.timestamp() + 10800],
+        [RED, RED],
+    )
+    hass_storage["ternopil_grid.history_entry"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "ternopil_grid.history_entry",
+        "data": {
+            "ts": [y_start + 10800, y_start + 18000],
+            "state": [0, 1],
+            "days": {"4.1": {yesterday.date().isoformat(): [7200.0, 0.0, 3600.0]}},
+            "open_day": yesterday.date().isoformat(),
+        },
+    }
+    history = OutageHistory(hass, "entry", "4.1", lambda: timeline)
+    await history.async_load()
+    assert history._days["4.1"][yesterday.date().isoformat()] == [7200.0, 7200.0, 3600.0]
+    assert history._open_day == today.date()
+
+    # Midnight timer finalizes today once tomorrow starts
+    history.async_start()
+    tomorrow = today + timedelta(days=1)
+    async_fire_time_changed(hass, tomorrow)
+    await hass.async_block_till_done()
+    assert history._days["4.1"][today.date().isoformat()] == [0.0, 3600.0, 0.0]
+    assert history._open_day == tomorrow.date()
+    history.async_stop()
+    await hass.async_block_till_done()
+
+
+async def test_remove_entry_deletes_history_and_unshared_snapshot(hass, hass_storage):
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.ternopil_grid import async_remove_entry
+    from custom_components.ternopil_grid.const import CONF_GROUP, CONF_STREET_ID, DOMAIN
+
+    def add(entry_id, group):
+        entry = MockConfigEntry(domain=DOMAIN, entry_id=entry_id, data={CONF_STREET_ID: 1, CONF_GROUP: group})
+        entry.add_to_hass(hass)
+        return entry
+
+    def store(key):
+        hass_storage[key] = {"version": 1, "minor_version": 1, "key": key, "data": {}}
+
+    a, b, c = add("a", "4.1"), add("b", "4.1"), add("c", "1.1")
+    for key in (
+        "ternopil_grid.history_a",
+        "ternopil_grid.history_c",
+        "ternopil_grid.schedule_1032_4.1",
+        "ternopil_grid.schedule_1032_1.1",
+    ):
+        store(key)
+
+    # "b" still uses the 4.1 snapshot
+    await async_remove_entry(hass, a)
+    assert "ternopil_grid.history_a" not in hass_storage
+    assert "ternopil_grid.schedule_1032_4.1" in hass_storage
+
+    await async_remove_entry(hass, c)
+    assert "ternopil_grid.history_c" not in hass_storage
+    assert "ternopil_grid.schedule_1032_1.1" not in hass_storage
+    assert b.entry_id in {e.entry_id for e in hass.config_entries.async_entries(DOMAIN)}
@@ -0,0 +1,150 @@
+import pytest
+
+
+def _entry(entry_id, group="4.1", city_id=None):
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.ternopil_grid.const import CONF_CITY_ID, CONF_GROUP, CONF_STREET_ID, DOMAIN
+
+    data = {CONF_STREET_ID: 1, CONF_GROUP: group}
+    if city_id is not None:
+        data[CONF_CITY_ID] = city_id
+    return MockConfigEntry(domain=DOMAIN, entry_id=entry_id, data=data)
+
+
+@pytest.fixture
+def no_first_refresh(hass, monkeypatch):
+    """Park the first refresh behind a long startup delay; no network in these tests."""
+    from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+
+    monkeypatch.setattr(TernopilScheduleCoordinator, "startup_delay", lambda self: 3600)
+
+
+async def test_entries_in_the_same_group_share_one_coordinator(hass, no_first_refresh):
+    from custom_components.ternopil_grid.hub import async_get_schedule_hub
+
+    hub = async_get_schedule_hub(hass)
+    a, b, other, elsewhere = _entry("a"), _entry("b"), _entry("c", group="1.1"), _entry("d", city_id=7)
+
+    coordinator = await hub.async_acquire(a)
+    assert await hub.async_acquire(b) is coordinator
+    assert await hub.async_acquire(other) is not coordinator
+    assert await hub.async_acquire(elsewhere) is not coordinator
+    assert hub.subscribers((1032, "4.1")) == {"a", "b"}
+    assert len(hub.coordinators()) == 3
+
+    for entry in (a, b, other, elsewhere):
+        await hub.async_release(entry)
+    assert hub.coordinators() == {}
+
+
+async def test_release_shuts_down_with_the_last_entry(hass, no_first_refresh, monkeypatch):
+    from custom_components.ternopil_grid.hub import async_get_schedule_hub
+
+    hub = async_get_schedule_hub(hass)
+    a, b = _entry("a"), _entry("b")
+    coordinator = await hub.async_acquire(a)
+    await hub.async_acquire(b)
+    await hass.async_block_till_done()
+    slot = hub._slots[(1032, "4.1")]
+    first_refresh = slot.first_refresh
+    assert first_refresh is not None and not first_refresh.done()
+
+    shutdowns = []
+    original = coordinator.async_shutdown
+
+    async def _shutdown():
+        shutdowns.append(True)
+        await original()
+
+    monkeypatch.setattr(coordinator, "async_shutdown", _shutdown)
+
+    await hub.async_release(a)
+    assert shutdowns == []
+    assert hub.subscribers((1032, "4.1")) == {"b"}
+
+    await hub.async_release(b)
+    await hass.async_block_till_done()
+    assert shutdowns == [True]
+    assert hub.coordinators() == {}
+    assert first_refresh.cancelled()
+
+    # Releasing an unknown entry is a no-op; a new acquire starts afresh
+    await hub.async_release(a)
+    assert await hub.async_acquire(a) is not coordinator
+    await hub.async_release(a)
+
+
+async def test_concurrent_acquire_creates_one_coordinator(hass, no_first_refresh, monkeypatch):
+    import asyncio
+
+    from custom_components.ternopil_grid import hub as hub_mod
+
+    created = []
+    real = hub_mod.TernopilScheduleCoordinator
+
+    def _counting(*args, **kwargs):
+        coordinator = real(*args, **kwargs)
+        created.append(coordinator)
+        return coordinator
+
+    monkeypatch.setattr(hub_mod, "TernopilScheduleCoordinator", _counting)
+    hub = hub_mod.async_get_schedule_hub(hass)
+    entries = [_entry(f"e{i}") for i in range(5)]
+
+    coordinators = await asyncio.gather(*(hub.async_acquire(e) for e in entries))
+
+    assert len(created) == 1
+    assert all(c is created[0] for c in coordinators)
+    assert hub.subscribers((1032, "4.1")) == {e.entry_id for e in entries}
+    for entry in entries:
+        await hub.async_release(entry)
+
+
+async def test_groups_of_a_city_share_one_batched_request(hass, no_first_refresh, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    from custom_components.ternopil_grid import hub as hub_mod
+
+    tomorrow = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    requests = []
+
+    def _day(value):
+        return {"date_graph": tomorrow, "times": {"00:00": "1", "12:00": value}}
+
+    async def fake_fetch(hass, *, city_id, groups, validators, **kwargs):
+        requests.append((city_id, sorted(groups)))
+        if len(requests) == 2:
+            return None  # 304
+        return {group: [_day("1" if group == "1.1" else "0")] for group in groups}
+
+    monkeypatch.setattr(hub_mod, "fetch_group_schedules", fake_fetch)
+    hub = hub_mod.async_get_schedule_hub(hass)
+    a, b, elsewhere = _entry("a"), _entry("b", group="1.1"), _entry("c", city_id=7)
+    first = await hub.async_acquire(a)
+    second = await hub.async_acquire(b)
+    await hub.async_acquire(elsewhere)
+    assert first.batch is second.batch
+
+    await first.async_refresh()
+    await hass.async_block_till_done()
+    assert requests == [(1032, ["1.1", "4.1"])]
+    # The other group got its own days from the same response
+    assert second.last_update_success and second.data is not None
+    assert second.data.codes != first.data.codes
+
+    # A 304 keeps both timelines and still counts as the other group's poll
+    kept = second.data
+    await first.async_refresh()
+    await hass.async_block_till_done()
+    assert len(requests) == 2
+    assert second.data is kept
+
+    await hub.async_release(b)
+    assert second.batch is None
+    await first.async_refresh()
+    assert requests[-1] == (1032, ["4.1"])
+
+    for entry in (a, elsewhere):
+        await hub.async_release(entry)
+    assert hub._batches == {}
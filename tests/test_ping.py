@@ -0,0 +1,181 @@
+def test_parse_targets():
+    from custom_components.ternopil_grid.ping import ProbeTarget, parse_targets
+
+    targets = parse_targets("192.168.1.50:tcp:80, 1.1.1.1:icmp; plug.lan", default_method="tcp", default_port=8080)
+
+    assert targets == [
+        ProbeTarget("192.168.1.50", "tcp", 80),
+        ProbeTarget("1.1.1.1", "icmp", 0),
+        ProbeTarget("plug.lan", "tcp", 8080),
+    ]
+    assert parse_targets("") == []
+
+
+async def _serve(handler):
+    import asyncio
+
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def test_keepalive_eof_reconnects_with_backoff(socket_enabled):
+    import asyncio
+
+    from custom_components.ternopil_grid.ping import TcpKeepAliveMonitor
+
+    async def close_at_once(reader, writer):
+        writer.close()
+
+    server, port = await _serve(close_at_once)
+    changes = []
+    monitor = TcpKeepAliveMonitor(
+        "127.0.0.1", port, changes.append, reconnect_min_s=0.05, reconnect_max_s=0.2, stable_after_s=10
+    )
+    monitor.start()
+    await asyncio.sleep(0.5)
+    await monitor.stop()
+    server.close()
+    await server.wait_closed()
+
+    # A graceful close is not an outage, and reconnects back off (0.05, 0.1, 0.2, ...)
+    assert changes == [True]
+    assert 2 <= monitor.connects <= 5
+
+
+async def test_keepalive_reset_reports_down_then_recovers(socket_enabled):
+    import asyncio
+    import socket
+    import struct
+
+    from custom_components.ternopil_grid.ping import TcpKeepAliveMonitor
+
+    async def reset(reader, writer):
+        sock = writer.get_extra_info("socket")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        writer.transport.abort()
+
+    server, port = await _serve(reset)
+    changes = []
+    monitor = TcpKeepAliveMonitor("127.0.0.1", port, changes.append, reconnect_min_s=0.05, stable_after_s=10)
+    monitor.start()
+    await asyncio.sleep(0.3)
+    await monitor.stop()
+    server.close()
+    await server.wait_closed()
+
+    assert changes[:3] == [True, False, True]
+
+
+async def test_keepalive_connect_failure_reports_down(socket_enabled):
+    import asyncio
+
+    from custom_components.ternopil_grid.ping import TcpKeepAliveMonitor
+
+    async def hold(reader, writer):
+        await reader.read()
+        writer.close()
+
+    server, port = await _serve(hold)
+    server.close()
+    await server.wait_closed()
+
+    changes = []
+    monitor = TcpKeepAliveMonitor("127.0.0.1", port, changes.append, reconnect_min_s=0.05, stable_after_s=10)
+    monitor.start()
+    await asyncio.sleep(0.2)
+    assert changes == [False]
+    assert monitor.connects == 0
+
+    # The port comes back: the next attempt reports up
+    server = await asyncio.start_server(hold, "127.0.0.1", port)
+    await asyncio.sleep(0.5)
+    await monitor.stop()
+    server.close()
+    await server.wait_closed()
+    assert changes == [False, True]
+
+
+def test_icmp_checksum():
+    from custom_components.ternopil_grid.ping import _icmp_checksum
+
+    # RFC 1071 example: one's complement sum 0xddf2
+    assert _icmp_checksum(bytes.fromhex("0001f203f4f5f6f7")) == 0x220D
+    # Odd length is padded with a zero byte
+    assert _icmp_checksum(b"\x01") == _icmp_checksum(b"\x01\x00")
+
+
+def test_icmp_echo_packet():
+    import struct
+
+    from custom_components.ternopil_grid.ping import _icmp_checksum, _icmp_echo_packet
+
+    packet = _icmp_echo_packet(0x1234, 7)
+    kind, code, _, ident, seq = struct.unpack("!BBHHH", packet[:8])
+    assert (kind, code, ident, seq) == (8, 0, 0x1234, 7)
+    assert len(packet) == 16
+    # A packet carrying its own checksum sums to zero
+    assert _icmp_checksum(packet) == 0
+
+
+async def test_icmp_reply_matching(socket_enabled):
+    import asyncio
+    import socket
+    import struct
+
+    from custom_components.ternopil_grid.ping import IcmpProber
+
+    def reply(ident, seq, kind=0):
+        return struct.pack("!BBHHH", kind, 0, 0, ident, seq) + b"\x00" * 8
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    prober = IcmpProber(sock)
+    prober._check_ident = True
+    loop = asyncio.get_running_loop()
+    futures = {}
+    for key in (("10.0.0.1", 1), ("10.0.0.1", 2), ("10.0.0.2", 1)):
+        futures[key] = loop.create_future()
+        prober._pending[key] = (100.0, futures[key])
+    ident = prober._ident
+
+    prober._on_datagram(reply(ident, 1, kind=8), "10.0.0.1", 100.5)  # echo request, not a reply
+    prober._on_datagram(reply(ident ^ 1, 1), "10.0.0.1", 100.5)  # someone else's id
+    prober._on_datagram(reply(ident, 3), "10.0.0.1", 100.5)  # unknown sequence
+    assert not any(f.done() for f in futures.values())
+
+    prober._on_datagram(reply(ident, 1), "10.0.0.1", 100.25)
+    # IPv4 header in front (macOS)
+    header = bytes([0x45]) + b"\x00" * 19
+    prober._on_datagram(header + reply(ident, 1), "10.0.0.2", 100.5)
+    assert futures[("10.0.0.1", 1)].result() == 0.25
+    assert futures[("10.0.0.2", 1)].result() == 0.5
+    assert not futures[("10.0.0.1", 2)].done()
+
+    prober.close()
+    assert futures[("10.0.0.1", 2)].cancelled()
+
+
+async def test_icmp_prober_lives_in_hass_data(hass, monkeypatch):
+    from custom_components.ternopil_grid import probe as probe_mod
+    from custom_components.ternopil_grid.const import DATA_ICMP_PROBER, DOMAIN
+
+    class FakeProber:
+        created = 0
+
+        def __init__(self):
+            FakeProber.created += 1
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(probe_mod, "IcmpProber", FakeProber)
+    prober = probe_mod.async_get_icmp_prober(hass)
+    assert probe_mod.async_get_icmp_prober(hass) is prober
+    assert hass.data[DOMAIN][DATA_ICMP_PROBER] is prober
+
+    probe_mod.async_close_icmp_prober(hass)
+    assert prober.closed
+    assert DATA_ICMP_PROBER not in hass.data[DOMAIN]
+    assert probe_mod.async_get_icmp_prober(hass) is not prober
+    assert FakeProber.created == 2
@@ -0,0 +1,106 @@
+import pytest
+
+
+@pytest.fixture
+def probes(hass, monkeypatch):
+    """Replace the network probe; returns the list of probed targets."""
+    from custom_components.ternopil_grid import probe as probe_mod
+    from custom_components.ternopil_grid.ping import ProbeResult
+
+    calls = []
+
+    async def fake_probe_target(target, timeout_s, *, prober=None):
+        calls.append(target)
+        return ProbeResult(True, 0.01)
+
+    monkeypatch.setattr(probe_mod, "probe_target", fake_probe_target)
+    monkeypatch.setattr(probe_mod, "async_get_icmp_prober", lambda hass: None)
+    return calls
+
+
+async def _advance(hass, seconds):
+    from datetime import timedelta
+
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from homeassistant.util import dt as dt_util
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+async def test_same_target_is_probed_once_for_every_subscriber(hass, probes):
+    from custom_components.ternopil_grid.ping import ProbeTarget
+    from custom_components.ternopil_grid.probe import async_get_probe_engine
+
+    engine = async_get_probe_engine(hass)
+    target = ProbeTarget("10.0.0.1", "tcp", 80)
+    first, second = [], []
+    unsubs = [
+        engine.async_subscribe(target, lambda t, ok: first.append(ok), interval=10, timeout_s=1),
+        engine.async_subscribe(target, lambda t, ok: second.append(ok), interval=10, timeout_s=1),
+    ]
+
+    await _advance(hass, 11)
+
+    assert probes == [target]
+    assert first == second == [True]
+    assert engine.targets() == [target]
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_targets_are_phase_spread_and_resubscribe_keeps_timers(hass, probes):
+    from custom_components.ternopil_grid.ping import ProbeTarget
+    from custom_components.ternopil_grid.probe import async_get_probe_engine
+
+    engine = async_get_probe_engine(hass)
+    a, b = ProbeTarget("10.0.0.1", "tcp", 80), ProbeTarget("10.0.0.2", "tcp", 80)
+    unsubs = [
+        engine.async_subscribe(a, lambda t, ok: None, interval=10, timeout_s=1),
+        engine.async_subscribe(b, lambda t, ok: None, interval=10, timeout_s=1),
+    ]
+    states = engine._states
+    assert (states[a].phase, states[b].phase) == (0.0, 5.0)
+    handles = {t: s.handle for t, s in states.items()}
+
+    # Another entry watching an already probed target does not re-arm anything
+    unsubs.append(engine.async_subscribe(a, lambda t, ok: None, interval=10, timeout_s=1))
+    assert {t: s.handle for t, s in states.items()} == handles
+
+    # A shorter interval only re-arms that target
+    unsubs.append(engine.async_subscribe(b, lambda t, ok: None, interval=4, timeout_s=1))
+    assert states[a].handle is handles[a]
+    assert states[b].handle is not handles[b]
+    assert states[b].phase == 2.0
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_last_unsubscribe_tears_down_the_target(hass, probes):
+    from custom_components.ternopil_grid.ping import ProbeTarget
+    from custom_components.ternopil_grid.probe import async_get_probe_engine
+
+    engine = async_get_probe_engine(hass)
+    a, b = ProbeTarget("10.0.0.1", "tcp", 80), ProbeTarget("10.0.0.2", "tcp", 80)
+    unsub_a1 = engine.async_subscribe(a, lambda t, ok: None, interval=10, timeout_s=1)
+    unsub_a2 = engine.async_subscribe(a, lambda t, ok: None, interval=10, timeout_s=1)
+    unsub_b = engine.async_subscribe(b, lambda t, ok: None, interval=10, timeout_s=1)
+    handle = engine._states[a].handle
+
+    unsub_a1()
+    assert a in engine.targets()
+    unsub_a2()
+    assert engine.targets() == [b]
+    assert handle.cancelled()
+    # The remaining target takes over the first phase
+    assert engine._states[b].phase == 0.0
+
+    await _advance(hass, 11)
+    assert probes == [b]
+
+    unsub_b()
+    assert engine.targets() == []
+    await _advance(hass, 11)
+    assert probes == [b]
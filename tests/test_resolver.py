@@ -0,0 +1,109 @@
+import pytest
+
+
+def _stored_groups(hass_storage, groups):
+    key = "ternopil_grid.groups_1032"
+    hass_storage[key] = {"version": 1, "minor_version": 1, "key": key, "data": {"groups": groups}}
+
+
+class FakeUpstream:
+    """Building-group lookups: answers[street_id] is a group or an exception."""
+
+    def __init__(self):
+        import asyncio
+
+        self.answers = {}
+        self.calls = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.active = self.peak = 0
+
+    async def fetch(self, hass, city_id, street_id):
+        import asyncio
+
+        self.calls.append(street_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await self.gate.wait()
+            await asyncio.sleep(0)
+        finally:
+            self.active -= 1
+        answer = self.answers.get(street_id, f"g{street_id}")
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def upstream(hass, monkeypatch):
+    from custom_components.ternopil_grid import resolver as resolver_mod
+
+    fake = FakeUpstream()
+    monkeypatch.setattr(resolver_mod, "fetch_building_group", fake.fetch)
+    return fake
+
+
+async def test_fresh_entry_is_served_from_cache(hass, hass_storage, upstream):
+    import time
+
+    from custom_components.ternopil_grid.resolver import async_get_group_resolver
+
+    _stored_groups(hass_storage, {"7": ["4.1", time.time() - 60]})
+    resolver = async_get_group_resolver(hass, 1032)
+
+    assert await resolver.async_resolve(7) == "4.1"
+    await hass.async_block_till_done()
+    assert upstream.calls == []
+
+    # Unknown street: resolved upstream and cached
+    assert await resolver.async_resolve(8) == "g8"
+    assert await resolver.async_resolve(8) == "g8"
+    assert upstream.calls == [8]
+
+
+async def test_expired_entry_is_returned_and_refreshed_in_background(hass, hass_storage, upstream):
+    import time
+
+    from custom_components.ternopil_grid.const import GROUP_RESOLVER_TTL
+    from custom_components.ternopil_grid.resolver import async_get_group_resolver
+
+    old = time.time() - GROUP_RESOLVER_TTL - 60
+    _stored_groups(hass_storage, {"7": ["4.1", old], "9": ["2.2", old]})
+    upstream.answers[7] = "5.1"
+    upstream.answers[9] = RuntimeError("upstream down")
+    upstream.gate.clear()
+    resolver = async_get_group_resolver(hass, 1032)
+
+    # Stale answer right away; one background refresh despite repeated lookups
+    assert await resolver.async_resolve(7) == "4.1"
+    assert await resolver.async_resolve(7) == "4.1"
+    assert await resolver.async_resolve(9) == "2.2"
+    assert sorted(upstream.calls) == [7, 9]
+
+    upstream.gate.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert await resolver.async_resolve(7) == "5.1"
+    # A failed refresh keeps the last known group
+    assert await resolver.async_resolve(9) == "2.2"
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_prefetch_respects_concurrency_and_skips_known(hass, hass_storage, upstream):
+    import time
+
+    from custom_components.ternopil_grid.resolver import async_get_group_resolver
+
+    _stored_groups(hass_storage, {"1": ["1.1", time.time()]})
+    upstream.answers[5] = RuntimeError("boom")
+    resolver = async_get_group_resolver(hass, 1032)
+
+    resolved = await resolver.async_prefetch(range(1, 11), concurrency=3)
+
+    assert upstream.peak == 3
+    assert sorted(upstream.calls) == list(range(2, 11))
+    assert resolved == 8
+    assert resolver.get(1) == "1.1"
+    assert resolver.get(5) is None
+    assert resolver.get(10) == "g10"
+    assert hass_storage["ternopil_grid.groups_1032"]["data"]["groups"]["10"][0] == "g10"
@@ -0,0 +1,80 @@
+import pytest
+
+
+@pytest.fixture
+async def schedules(hass, monkeypatch):
+    """Hub coordinators for (1032, 4.1), (1032, 1.1) and (7, 4.1) with a fixed timeline."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.ternopil_grid.const import CONF_CITY_ID, CONF_GROUP, CONF_STREET_ID, DOMAIN
+    from custom_components.ternopil_grid.coordinator import TernopilScheduleCoordinator
+    from custom_components.ternopil_grid.hub import async_get_schedule_hub
+    from custom_components.ternopil_grid.services import async_setup_services
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    monkeypatch.setattr(TernopilScheduleCoordinator, "startup_delay", lambda self: 3600)
+    async_setup_services(hass)
+    hub = async_get_schedule_hub(hass)
+    t0 = dt_util.start_of_local_day().timestamp() + 86400
+    entries = {}
+    for entry_id, city_id, group in (("a", 1032, "4.1"), ("b", 1032, "1.1"), ("c", 7, "4.1")):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            entry_id=entry_id,
+            data={CONF_STREET_ID: 1, CONF_GROUP: group, CONF_CITY_ID: city_id},
+        )
+        coordinator = await hub.async_acquire(entry)
+        coordinator.data = SegmentTimeline(
+            [t0, t0 + 3600, t0 + 7200], [t0 + 3600, t0 + 7200, t0 + 10800], [GREEN, RED, GREEN]
+        )
+        hass.data[DOMAIN][entry_id] = {"schedule": coordinator}
+        entries[entry_id] = entry
+    yield t0
+    for entry in entries.values():
+        await hub.async_release(entry)
+
+
+async def _call(hass, **data):
+    from custom_components.ternopil_grid.const import DOMAIN, SERVICE_GET_SCHEDULE
+
+    return await hass.services.async_call(DOMAIN, SERVICE_GET_SCHEDULE, data, blocking=True, return_response=True)
+
+
+async def test_get_schedule_by_entry_and_group(hass, schedules):
+    from homeassistant.exceptions import ServiceValidationError
+
+    by_entry = await _call(hass, config_entry_id="c")
+    assert (by_entry["city_id"], by_entry["group"]) == (7, "4.1")
+    assert [s["color"] for s in by_entry["segments"]] == ["green", "red", "green"]
+
+    # Group unique to one city: no city_id needed
+    assert (await _call(hass, group="1.1"))["city_id"] == 1032
+    # Group configured in two cities: ambiguous unless city_id is given
+    with pytest.raises(ServiceValidationError):
+        await _call(hass, group="4.1")
+    assert (await _call(hass, group="4.1", city_id=7))["city_id"] == 7
+    assert (await _call(hass, group="4.1", city_id=1032))["city_id"] == 1032
+
+    with pytest.raises(ServiceValidationError):
+        await _call(hass, group="6.2")
+    with pytest.raises(ServiceValidationError):
+        await _call(hass, config_entry_id="missing")
+
+
+async def test_get_schedule_filters_by_start_and_end(hass, schedules):
+    from homeassistant.util import dt as dt_util
+
+    t0 = schedules
+
+    def at(offset):
+        return dt_util.as_local(dt_util.utc_from_timestamp(t0 + offset)).isoformat()
+
+    # Default window starts now: everything (tomorrow) is still ahead
+    assert len((await _call(hass, config_entry_id="a"))["segments"]) == 3
+
+    # Only segments overlapping [start, end)
+    window = await _call(hass, config_entry_id="a", start=at(3600 + 60), end=at(7200 + 60))
+    assert [(s["start"], s["color"]) for s in window["segments"]] == [(at(3600), "red"), (at(7200), "green")]
+    assert (await _call(hass, config_entry_id="a", start=at(10800)))["segments"] == []
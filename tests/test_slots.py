@@ -0,0 +1,38 @@
+from datetime import date
+
+
+def _timeline():
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    h = 3600
+    # 1970-01-01 (UTC): green 0-6, red 6-10, green 10-20, red 20-25 (into day 2), then green
+    return SegmentTimeline(
+        [0, 6 * h, 10 * h, 20 * h, 25 * h],
+        [6 * h, 10 * h, 20 * h, 25 * h, 48 * h],
+        [GREEN, RED, GREEN, RED, GREEN],
+    )
+
+
+def test_slot_index_window_aggregates():
+    from custom_components.ternopil_grid.slots import SlotIndex
+    from custom_components.ternopil_grid.view import local_day_bounds
+
+    slots = SlotIndex(_timeline())
+
+    assert len(slots.codes) == 96
+    assert slots.minutes_off(*local_day_bounds(date(1970, 1, 1))) == 480
+    assert slots.minutes_off(*local_day_bounds(date(1970, 1, 2))) == 60
+    # Partial slots at both window edges
+    assert slots.minutes_off(5 * 3600 + 900, 7 * 3600) == 60
+    assert slots.longest_on(date(1970, 1, 1)) == 600
+    assert slots.longest_on(date(1970, 1, 3)) is None
+
+
+def test_slot_index_next_outage_threshold():
+    from custom_components.ternopil_grid.slots import SlotIndex
+
+    slots = SlotIndex(_timeline())
+
+    assert slots.next_outage(0) == (6 * 3600, 10 * 3600)
+    assert slots.next_outage(0, 300) == (20 * 3600, 25 * 3600)
+    assert slots.next_outage(21 * 3600) is None
@@ -0,0 +1,36 @@
+def test_ring_buffer_percentiles_and_loss():
+    from custom_components.ternopil_grid.stats import ProbeStats
+
+    stats = ProbeStats(size=4)
+    for rtt in (0.010, 0.020, 0.030):
+        stats.record(True, rtt)
+    stats.record(False, timed_out=True)
+
+    assert stats.loss_rate == 0.25
+    assert stats.rtt_percentile(50) == 0.020
+    assert stats.rtt_percentile(95) == 0.030
+
+    # oldest sample (10 ms) falls out of the window
+    stats.record(True, 0.040)
+    assert stats.rtt_percentile(50) == 0.030
+    assert stats.window_timeouts == 1
+    assert stats.probes == 5 and stats.timeouts == 1
+
+
+def test_success_without_rtt_is_not_a_loss():
+    from custom_components.ternopil_grid.stats import ProbeStats
+
+    # Keep-alive transitions carry no RTT
+    stats = ProbeStats(size=4)
+    stats.record(True)
+    stats.record(False, timed_out=True)
+    stats.record(True)
+
+    assert stats.losses == 1
+    assert stats.as_dict()["loss_pct"] == 33.3
+    assert stats.rtt_percentile(50) is None
+
+    # Lost slots age out of the window like any other
+    for _ in range(4):
+        stats.record(True)
+    assert stats.loss_rate == 0.0
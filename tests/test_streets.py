@@ -0,0 +1,48 @@
+def test_normalize_name_folds_case_and_diacritics():
+    from custom_components.ternopil_grid.streets import normalize_name
+
+    assert normalize_name("вул. Гайова") == normalize_name("ВУЛ ГАИОВА")
+    assert normalize_name("Мар’яна Паньківа") == "маряна паньківа"
+
+
+def test_search_by_word_prefix():
+    from unittest.mock import MagicMock
+
+    from custom_components.ternopil_grid.streets import StreetCatalog
+
+    catalog = StreetCatalog(MagicMock(), 1032)
+    catalog._index(
+        [
+            {"id": 1, "name": "вул. Київська"},
+            {"id": 2, "name": "вул. Князя Острозького"},
+            {"id": 3, "name": "просп. Злуки"},
+        ]
+    )
+
+    assert [s["id"] for s in catalog.search("Київ")] == [1]
+    assert [s["id"] for s in catalog.search("вул кн")] == [2]
+    assert catalog.get(3) == "просп. Злуки"
+    assert len(catalog.search("")) == 3
+
+
+async def test_failed_load_is_retried():
+    from unittest.mock import AsyncMock, MagicMock
+
+    import pytest
+
+    from custom_components.ternopil_grid.streets import StreetCatalog
+
+    catalog = StreetCatalog(MagicMock(), 1032)
+    catalog._store = MagicMock()
+    catalog._store.async_load = AsyncMock(
+        side_effect=[OSError("disk"), {"fetched_at": 5, "streets": [{"id": 1, "name": "вул. Київська"}]}]
+    )
+
+    with pytest.raises(OSError):
+        await catalog.async_load()
+    await catalog.async_load()
+    await catalog.async_load()
+
+    assert catalog._store.async_load.await_count == 2
+    assert catalog.get(1) == "вул. Київська"
+    assert catalog.fetched_at == 5.0
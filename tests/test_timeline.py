@@ -0,0 +1,53 @@
+def test_segment_lookup_and_next_change():
+    from custom_components.ternopil_grid.timeline import GREEN, RED, YELLOW, SegmentTimeline
+
+    tl = SegmentTimeline([0, 100, 200, 400], [100, 200, 300, 500], [GREEN, RED, RED, YELLOW])
+
+    assert tl.color_at(50) == "green"
+    assert tl.color_at(100) == "red"
+    assert tl.color_at(350) is None
+    # next change skips same-colored neighbours
+    assert tl.next_change_after(150) == (400, "yellow")
+    assert tl.next_change_after(10) == (100, "red")
+    # in a gap: next segment start
+    assert tl.next_change_after(350) == (400, "yellow")
+    assert tl.next_change_after(450) == (None, None)
+    assert tl.seconds_in(RED, 150, 250) == 100
+
+
+def test_times_to_segments_merges_half_hours():
+    from datetime import datetime, timezone
+
+    from custom_components.ternopil_grid.coordinator import _times_to_segments
+
+    day0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tl = _times_to_segments(day0, {"00:30": "0", "00:00": "0", "01:00": "1", "01:30": "10"})
+
+    assert [s.color for s in tl] == ["red", "green", "yellow"]
+    assert tl[0].end_ts - tl[0].start_ts == 3600
+
+
+def test_blocks_merges_touching_runs_and_respects_window():
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    tl = SegmentTimeline(
+        [0, 1800, 3600, 5400, 7200],
+        [1800, 3600, 5400, 7200, 9000],
+        [RED, RED, GREEN, RED, GREEN],
+    )
+
+    assert tl.blocks(RED, 0, 9000) == [(0, 3600), (5400, 7200)]
+    # Runs are not clipped to the window
+    assert tl.blocks(RED, 2000, 2100) == [(0, 3600)]
+    assert tl.blocks(RED, 3600, 5400) == []
+    assert tl.blocks(RED, 0, 9000, limit=1) == [(0, 3600)]
+
+
+def test_overlapping_returns_unclipped_segments_in_range():
+    from custom_components.ternopil_grid.timeline import GREEN, RED, SegmentTimeline
+
+    tl = SegmentTimeline([0, 100, 200], [100, 200, 300], [GREEN, RED, GREEN])
+
+    assert [s.start_ts for s in tl.overlapping(150, 250)] == [100, 200]
+    assert [s.color for s in tl.overlapping(0, 100)] == ["green"]
+    assert tl.overlapping(300, 400) == []